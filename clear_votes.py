@@ -19,6 +19,18 @@ def clear_flask_votes():
         conn.commit()
         deleted = cursor.rowcount
         print(f"✓ Видалено {deleted} голосів з Flask database (user_votes)")
+
+        # Votes of closed matches, and their counts (the user_votes triggers skip archived ids)
+        cursor.execute("DELETE FROM user_votes_archive")
+        print(f"✓ Видалено {cursor.rowcount} голосів з архіву (user_votes_archive)")
+        cursor.execute("DELETE FROM match_vote_tallies")
+        conn.commit()
+        print(f"✓ Видалено {cursor.rowcount} лічильників (match_vote_tallies)")
+
+        # Queued votes would be replayed to the backend after the reset
+        cursor.execute("DELETE FROM vote_outbox")
+        conn.commit()
+        print(f"✓ Видалено {cursor.rowcount} голосів з черги (vote_outbox)")
     except Exception as e:
         print(f"✗ Помилка очищення Flask database: {e}")
     finally:
@@ -48,6 +60,11 @@ def clear_cpp_votes():
         updated_players = cursor.rowcount
         print(f"✓ Скинуто votes для {updated_players} гравців")
 
+        # Idempotency keys are "<user_id>:<match_id>": left in place, they turn new votes into duplicates
+        cursor.execute("DELETE FROM applied_vote_keys")
+        conn.commit()
+        print(f"✓ Видалено {cursor.rowcount} ключів голосів (applied_vote_keys)")
+
     except Exception as e:
         print(f"✗ Помилка очищення C++ database: {e}")
     finally:
@@ -2,10 +2,24 @@
 
 #include <algorithm>
 #include <cctype>
+#include <chrono>
 #include <sstream>
+#include <stdexcept>
+#include <vector>
 #include "models/MatchStats.h"
 
-ApiController::ApiController(VotingService &service) : m_service(service) {}
+namespace
+{
+    constexpr std::size_t kMaxVoteBatchSize = 1000;
+}
+
+ApiController::ApiController(VotingService &service)
+    : m_service(service),
+      m_instanceTag(std::to_string(std::chrono::duration_cast<std::chrono::seconds>(
+                                       std::chrono::system_clock::now().time_since_epoch())
+                                       .count()))
+{
+}
 
 std::string ApiController::handleRoot() const
 {
@@ -250,6 +264,11 @@ std::string ApiController::handleVote(const std::map<std::string, std::string> &
 
     int matchId = std::stoi(matchIt->second);
     int playerId = std::stoi(playerIt->second);
+    const auto keyIt = body.find("vote_key");
+    if (keyIt != body.end() && !keyIt->second.empty())
+    {
+        return voteResultJson(m_service.recordVotes({{matchId, playerId, keyIt->second}}).front());
+    }
     std::string error;
     if (!m_service.recordVote(matchId, playerId, error))
     {
@@ -264,6 +283,104 @@ std::string ApiController::handleVote(const std::map<std::string, std::string> &
     return R"({"status":"success","message":"Голос зараховано"})";
 }
 
+std::string ApiController::handleVoteBatch(const std::string &body) const
+{
+    std::vector<std::string> objects;
+    if (!extractObjects(body, "votes", objects))
+    {
+        return R"({"status":"error","message":"votes є обов'язковим"})";
+    }
+
+    // Votes that cannot be parsed get an error result without reaching the service
+    std::vector<VoteRequest> votes;
+    std::vector<bool> parsed;
+    for (const auto &object : objects)
+    {
+        int matchId = 0;
+        int playerId = 0;
+        parsed.push_back(extractInt(object, "match_id", matchId) && extractInt(object, "player_id", playerId));
+        if (parsed.back())
+        {
+            votes.push_back({matchId, playerId, extractString(object, "vote_key")});
+        }
+    }
+
+    if (parsed.size() > kMaxVoteBatchSize)
+    {
+        return R"({"status":"error","message":"Забагато голосів в одному запиті"})";
+    }
+
+    const auto outcomes = m_service.recordVotes(votes);
+    std::ostringstream json;
+    json << "{\"status\":\"success\",\"results\":[";
+    std::size_t next = 0;
+    for (std::size_t i = 0; i < parsed.size(); ++i)
+    {
+        if (i > 0)
+            json << ",";
+        if (!parsed[i])
+        {
+            json << R"({"status":"error","message":"match_id та player_id є обов'язковими"})";
+            continue;
+        }
+        json << voteResultJson(outcomes[next++]);
+    }
+    json << "]}";
+    return json.str();
+}
+
+std::string ApiController::handleVoteChecksums() const
+{
+    std::ostringstream json;
+    json << "{\"matches\":[";
+    bool first = true;
+    for (const auto &checksum : m_service.voteChecksums())
+    {
+        if (!first)
+        {
+            json << ",";
+        }
+        json << "{"
+             << "\"match_id\":" << checksum.matchId << ","
+             << "\"total\":" << checksum.total << ","
+             << "\"checksum\":\"" << checksum.checksum << "\""
+             << "}";
+        first = false;
+    }
+    json << "]}";
+    return json.str();
+}
+
+std::string ApiController::handleVoteReconcile(const std::string &body) const
+{
+    int matchId = 0;
+    std::vector<std::string> objects;
+    if (!extractInt(body, "match_id", matchId) || !extractObjects(body, "tallies", objects))
+    {
+        return R"({"status":"error","message":"match_id та tallies є обов'язковими"})";
+    }
+
+    std::map<int, int> tallies;
+    for (const auto &object : objects)
+    {
+        int playerId = 0;
+        int votes = 0;
+        if (!extractInt(object, "player_id", playerId) || !extractInt(object, "votes", votes))
+        {
+            return R"({"status":"error","message":"player_id та votes є обов'язковими"})";
+        }
+        tallies[playerId] = votes;
+    }
+
+    int changed = 0;
+    std::string error;
+    if (!m_service.setVoteTallies(matchId, tallies, changed, error))
+    {
+        return "{\"status\":\"error\",\"message\":\"" + escape(error) + "\"}";
+    }
+    return "{\"status\":\"success\",\"updated\":" + std::to_string(changed) + "}";
+}
+
 std::string ApiController::handleCloseMatch(const std::map<std::string, std::string> &body) const
 {
     const auto matchIt = body.find("match_id");
@@ -733,6 +850,85 @@ std::string ApiController::handleStatsPageGet() const
     return json.str();
 }
 
+std::string ApiController::currentETag() const
+{
+    return "\"" + m_instanceTag + "-" + std::to_string(m_service.version()) + "\"";
+}
+
+std::string ApiController::voteResultJson(const VoteOutcome &outcome)
+{
+    if (!outcome.accepted)
+    {
+        return "{\"status\":\"error\",\"message\":\"" + escape(outcome.error) + "\"}";
+    }
+    if (outcome.duplicate)
+    {
+        return R"({"status":"success","message":"Голос вже зараховано","duplicate":true})";
+    }
+    return R"({"status":"success","message":"Голос зараховано"})";
+}
+
+std::string ApiController::extractString(const std::string &object, const std::string &key)
+{
+    const auto keyPos = object.find("\"" + key + "\"");
+    if (keyPos == std::string::npos)
+        return {};
+    const auto colonPos = object.find(':', keyPos);
+    if (colonPos == std::string::npos)
+        return {};
+    const auto valueStart = object.find('"', colonPos);
+    if (valueStart == std::string::npos)
+        return {};
+    const auto valueEnd = object.find('"', valueStart + 1);
+    if (valueEnd == std::string::npos)
+        return {};
+    return object.substr(valueStart + 1, valueEnd - valueStart - 1);
+}
+
+bool ApiController::extractObjects(const std::string &body, const std::string &key, std::vector<std::string> &objects)
+{
+    const auto keyPos = body.find("\"" + key + "\"");
+    if (keyPos == std::string::npos)
+        return false;
+    const auto arrayStart = body.find('[', keyPos);
+    const auto arrayEnd = body.find(']', arrayStart);
+    if (arrayStart == std::string::npos || arrayEnd == std::string::npos)
+        return false;
+
+    std::size_t pos = arrayStart;
+    while ((pos = body.find('{', pos)) != std::string::npos && pos < arrayEnd)
+    {
+        const auto objectEnd = body.find('}', pos);
+        if (objectEnd == std::string::npos)
+            break;
+        objects.push_back(body.substr(pos, objectEnd - pos + 1));
+        pos = objectEnd + 1;
+    }
+    return true;
+}
+
+bool ApiController::extractInt(const std::string &object, const std::string &key, int &value)
+{
+    const auto keyPos = object.find("\"" + key + "\"");
+    if (keyPos == std::string::npos)
+        return false;
+    auto valueStart = object.find(':', keyPos);
+    if (valueStart == std::string::npos)
+        return false;
+    valueStart = object.find_first_not_of(" \t\"", valueStart + 1);
+    if (valueStart == std::string::npos)
+        return false;
+    try
+    {
+        value = std::stoi(object.substr(valueStart));
+    }
+    catch (const std::exception &)
+    {
+        return false;
+    }
+    return true;
+}
+
 std::string ApiController::escape(const std::string &value)
 {
     std::ostringstream oss;
@@ -2,6 +2,7 @@
 
 #include <map>
 #include <string>
+#include <vector>
 
 #include "services/VotingService.h"
 #include "models/User.h"
@@ -27,14 +28,30 @@ public:
     std::string handleAddPlayer(const std::map<std::string, std::string> &body) const;
     std::string handleAddMatch(const std::map<std::string, std::string> &body) const;
     std::string handleVote(const std::map<std::string, std::string> &body) const;
+    // Body: {"votes":[{"match_id":1,"player_id":2,"vote_key":"7:1"},...]}; one result per vote, in order
+    std::string handleVoteBatch(const std::string &body) const;
+    // Per-match tally checksums for the reconciliation job
+    std::string handleVoteChecksums() const;
+    // Body: {"match_id":1,"tallies":[{"player_id":2,"votes":5},...]}; sets those tallies
+    std::string handleVoteReconcile(const std::string &body) const;
     std::string handleCloseMatch(const std::map<std::string, std::string> &body) const;
     std::string handleSetMatchActive(const std::map<std::string, std::string> &body) const;
     std::string handleUpdateMatchStats(const std::map<std::string, std::string> &body) const;
     std::string handleDeleteMatch(const std::map<std::string, std::string> &body) const;
     std::string handleGetMatchStats(int matchId) const;
 
+    // Entity tag for GET responses, derived from the service change counter
+    std::string currentETag() const;
+
 private:
     VotingService &m_service;
+    // Distinguishes ETags across restarts (the change counter starts over)
+    std::string m_instanceTag;
 
     static std::string escape(const std::string &value);
+    static bool extractInt(const std::string &object, const std::string &key, int &value);
+    // Objects of the array under "key" (flat objects only); false if there is no such array
+    static bool extractObjects(const std::string &body, const std::string &key, std::vector<std::string> &objects);
+    static std::string extractString(const std::string &object, const std::string &key);
+    static std::string voteResultJson(const VoteOutcome &outcome);
 };
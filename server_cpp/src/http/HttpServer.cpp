@@ -1,7 +1,11 @@
 #include "HttpServer.h"
 
+#include <algorithm>
+#include <cctype>
 #include <iostream>
 #include <sstream>
+#include <system_error>
+#include <thread>
 
 #ifdef _WIN32
 #include <winsock2.h>
@@ -11,9 +15,46 @@
 #include <arpa/inet.h>
 #include <netinet/in.h>
 #include <sys/socket.h>
+#include <sys/time.h>
 #include <unistd.h>
 #endif
 
+namespace
+{
+    // Keep-alive limits: idle timeout, requests per connection, concurrently kept connections
+    constexpr int kKeepAliveTimeoutSeconds = 5;
+    constexpr int kMaxRequestsPerConnection = 1000;
+    constexpr int kMaxKeepAliveConnections = 256;
+    // Connection threads; connections accepted past this get 503 and are closed
+    constexpr int kMaxConnections = 512;
+
+    void closeSocket(int clientSocket)
+    {
+#ifdef _WIN32
+        closesocket(clientSocket);
+#else
+        close(clientSocket);
+#endif
+    }
+
+    void rejectConnection(int clientSocket)
+    {
+        const std::string body = R"({"status":"error","message":"Сервер перевантажений"})";
+        std::ostringstream response;
+        response << "HTTP/1.1 503 Service Unavailable\r\n"
+                 << "Content-Type: application/json\r\n"
+                 << "Retry-After: 1\r\n"
+                 << "Access-Control-Allow-Origin: *\r\n"
+                 << "Connection: close\r\n"
+                 << "Content-Length: " << body.size() << "\r\n\r\n"
+                 << body;
+        const std::string data = response.str();
+        // Best effort: the socket buffer of a new connection takes the whole response
+        send(clientSocket, data.c_str(), static_cast<int>(data.size()), 0);
+        closeSocket(clientSocket);
+    }
+}
+
 HttpServer::HttpServer(int port, ApiController &controller)
     : m_port(port), m_controller(controller)
 {
@@ -57,7 +98,7 @@ void HttpServer::start()
         return;
     }
 
-    if (listen(serverSocket, 16) < 0)
+    if (listen(serverSocket, 128) < 0)
     {
         std::cerr << "Не вдалося розпочати прослуховування" << std::endl;
         return;
@@ -80,101 +121,172 @@ void HttpServer::start()
             continue;
         }
 
-        try
+        // Only this loop adds connections, so the check cannot race past the limit
+        if (m_activeConnections.load() >= kMaxConnections)
         {
-            std::string request;
-            char buffer[4096];
-            int contentLength = 0;
-            bool headersReceived = false;
+            rejectConnection(clientSocket);
+            continue;
+        }
+        const int active = ++m_activeConnections;
 
-            while (true)
-            {
-                const int bytesRead = recv(clientSocket, buffer, sizeof(buffer), 0);
-                if (bytesRead <= 0)
-                    break;
+        // One thread per connection so a kept-alive client does not block the accept loop
+        try
+        {
+            std::thread(&HttpServer::serveConnection, this, clientSocket, active).detach();
+        }
+        catch (const std::system_error &ex)
+        {
+            std::cerr << "Не вдалося створити потік з'єднання: " << ex.what() << std::endl;
+            --m_activeConnections;
+            rejectConnection(clientSocket);
+        }
+    }
+}
 
-                request.append(buffer, bytesRead);
+void HttpServer::serveConnection(int clientSocket, int active)
+{
+    // Idle keep-alive connections are dropped after the receive timeout
+#ifdef _WIN32
+    DWORD idleTimeout = kKeepAliveTimeoutSeconds * 1000;
+    setsockopt(clientSocket, SOL_SOCKET, SO_RCVTIMEO, reinterpret_cast<char *>(&idleTimeout), sizeof(idleTimeout));
+#else
+    timeval idleTimeout{};
+    idleTimeout.tv_sec = kKeepAliveTimeoutSeconds;
+    setsockopt(clientSocket, SOL_SOCKET, SO_RCVTIMEO, &idleTimeout, sizeof(idleTimeout));
+#endif
 
-                if (!headersReceived)
-                {
-                    auto headersEnd = request.find("\r\n\r\n");
-                    if (headersEnd != std::string::npos)
-                    {
-                        headersReceived = true;
-
-                        // Parse Content-Length
-                        auto clPos = request.find("Content-Length: ");
-                        if (clPos != std::string::npos)
-                        {
-                            auto clEnd = request.find("\r\n", clPos);
-                            contentLength = std::stoi(request.substr(clPos + 16, clEnd - (clPos + 16)));
-                        }
-                    }
-                }
+    try
+    {
+        std::string pending;
+        std::string request;
+        for (int served = 0; served < kMaxRequestsPerConnection; ++served)
+        {
+            if (!readRequest(clientSocket, pending, request))
+                break;
 
-                // If we have headers and (no body or full body), stop reading
-                if (headersReceived)
-                {
-                    auto bodyStartPos = request.find("\r\n\r\n") + 4;
-                    if (request.size() >= bodyStartPos + contentLength)
-                    {
-                        break;
-                    }
-                }
+            // Log basic request info
+            auto firstLineEnd = request.find('\r');
+            if (firstLineEnd != std::string::npos)
+            {
+                std::cout << "Request: " << request.substr(0, firstLineEnd) << std::endl;
             }
 
-            if (!request.empty())
+            const bool keepAlive = wantsKeepAlive(request) &&
+                                   active <= kMaxKeepAliveConnections &&
+                                   served + 1 < kMaxRequestsPerConnection;
+
+            auto response = handleRequest(request);
+            if (!keepAlive)
             {
-                // Log basic request info
-                auto firstLineEnd = request.find('\r');
-                if (firstLineEnd != std::string::npos)
+                const auto headerPos = response.find("Connection: keep-alive\r\n");
+                if (headerPos != std::string::npos)
                 {
-                    std::cout << "Request: " << request.substr(0, firstLineEnd) << std::endl;
+                    response.replace(headerPos, std::string("Connection: keep-alive").size(), "Connection: close");
                 }
+            }
 
-                const auto response = handleRequest(request);
-
-                // Send response
-                const char *responseData = response.c_str();
-                int totalSent = 0;
-                int responseSize = static_cast<int>(response.size());
+            // Send response
+            const char *responseData = response.c_str();
+            int totalSent = 0;
+            int responseSize = static_cast<int>(response.size());
+            bool sendFailed = false;
 
-                while (totalSent < responseSize)
+            while (totalSent < responseSize)
+            {
+                int sent = send(clientSocket, responseData + totalSent, responseSize - totalSent, 0);
+                if (sent < 0)
                 {
-                    int sent = send(clientSocket, responseData + totalSent, responseSize - totalSent, 0);
-                    if (sent < 0)
-                    {
-                        std::cerr << "Error sending response" << std::endl;
-                        break;
-                    }
-                    totalSent += sent;
+                    std::cerr << "Error sending response" << std::endl;
+                    sendFailed = true;
+                    break;
                 }
+                totalSent += sent;
             }
 
-            // Graceful shutdown
+            if (sendFailed || !keepAlive)
+                break;
+        }
+
+        // Graceful shutdown
 #ifdef _WIN32
-            shutdown(clientSocket, SD_SEND);
+        shutdown(clientSocket, SD_SEND);
 #else
-            shutdown(clientSocket, SHUT_WR);
+        shutdown(clientSocket, SHUT_WR);
 #endif
-        }
-        catch (const std::exception &ex)
+    }
+    catch (const std::exception &ex)
+    {
+        std::cerr << "Error processing request: " << ex.what() << std::endl;
+    }
+    catch (...)
+    {
+        std::cerr << "Unknown error processing request" << std::endl;
+    }
+
+    closeSocket(clientSocket);
+    --m_activeConnections;
+}
+
+bool HttpServer::readRequest(int clientSocket, std::string &pending, std::string &request)
+{
+    char buffer[4096];
+    int contentLength = 0;
+    std::size_t headersEnd = std::string::npos;
+
+    while (true)
+    {
+        if (headersEnd == std::string::npos)
         {
-            std::cerr << "Error processing request: " << ex.what() << std::endl;
+            headersEnd = pending.find("\r\n\r\n");
+            if (headersEnd != std::string::npos)
+            {
+                // Parse Content-Length
+                auto clPos = pending.find("Content-Length: ");
+                if (clPos != std::string::npos && clPos < headersEnd)
+                {
+                    auto clEnd = pending.find("\r\n", clPos);
+                    contentLength = std::stoi(pending.substr(clPos + 16, clEnd - (clPos + 16)));
+                }
+            }
         }
-        catch (...)
+
+        // If we have headers and the full body, split off this request
+        if (headersEnd != std::string::npos)
         {
-            std::cerr << "Unknown error processing request" << std::endl;
+            const auto requestSize = headersEnd + 4 + static_cast<std::size_t>(contentLength);
+            if (pending.size() >= requestSize)
+            {
+                request = pending.substr(0, requestSize);
+                pending.erase(0, requestSize);
+                return true;
+            }
         }
 
-#ifdef _WIN32
-        closesocket(clientSocket);
-#else
-        close(clientSocket);
-#endif
+        const int bytesRead = recv(clientSocket, buffer, sizeof(buffer), 0);
+        if (bytesRead <= 0)
+            return false;
+
+        pending.append(buffer, bytesRead);
     }
 }
 
+bool HttpServer::wantsKeepAlive(const std::string &request)
+{
+    const auto headersEnd = request.find("\r\n\r\n");
+    const auto firstLineEnd = request.find("\r\n");
+    std::string headers = request.substr(0, headersEnd);
+    std::transform(headers.begin(), headers.end(), headers.begin(),
+                   [](unsigned char ch)
+                   { return static_cast<char>(std::tolower(ch)); });
+
+    if (headers.find("connection: close") != std::string::npos)
+        return false;
+    // HTTP/1.0 clients must opt in explicitly
+    if (headers.rfind("http/1.0", firstLineEnd) != std::string::npos)
+        return headers.find("connection: keep-alive") != std::string::npos;
+    return true;
+}
+
 std::string HttpServer::handleRequest(const std::string &request)
 {
     try
@@ -202,29 +314,41 @@ std::string HttpServer::handleRequest(const std::string &request)
 
         if (method == "GET")
         {
+            // Conditional GET: all GET responses derive from the same service state,
+            // so one version-based tag covers them and a match skips building the body
+            const auto etag = m_controller.currentETag();
+            if (headerValue(request, "If-None-Match") == etag)
+            {
+                return respondNotModified(etag);
+            }
+            const auto ok = [&etag](const std::string &body)
+            {
+                return respond(body, "application/json", "ETag: " + etag + "\r\n");
+            };
+
             if (path == "/" || path == "/api" || path == "/api/")
             {
-                return respond(m_controller.handleRoot());
+                return ok(m_controller.handleRoot());
             }
             if (path == "/api/teams")
             {
-                return respond(m_controller.handleTeamsGet());
+                return ok(m_controller.handleTeamsGet());
             }
             if (path == "/api/players")
             {
-                return respond(m_controller.handlePlayersGet());
+                return ok(m_controller.handlePlayersGet());
             }
             if (path == "/api/matches")
             {
-                return respond(m_controller.handleMatchesGet());
+                return ok(m_controller.handleMatchesGet());
             }
             if (path == "/api/stats")
             {
-                return respond(m_controller.handleStatsGet());
+                return ok(m_controller.handleStatsGet());
             }
             if (path == "/api/match-stats")
             {
-                return respond(m_controller.handleMatchStatsGet());
+                return ok(m_controller.handleMatchStatsGet());
             }
             if (path == "/api/dashboard" || path.rfind("/api/dashboard?", 0) == 0)
             {
@@ -242,33 +366,45 @@ std::string HttpServer::handleRequest(const std::string &request)
                         matchId = 0;
                     }
                 }
-                return respond(m_controller.handleDashboardGet(matchId));
+                return ok(m_controller.handleDashboardGet(matchId));
             }
             if (path == "/api/matches-page")
             {
-                return respond(m_controller.handleMatchesPageGet());
+                return ok(m_controller.handleMatchesPageGet());
             }
             if (path == "/api/players-page")
             {
-                return respond(m_controller.handlePlayersPageGet());
+                return ok(m_controller.handlePlayersPageGet());
             }
             if (path == "/api/stats-page")
             {
-                return respond(m_controller.handleStatsPageGet());
+                return ok(m_controller.handleStatsPageGet());
+            }
+            if (path == "/api/votes/checksums")
+            {
+                return ok(m_controller.handleVoteChecksums());
             }
             if (path.rfind("/api/votes/", 0) == 0)
             {
                 int matchId = std::stoi(path.substr(std::string("/api/votes/").size()));
-                return respond(m_controller.handleVotesGet(matchId));
+                return ok(m_controller.handleVotesGet(matchId));
             }
             if (path.rfind("/api/match-stats/", 0) == 0)
             {
                 int matchId = std::stoi(path.substr(std::string("/api/match-stats/").size()));
-                return respond(m_controller.handleGetMatchStats(matchId));
+                return ok(m_controller.handleGetMatchStats(matchId));
             }
         }
         else if (method == "POST")
         {
+            if (path == "/api/votes/batch")
+            {
+                return respond(m_controller.handleVoteBatch(extractBody(request)));
+            }
+            if (path == "/api/votes/reconcile")
+            {
+                return respond(m_controller.handleVoteReconcile(extractBody(request)));
+            }
             auto body = parseJson(extractBody(request));
             if (path == "/api/teams/add")
             {
@@ -365,15 +501,64 @@ std::map<std::string, std::string> HttpServer::parseJson(const std::string &body
     return parsed;
 }
 
-std::string HttpServer::respond(const std::string &body, const std::string &contentType)
+std::string HttpServer::headerValue(const std::string &request, const std::string &name)
+{
+    const auto headersEnd = request.find("\r\n\r\n");
+    std::string needle = "\r\n" + name + ":";
+    std::string headers = request.substr(0, headersEnd);
+    std::transform(needle.begin(), needle.end(), needle.begin(),
+                   [](unsigned char ch)
+                   { return static_cast<char>(std::tolower(ch)); });
+    std::string lowered = headers;
+    std::transform(lowered.begin(), lowered.end(), lowered.begin(),
+                   [](unsigned char ch)
+                   { return static_cast<char>(std::tolower(ch)); });
+
+    const auto pos = lowered.find(needle);
+    if (pos == std::string::npos)
+    {
+        return {};
+    }
+    auto valueStart = pos + needle.size();
+    auto valueEnd = headers.find("\r\n", valueStart);
+    if (valueEnd == std::string::npos)
+    {
+        valueEnd = headers.size();
+    }
+    while (valueStart < valueEnd && (headers[valueStart] == ' ' || headers[valueStart] == '\t'))
+    {
+        ++valueStart;
+    }
+    while (valueEnd > valueStart && (headers[valueEnd - 1] == ' ' || headers[valueEnd - 1] == '\t'))
+    {
+        --valueEnd;
+    }
+    return headers.substr(valueStart, valueEnd - valueStart);
+}
+
+std::string HttpServer::respondNotModified(const std::string &etag)
+{
+    std::ostringstream response;
+    response << "HTTP/1.1 304 Not Modified\r\n"
+             << "ETag: " << etag << "\r\n"
+             << "Access-Control-Allow-Origin: *\r\n"
+             << "Connection: keep-alive\r\n"
+             << "Keep-Alive: timeout=" << kKeepAliveTimeoutSeconds << "\r\n\r\n";
+    return response.str();
+}
+
+std::string HttpServer::respond(const std::string &body, const std::string &contentType,
+                                const std::string &extraHeaders)
 {
     std::ostringstream response;
     response << "HTTP/1.1 200 OK\r\n"
              << "Content-Type: " << contentType << "\r\n"
+             << extraHeaders
              << "Access-Control-Allow-Origin: *\r\n"
              << "Access-Control-Allow-Methods: GET, POST, OPTIONS\r\n"
-             << "Access-Control-Allow-Headers: Content-Type\r\n"
-             << "Connection: close\r\n"
+             << "Access-Control-Allow-Headers: Content-Type, If-None-Match\r\n"
+             << "Connection: keep-alive\r\n"
+             << "Keep-Alive: timeout=" << kKeepAliveTimeoutSeconds << "\r\n"
              << "Content-Length: " << body.size() << "\r\n\r\n"
              << body;
     return response.str();
@@ -1,5 +1,6 @@
 #pragma once
 
+#include <atomic>
 #include <map>
 #include <string>
 
@@ -16,10 +17,18 @@ private:
     int m_port;
     ApiController& m_controller;
 
+    std::atomic<int> m_activeConnections{0};
+
+    void serveConnection(int clientSocket, int active);
     std::string handleRequest(const std::string& request);
+    static bool readRequest(int clientSocket, std::string& pending, std::string& request);
+    static bool wantsKeepAlive(const std::string& request);
     static std::string extractBody(const std::string& request);
     static std::map<std::string, std::string> parseJson(const std::string& body);
-    static std::string respond(const std::string& body, const std::string& contentType = "application/json");
+    static std::string headerValue(const std::string& request, const std::string& name);
+    static std::string respond(const std::string& body, const std::string& contentType = "application/json",
+                               const std::string& extraHeaders = "");
+    static std::string respondNotModified(const std::string& etag);
 };
 
 
@@ -27,3 +27,5 @@ void Player::updatePosition(const std::string &newPosition) { m_position = newPo
 void Player::setTeamId(int teamId) { m_teamId = teamId; }
 
 void Player::incrementVote() { ++m_votes; }
+
+void Player::adjustVotes(int delta) { m_votes += delta; }
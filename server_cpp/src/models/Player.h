@@ -19,6 +19,7 @@ public:
     void updatePosition(const std::string &newPosition);
     void setTeamId(int teamId);
     void incrementVote();
+    void adjustVotes(int delta);
 
     friend std::ostream &operator<<(std::ostream &os, const Player &player);
 
@@ -7,6 +7,28 @@
 #include <sstream>
 #include "models/MatchStats.h"
 
+namespace
+{
+    // FNV-1a (64-bit) over "player:count;" in player order; the Flask side computes the same
+    std::string tallyChecksum(const std::map<int, int> &tallies)
+    {
+        std::uint64_t hash = 14695981039346656037ULL;
+        for (const auto &[playerId, count] : tallies)
+        {
+            if (count <= 0)
+                continue;
+            for (char ch : std::to_string(playerId) + ":" + std::to_string(count) + ";")
+            {
+                hash ^= static_cast<unsigned char>(ch);
+                hash *= 1099511628211ULL;
+            }
+        }
+        std::ostringstream oss;
+        oss << std::hex << std::setw(16) << std::setfill('0') << hash;
+        return oss.str();
+    }
+}
+
 VotingService::VotingService(const std::string &dataDirectory)
     : m_store(dataDirectory + std::string("/voting.db"))
 {
@@ -20,6 +42,8 @@ VotingService::VotingService(const std::string &dataDirectory)
     m_votes = m_store.loadVotes();
     std::cout << "VotingService: Loaded votes for " << m_votes.size() << " matches" << std::endl;
     m_matchStats = m_store.loadMatchStats();
+    m_store.pruneVoteKeys();
+    m_appliedVoteKeys = m_store.loadVoteKeys();
     std::cout << "VotingService: Loaded stats for " << m_matchStats.size() << " matches" << std::endl;
     std::cout << "VotingService: Data loading complete" << std::endl;
 }
@@ -79,6 +103,52 @@ Match VotingService::addMatch(const std::string &team1, const std::string &team2
 bool VotingService::recordVote(int matchId, int playerId, std::string &errorMessage)
 {
     std::lock_guard<std::mutex> lock(m_mutex);
+    if (!applyVoteUnlocked(matchId, playerId, errorMessage))
+    {
+        return false;
+    }
+    persistUnlocked();
+    return true;
+}
+
+std::vector<VoteOutcome> VotingService::recordVotes(const std::vector<VoteRequest> &votes)
+{
+    std::vector<VoteOutcome> outcomes;
+    outcomes.reserve(votes.size());
+
+    std::lock_guard<std::mutex> lock(m_mutex);
+    bool changed = false;
+    for (const auto &vote : votes)
+    {
+        VoteOutcome outcome;
+        if (!vote.voteKey.empty() && m_appliedVoteKeys.count(vote.voteKey) > 0)
+        {
+            // Already applied (a retried request): acknowledge without counting again
+            outcome.accepted = true;
+            outcome.duplicate = true;
+        }
+        else
+        {
+            outcome.accepted = applyVoteUnlocked(vote.matchId, vote.playerId, outcome.error);
+            if (outcome.accepted && !vote.voteKey.empty())
+            {
+                m_appliedVoteKeys.insert(vote.voteKey);
+                m_unsavedVoteKeys.push_back(vote.voteKey);
+            }
+            changed = changed || outcome.accepted;
+        }
+        outcomes.push_back(std::move(outcome));
+    }
+    // One save (one transaction) for the whole batch
+    if (changed)
+    {
+        persistUnlocked();
+    }
+    return outcomes;
+}
+
+bool VotingService::applyVoteUnlocked(int matchId, int playerId, std::string &errorMessage)
+{
     auto matchIter = std::find_if(m_matches.begin(), m_matches.end(), [matchId](const Match &m)
                                   { return m.getId() == matchId && m.isActive(); });
     if (matchIter == m_matches.end())
@@ -97,7 +167,6 @@ bool VotingService::recordVote(int matchId, int playerId, std::string &errorMess
 
     const_cast<Player &>(*playerIter).incrementVote();
     m_votes[matchId][playerId]++;
-    persistUnlocked();
     return true;
 }
 
@@ -129,6 +198,80 @@ std::map<int, int> VotingService::votesForMatch(int matchId) const
     return m_votes.at(matchId);
 }
 
+std::vector<VoteChecksum> VotingService::voteChecksums() const
+{
+    std::lock_guard<std::mutex> lock(m_mutex);
+    std::vector<VoteChecksum> checksums;
+    checksums.reserve(m_matches.size());
+    static const std::map<int, int> noVotes;
+    for (const auto &match : m_matches)
+    {
+        const auto votesIter = m_votes.find(match.getId());
+        const auto &tallies = votesIter == m_votes.end() ? noVotes : votesIter->second;
+        int total = 0;
+        for (const auto &[playerId, count] : tallies)
+        {
+            total += count;
+        }
+        checksums.push_back({match.getId(), total, tallyChecksum(tallies)});
+    }
+    return checksums;
+}
+
+bool VotingService::setVoteTallies(int matchId, const std::map<int, int> &tallies, int &changed, std::string &errorMessage)
+{
+    std::lock_guard<std::mutex> lock(m_mutex);
+    changed = 0;
+    auto matchIter = std::find_if(m_matches.begin(), m_matches.end(), [matchId](const Match &m)
+                                  { return m.getId() == matchId; });
+    if (matchIter == m_matches.end())
+    {
+        errorMessage = "Матч не знайдено";
+        return false;
+    }
+
+    // Validate everything first so a bad entry leaves the match untouched
+    for (const auto &[playerId, count] : tallies)
+    {
+        if (count < 0)
+        {
+            errorMessage = "Кількість голосів не може бути від'ємною";
+            return false;
+        }
+        if (std::none_of(m_players.begin(), m_players.end(), [playerId = playerId](const Player &p)
+                         { return p.getId() == playerId; }))
+        {
+            errorMessage = "Гравця не знайдено";
+            return false;
+        }
+    }
+
+    auto &matchVotes = m_votes[matchId];
+    for (const auto &[playerId, count] : tallies)
+    {
+        const int current = matchVotes.count(playerId) > 0 ? matchVotes[playerId] : 0;
+        if (current == count)
+            continue;
+        auto playerIter = std::find_if(m_players.begin(), m_players.end(), [playerId = playerId](const Player &p)
+                                       { return p.getId() == playerId; });
+        playerIter->adjustVotes(count - current);
+        if (count == 0)
+            matchVotes.erase(playerId);
+        else
+            matchVotes[playerId] = count;
+        ++changed;
+    }
+    if (matchVotes.empty())
+    {
+        m_votes.erase(matchId);
+    }
+    if (changed > 0)
+    {
+        persistUnlocked();
+    }
+    return true;
+}
+
 Stats VotingService::collectStats() const
 {
     std::lock_guard<std::mutex> lock(m_mutex);
@@ -278,10 +421,32 @@ std::vector<MatchStats> VotingService::collectMatchStats() const
 
 void VotingService::persistUnlocked()
 {
-    m_store.saveAll(m_players, m_matches, m_teams, m_votes);
+    // Every mutation persists, so bump the change counter here
+    ++m_version;
+    m_store.saveAll(m_players, m_matches, m_teams, m_votes, m_unsavedVoteKeys);
+    m_unsavedVoteKeys.clear();
     m_store.saveMatchStats(m_matchStats);
 }
 
+void VotingService::forgetVoteKeysUnlocked(int matchId)
+{
+    // Keys are "<user_id>:<match_id>"; the match is closed or deleted, so they are never needed again
+    const std::string suffix = ":" + std::to_string(matchId);
+    for (auto it = m_appliedVoteKeys.begin(); it != m_appliedVoteKeys.end();)
+    {
+        const std::string &key = *it;
+        bool belongsToMatch = key.size() > suffix.size() &&
+                              key.compare(key.size() - suffix.size(), suffix.size(), suffix) == 0;
+        it = belongsToMatch ? m_appliedVoteKeys.erase(it) : std::next(it);
+    }
+    m_store.pruneVoteKeys();
+}
+
+std::uint64_t VotingService::version() const
+{
+    return m_version.load();
+}
+
 bool VotingService::closeMatch(int matchId, std::string &errorMessage)
 {
     return setMatchActive(matchId, false, errorMessage);
@@ -311,6 +476,10 @@ bool VotingService::setMatchActive(int matchId, bool isActive, std::string &erro
     }
 
     persistUnlocked();
+    if (!isActive)
+    {
+        forgetVoteKeysUnlocked(matchId);
+    }
     return true;
 }
 
@@ -368,6 +537,7 @@ bool VotingService::deleteMatch(int matchId, std::string &errorMessage)
     m_matchStats.erase(matchId);
 
     persistUnlocked();
+    forgetVoteKeysUnlocked(matchId);
     return true;
 }
 
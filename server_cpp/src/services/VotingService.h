@@ -1,7 +1,10 @@
 ﻿#pragma once
 
+#include <atomic>
+#include <cstdint>
 #include <map>
 #include <mutex>
+#include <set>
 #include <string>
 #include <vector>
 
@@ -14,6 +17,30 @@
 #include "storage/SqliteStore.h"
 #include "IVoteService.h"
 
+// A vote within a batch; a non-empty voteKey makes retries of the same vote no-ops
+struct VoteRequest
+{
+    int matchId{0};
+    int playerId{0};
+    std::string voteKey;
+};
+
+// Result of a single vote within a batch
+struct VoteOutcome
+{
+    bool accepted{false};
+    bool duplicate{false};
+    std::string error;
+};
+
+// Per-match digest of the vote tallies, compared by the reconciliation job
+struct VoteChecksum
+{
+    int matchId{0};
+    int total{0};
+    std::string checksum;
+};
+
 class VotingService : public IVoteService
 {
 public:
@@ -23,11 +50,16 @@ public:
     Player addPlayer(const std::string &name, const std::string &position, int teamId);
     Match addMatch(const std::string &team1, const std::string &team2, const std::string &team1Formation = "4-3-3", const std::string &team2Formation = "4-3-3");
     bool recordVote(int matchId, int playerId, std::string &errorMessage) override;
+    // Applies votes under one lock and persists once
+    std::vector<VoteOutcome> recordVotes(const std::vector<VoteRequest> &votes);
 
     std::vector<Team> listTeams() const;
     std::vector<Player> listPlayers() const;
     std::vector<Match> listMatches() const;
     std::map<int, int> votesForMatch(int matchId) const;
+    std::vector<VoteChecksum> voteChecksums() const;
+    // Overwrites the given per-player tallies of a match (0 removes); player totals follow
+    bool setVoteTallies(int matchId, const std::map<int, int> &tallies, int &changed, std::string &errorMessage);
     Stats collectStats() const;
     std::vector<MatchStats> collectMatchStats() const;
     bool closeMatch(int matchId, std::string &errorMessage);
@@ -35,6 +67,8 @@ public:
     bool updateMatchStats(int matchId, const MatchStats &stats, std::string &errorMessage);
     bool deleteMatch(int matchId, std::string &errorMessage);
     MatchStats getMatchStats(int matchId) const;
+    // Change counter, incremented on every mutation (used for ETags)
+    std::uint64_t version() const;
 
 private:
     SqliteStore m_store;
@@ -44,10 +78,15 @@ private:
     std::vector<Match> m_matches;
     std::map<int, std::map<int, int>> m_votes;
     std::map<int, MatchStats> m_matchStats; // matchId -> MatchStats
+    std::set<std::string> m_appliedVoteKeys;
+    std::vector<std::string> m_unsavedVoteKeys;
     int m_nextTeamId{1};
     int m_nextPlayerId{1};
     int m_nextMatchId{1};
+    std::atomic<std::uint64_t> m_version{1};
 
+    bool applyVoteUnlocked(int matchId, int playerId, std::string &errorMessage);
     void persistUnlocked();
+    void forgetVoteKeysUnlocked(int matchId);
     static std::string makeTimestamp();
 };
@@ -167,6 +167,10 @@ void SqliteStore::createTables() {
             FOREIGN KEY (player_id) REFERENCES players(id)
         );
 
+        CREATE TABLE IF NOT EXISTS applied_vote_keys (
+            vote_key TEXT PRIMARY KEY
+        );
+
         CREATE TABLE IF NOT EXISTS match_stats (
             match_id INTEGER PRIMARY KEY,
             team1 TEXT NOT NULL,
@@ -357,6 +361,33 @@ int SqliteStore::loadMatches(std::vector<Match>& matches) const {
     return maxId > 0 ? maxId + 1 : 1;
 }
 
+std::set<std::string> SqliteStore::loadVoteKeys() const {
+    std::set<std::string> result;
+    if (!m_db) return result;
+
+    sqlite3_stmt* stmt;
+    if (sqlite3_prepare_v2(m_db, "SELECT vote_key FROM applied_vote_keys", -1, &stmt, nullptr) != SQLITE_OK) {
+        return result;
+    }
+    while (sqlite3_step(stmt) == SQLITE_ROW) {
+        result.insert(reinterpret_cast<const char*>(sqlite3_column_text(stmt, 0)));
+    }
+    sqlite3_finalize(stmt);
+    return result;
+}
+
+void SqliteStore::pruneVoteKeys() const {
+    if (!m_db) return;
+
+    // No vote for such a match can be applied anymore, so no retry needs its key
+    const char* sql = R"(
+        DELETE FROM applied_vote_keys
+        WHERE CAST(substr(vote_key, instr(vote_key, ':') + 1) AS INTEGER)
+              NOT IN (SELECT id FROM matches WHERE isActive = 1)
+    )";
+    sqlite3_exec(m_db, sql, nullptr, nullptr, nullptr);
+}
+
 std::map<int, std::map<int, int>> SqliteStore::loadVotes() const {
     std::map<int, std::map<int, int>> result;
     if (!m_db) return result;
@@ -465,7 +496,8 @@ std::map<int, MatchStats> SqliteStore::loadMatchStats() const {
 void SqliteStore::saveAll(const std::vector<Player>& players,
                           const std::vector<Match>& matches,
                           const std::vector<Team>& teams,
-                          const std::map<int, std::map<int, int>>& votes) const {
+                          const std::map<int, std::map<int, int>>& votes,
+                          const std::vector<std::string>& newVoteKeys) const {
     if (!m_db) return;
 
     // Begin transaction
@@ -542,6 +574,21 @@ void SqliteStore::saveAll(const std::vector<Player>& players,
         stmt = nullptr;
     }
 
+    // Idempotency keys of votes applied since the last save (same transaction as the votes)
+    if (!newVoteKeys.empty()) {
+        const char* keySql = "INSERT OR IGNORE INTO applied_vote_keys (vote_key) VALUES (?)";
+        rc = sqlite3_prepare_v2(m_db, keySql, -1, &stmt, nullptr);
+        if (rc == SQLITE_OK) {
+            for (const auto& key : newVoteKeys) {
+                sqlite3_bind_text(stmt, 1, key.c_str(), -1, SQLITE_STATIC);
+                sqlite3_step(stmt);
+                sqlite3_reset(stmt);
+            }
+            sqlite3_finalize(stmt);
+            stmt = nullptr;
+        }
+    }
+
     // Commit transaction
     sqlite3_exec(m_db, "COMMIT", nullptr, nullptr, nullptr);
 }
@@ -1,6 +1,7 @@
 #pragma once
 
 #include <map>
+#include <set>
 #include <string>
 #include <vector>
 #include <sqlite3.h>
@@ -24,11 +25,15 @@ public:
     int loadMatches(std::vector<Match>& matches) const;
     std::map<int, std::map<int, int>> loadVotes() const;
     std::map<int, MatchStats> loadMatchStats() const;
+    std::set<std::string> loadVoteKeys() const;
+    // Drop idempotency keys ("<user>:<match>") of matches that are closed or gone
+    void pruneVoteKeys() const;
 
     void saveAll(const std::vector<Player>& players,
                  const std::vector<Match>& matches,
                  const std::vector<Team>& teams,
-                 const std::map<int, std::map<int, int>>& votes) const;
+                 const std::map<int, std::map<int, int>>& votes,
+                 const std::vector<std::string>& newVoteKeys = {}) const;
     void saveMatchStats(const std::map<int, MatchStats>& matchStats) const;
 
 private:
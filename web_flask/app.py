@@ -1,12 +1,15 @@
 """Flask application factory - with authentication."""
-from flask import Flask, g, session
-from config import SECRET_KEY
-from utils.database import get_db, close_db, init_user_db
-from utils.api_client import get_cached_stats
+from flask import Flask, g
+from config import SECRET_KEY, API_REFRESHER_ENABLED, VOTE_OUTBOX_REPLAY_ENABLED, CACHE_SYNC_ENABLED
+from utils.auth import current_user
+from utils.database import close_db, init_user_db
+from utils.api_client import get_cached_stats, start_refresher
+from utils.cache_sync import start_cache_sync
 from utils.logger import setup_logger
+from utils.vote_outbox import start_replayer
 from routes import (
     auth_bp, dashboard_bp, matches_bp, players_bp,
-    stats_bp, admin_bp, health_bp, profile_bp, comments_bp, posts_bp
+    stats_bp, admin_bp, health_bp, profile_bp, comments_bp, posts_bp, search_bp
 )
 
 
@@ -41,67 +44,28 @@ def create_app() -> Flask:
     app.register_blueprint(profile_bp)
     app.register_blueprint(comments_bp)
     app.register_blueprint(posts_bp)
+    app.register_blueprint(search_bp)
 
-    # Initialize database on first request
-    _bootstrap_completed = False
+    # Apply pending schema migrations before serving (one pragma read when up to date)
+    with app.app_context():
+        init_user_db()
 
-    @app.before_request
-    def bootstrap():
-        """Bootstrap database and cache on first request."""
-        nonlocal _bootstrap_completed
-        if not _bootstrap_completed:
-            init_user_db()
-            _bootstrap_completed = True
-
-    @app.before_request
-    def load_logged_in_user():
-        """Load logged in user from session."""
-        user_id = session.get("user_id")
-
-        if not user_id:
-            g.user = None
-            return
+    # Keep hot backend endpoints warm (stale-while-revalidate)
+    if API_REFRESHER_ENABLED:
+        start_refresher()
 
-        # Try to get from session first
-        username = session.get("username")
-        role = session.get("role")
+    # Replay votes stored while the backend was down
+    if VOTE_OUTBOX_REPLAY_ENABLED:
+        start_replayer(app)
 
-        # If we have all session data, create user dict
-        if username and role:
-            g.user = {
-                "id": user_id,
-                "username": username,
-                "role": role
-            }
-            return
+    # Keep cached_players/cached_matches in step with the backend
+    if CACHE_SYNC_ENABLED:
+        start_cache_sync(app)
 
-        # Otherwise, load from database
-        try:
-            db = get_db()
-            user = db.execute(
-                "SELECT id, username, role FROM users WHERE id = ?", (user_id,)
-            ).fetchone()
-
-            if user:
-                # Update session with user data
-                session["username"] = user["username"]
-                session["role"] = user["role"]
-                session.modified = True
-
-                g.user = {
-                    "id": user["id"],
-                    "username": user["username"],
-                    "role": user["role"]
-                }
-            else:
-                # User not found in database, clear session
-                session.clear()
-                g.user = None
-        except Exception as e:
-            # Database error, clear session
-            app.logger.error(f"Error loading user: {e}")
-            session.clear()
-            g.user = None
+    @app.before_request
+    def load_logged_in_user():
+        """Resolve the logged-in user once for the request (user cache, see utils/auth.py)."""
+        current_user()
 
     @app.context_processor
     def inject_globals():
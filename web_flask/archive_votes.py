@@ -0,0 +1,34 @@
+"""Move user_votes of closed matches to user_votes_archive (backfill; closing a match archives it too)."""
+import argparse
+import sys
+
+from utils.database import connect, init_user_db
+from utils.vote_archive import archive_match, closed_matches_to_archive
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--match", type=int, help="архівувати лише цей матч")
+    args = parser.parse_args()
+
+    init_user_db()
+    conn = connect()
+    try:
+        match_ids = [args.match] if args.match else closed_matches_to_archive(conn)
+        total = 0
+        for match_id in match_ids:
+            with conn:
+                moved = archive_match(conn, match_id)
+            total += moved
+            print(f"  Матч {match_id}: архівовано голосів {moved}")
+    except Exception as e:
+        print(f"✗ Помилка архівування голосів: {e}")
+        return 1
+    finally:
+        conn.close()
+    print(f"✓ Архівовано матчів: {len(match_ids)}, голосів: {total}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
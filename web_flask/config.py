@@ -5,20 +5,146 @@ from pathlib import Path
 BASE_DIR = Path(__file__).resolve().parent
 DATA_DIR = BASE_DIR / "data"
 DATA_DIR.mkdir(exist_ok=True)
-DB_PATH = DATA_DIR / "database.sqlite"
+DB_PATH = Path(os.getenv("FLASK_DB_PATH", str(DATA_DIR / "database.sqlite")))
+
+# SQLite tuning for the Flask database (applied to every connection)
+SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+SQLITE_BUSY_TIMEOUT = float(os.getenv("SQLITE_BUSY_TIMEOUT", "5.0"))
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(64 * 1024 * 1024)))
+SQLITE_STATEMENT_CACHE = int(os.getenv("SQLITE_STATEMENT_CACHE", "256"))
+# Idle connections kept open for reuse (per database file); more may be open during a burst
+SQLITE_POOL_SIZE = int(os.getenv("SQLITE_POOL_SIZE", "16"))
+# How long a starting worker waits for another one that is applying migrations, seconds
+MIGRATION_LOCK_TIMEOUT = float(os.getenv("MIGRATION_LOCK_TIMEOUT", "60.0"))
+
 SESSION_DIR = BASE_DIR / "flask_session"
 SESSION_DIR.mkdir(exist_ok=True)
 
+
+def _endpoint_map_from_env(name: str) -> dict:
+    """Parse "endpoint=seconds,endpoint=seconds" from an environment variable."""
+    result = {}
+    for item in os.getenv(name, "").split(","):
+        if "=" in item:
+            endpoint, seconds = item.split("=", 1)
+            result[endpoint.strip()] = float(seconds)
+    return result
+
+
 # API Configuration
 API_BASE_URL = os.getenv("API_BASE_URL", "http://localhost:8080/api")
 REQUEST_TIMEOUT = float(os.getenv("API_TIMEOUT", "5.0"))
 # Not used for voting anymore
 REQUEST_TIMEOUT_POST = float(os.getenv("API_TIMEOUT_POST", "5.0"))
 CACHE_TTL = float(os.getenv("API_CACHE_TTL", "5.0"))
+# Maximum number of cached backend responses (least recently used are evicted)
+API_CACHE_MAX_ENTRIES = int(os.getenv("API_CACHE_MAX_ENTRIES", "512"))
+# Per-endpoint cache TTLs in seconds, matched by longest prefix (default: CACHE_TTL).
+# Override with API_CACHE_TTLS="/teams=600,/votes/=0.5"
+API_CACHE_TTLS = {
+    "/teams": 300.0,
+    "/players": 5.0,
+    "/stats": 5.0,
+    "/match-stats": 5.0,
+    "/matches-page": 30.0,
+    "/votes/": 1.0,
+}
+API_CACHE_TTLS.update(_endpoint_map_from_env("API_CACHE_TTLS"))
+# Hot endpoints kept warm by the background refresher (stale-while-revalidate)
+API_HOT_ENDPOINTS = [ep.strip() for ep in os.getenv(
+    "API_HOT_ENDPOINTS", "/stats,/players,/match-stats").split(",") if ep.strip()]
+API_REFRESH_INTERVAL = float(os.getenv("API_REFRESH_INTERVAL", "1.0"))
+# Oldest data served while revalidating; older entries are fetched synchronously
+API_MAX_STALENESS = float(os.getenv("API_MAX_STALENESS", "60.0"))
+API_REFRESHER_ENABLED = os.getenv("API_REFRESHER_ENABLED", "1") == "1"
+# Optional second cache tier shared by all worker processes on the node (SQLite WAL file)
+API_SHARED_CACHE_ENABLED = os.getenv("API_SHARED_CACHE_ENABLED", "0") == "1"
+API_SHARED_CACHE_PATH = os.getenv("API_SHARED_CACHE_PATH", str(DATA_DIR / "api_cache.sqlite"))
+API_SHARED_CACHE_MAX_ENTRIES = int(os.getenv("API_SHARED_CACHE_MAX_ENTRIES", "2048"))
+# How often a worker applies invalidations published by other workers, seconds
+API_INVALIDATION_POLL_INTERVAL = float(os.getenv("API_INVALIDATION_POLL_INTERVAL", "0.5"))
+
+# Shared HTTP connection pool for backend calls
+API_POOL_SIZE = int(os.getenv("API_POOL_SIZE", "20"))
+# Block (instead of opening an extra throw-away connection) when the pool is exhausted
+API_POOL_BLOCK = os.getenv("API_POOL_BLOCK", "0") == "1"
+# Per-endpoint timeouts in seconds, matched by longest prefix.
+# Override with API_ENDPOINT_TIMEOUTS="/players=3,/votes/=1.5"
+API_ENDPOINT_TIMEOUTS = {
+    "/stats": 2.0,
+    "/teams": 3.0,
+    "/players": 3.0,
+    "/matches-page": 3.0,
+    "/match-stats": 4.0,
+    "/votes/": 2.0,
+    "/votes/batch": 5.0,
+    "/votes/checksums": 5.0,
+    "/votes/reconcile": 5.0,
+    "/vote": 5.0,
+}
+API_ENDPOINT_TIMEOUTS.update(_endpoint_map_from_env("API_ENDPOINT_TIMEOUTS"))
+# Concurrent fan-out of several backend GETs within one view
+API_FANOUT_WORKERS = int(os.getenv("API_FANOUT_WORKERS", "16"))
+API_FANOUT_DEADLINE = float(os.getenv("API_FANOUT_DEADLINE", "4.0"))
+# Circuit breaker: open after N consecutive failures, try again after the reset timeout
+API_BREAKER_FAILURE_THRESHOLD = int(os.getenv("API_BREAKER_FAILURE_THRESHOLD", "5"))
+API_BREAKER_RESET_TIMEOUT = float(os.getenv("API_BREAKER_RESET_TIMEOUT", "10.0"))
+# Bulkhead: concurrent requests per endpoint group, and how long to wait for a slot
+API_BULKHEAD_MAX_CONCURRENT = int(os.getenv("API_BULKHEAD_MAX_CONCURRENT", "8"))
+API_BULKHEAD_WAIT = float(os.getenv("API_BULKHEAD_WAIT", "0.05"))
+
+# Write-behind vote batching: votes arriving within the window go in one /votes/batch call
+VOTE_BATCH_ENABLED = os.getenv("VOTE_BATCH_ENABLED", "1") == "1"
+VOTE_BATCH_WINDOW = float(os.getenv("VOTE_BATCH_WINDOW", "0.02"))
+VOTE_BATCH_MAX_SIZE = int(os.getenv("VOTE_BATCH_MAX_SIZE", "200"))
+VOTE_BATCH_SENDERS = int(os.getenv("VOTE_BATCH_SENDERS", "4"))
+
+# Outbox replay of votes accepted while the backend was unavailable
+VOTE_OUTBOX_REPLAY_ENABLED = os.getenv("VOTE_OUTBOX_REPLAY_ENABLED", "1") == "1"
+VOTE_OUTBOX_INTERVAL = float(os.getenv("VOTE_OUTBOX_INTERVAL", "2.0"))
+VOTE_OUTBOX_BATCH_SIZE = int(os.getenv("VOTE_OUTBOX_BATCH_SIZE", "100"))
+VOTE_OUTBOX_MAX_BACKOFF = float(os.getenv("VOTE_OUTBOX_MAX_BACKOFF", "300.0"))
+
+# Idempotency-Key store: recent keys (per process) and how long their responses are replayed
+IDEMPOTENCY_MAX_KEYS = int(os.getenv("IDEMPOTENCY_MAX_KEYS", "10000"))
+IDEMPOTENCY_TTL = float(os.getenv("IDEMPOTENCY_TTL", "3600"))
+
+# Background sync of cached_players/cached_matches: period, and minimum gap when writes ask for one
+CACHE_SYNC_ENABLED = os.getenv("CACHE_SYNC_ENABLED", "1") == "1"
+CACHE_SYNC_INTERVAL = float(os.getenv("CACHE_SYNC_INTERVAL", "30.0"))
+CACHE_SYNC_MIN_INTERVAL = float(os.getenv("CACHE_SYNC_MIN_INTERVAL", "1.0"))
+
+# Keyset pagination of posts, comments and vote history: default and maximum page size
+PAGE_DEFAULT_LIMIT = int(os.getenv("PAGE_DEFAULT_LIMIT", "50"))
+PAGE_MAX_LIMIT = int(os.getenv("PAGE_MAX_LIMIT", "200"))
+
+# Logged-in user cache (per process): entries, and how long another process's role change may go unseen
+USER_CACHE_MAX_ENTRIES = int(os.getenv("USER_CACHE_MAX_ENTRIES", "10000"))
+USER_CACHE_TTL = float(os.getenv("USER_CACHE_TTL", "60"))
+
+# Password hashing: werkzeug method and salt (stored hashes with other parameters are rehashed on login),
+# worker processes (0 - hash in the request thread), queued hashes per process and how long to wait for a slot
+PASSWORD_HASH_METHOD = os.getenv("PASSWORD_HASH_METHOD", "scrypt:32768:8:1")
+PASSWORD_SALT_LENGTH = int(os.getenv("PASSWORD_SALT_LENGTH", "16"))
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 1)))
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", str(4 * max(1, PASSWORD_HASH_WORKERS))))
+PASSWORD_HASH_WAIT = float(os.getenv("PASSWORD_HASH_WAIT", "2.0"))
+
+# Vote reconciliation: seconds a difference must persist before it is repaired
+VOTE_RECONCILE_SETTLE = float(os.getenv("VOTE_RECONCILE_SETTLE", "2.0"))
+
+# Vote route's match_id -> state index: full rebuild age, and minimum gap between rebuilds
+MATCH_INDEX_MAX_AGE = float(os.getenv("MATCH_INDEX_MAX_AGE", "300.0"))
+MATCH_INDEX_RELOAD_INTERVAL = float(os.getenv("MATCH_INDEX_RELOAD_INTERVAL", "1.0"))
+
+# Logging: "queue" hands records to a background thread, "sync" writes in the request thread
+LOG_MODE = os.getenv("LOG_MODE", "queue").lower()
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+# Backend payloads are logged in full only at DEBUG; at INFO only this fraction, truncated
+LOG_PAYLOAD_SAMPLE_RATE = float(os.getenv("LOG_PAYLOAD_SAMPLE_RATE", "0.01"))
+LOG_PAYLOAD_MAX_CHARS = int(os.getenv("LOG_PAYLOAD_MAX_CHARS", "500"))
 
 # Flask Configuration
 SECRET_KEY = os.getenv("FLASK_SECRET_KEY", "dev-secret-key")
 SESSION_FILE_DIR = str(SESSION_DIR)
-
-# Stats Cache Configuration
-STATS_CACHE_TTL = 10.0  # Cache stats for 10 seconds
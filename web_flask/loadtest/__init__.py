@@ -0,0 +1 @@
+"""Load-test harness: a fake C++ backend and matchday scenarios against the Flask app."""
@@ -0,0 +1,52 @@
+"""Run a matchday load test: python -m loadtest --users 50 --duration 30"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+
+from loadtest.fake_backend import FakeBackend
+from loadtest.runner import format_report, run_matchday, start_app
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Matchday load test against a local fake backend")
+    parser.add_argument("--users", type=int, default=50, help="concurrent fans")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds to run")
+    parser.add_argument("--matches", type=int, default=3, help="matches on the fake backend")
+    parser.add_argument("--burst-every", type=float, default=10.0,
+                        help="seconds between vote bursts (0 disables voting)")
+    parser.add_argument("--think-time", type=float, default=0.05,
+                        help="maximum pause between a fan's actions, seconds")
+    parser.add_argument("--latency", type=float, default=0.005, help="backend latency, seconds")
+    parser.add_argument("--jitter", type=float, default=0.005, help="extra random backend latency, seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of backend 503s")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", dest="json_path", help="also write the report to this file")
+    args = parser.parse_args()
+
+    backend = FakeBackend(matches=args.matches, latency=args.latency, jitter=args.jitter,
+                          error_rate=args.error_rate, seed=args.seed).start()
+    with tempfile.TemporaryDirectory() as tmp:
+        base_url, server = start_app(backend.url, os.path.join(tmp, "loadtest.sqlite"))
+        try:
+            report = run_matchday(base_url, {m["id"]: backend.players_of(m["id"]) for m in backend.matches},
+                                  users=args.users, duration=args.duration,
+                                  burst_every=args.burst_every, think_time=args.think_time,
+                                  seed=args.seed)
+        finally:
+            server.shutdown()
+            backend.stop()
+    report["backend_requests"] = dict(backend.requests.most_common())
+    report["config"] = vars(args)
+
+    print(format_report(report))
+    print(f"backend requests: {sum(backend.requests.values())}")
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+    return 0 if report["total"]["errors"] + report["setup"]["total"]["errors"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
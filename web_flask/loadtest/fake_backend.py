@@ -0,0 +1,203 @@
+"""Local stand-in for the C++ backend with injectable latency and errors."""
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Tuple
+
+_VOTES_PATH = re.compile(r"^/api/votes/(\d+)$")
+_MATCH_STATS_PATH = re.compile(r"^/api/match-stats/(\d+)$")
+
+
+class FakeBackend:
+    """In-memory backend serving the endpoints the Flask app calls.
+
+    Every response waits ``latency`` seconds (plus up to ``jitter``), and a
+    fraction ``error_rate`` of requests fail with 503. GET responses carry an
+    ETag from a change counter and honour ``If-None-Match``, like the real one.
+    """
+
+    def __init__(self, matches: int = 3, players_per_team: int = 11, latency: float = 0.0,
+                 jitter: float = 0.0, error_rate: float = 0.0, seed: int | None = None):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._version = 1
+        self.requests: Counter = Counter()
+        self.teams: List[Dict[str, Any]] = []
+        self.players: List[Dict[str, Any]] = []
+        self.matches: List[Dict[str, Any]] = []
+        self.votes: Dict[int, Dict[int, int]] = {}
+        self.vote_keys: set = set()
+        for match_id in range(1, matches + 1):
+            home, away = 2 * match_id - 1, 2 * match_id
+            for team_id in (home, away):
+                self.teams.append({"id": team_id, "name": f"Team {team_id}"})
+                for _ in range(players_per_team):
+                    self.players.append({"id": len(self.players) + 1,
+                                         "name": f"Player {len(self.players) + 1}",
+                                         "position": "MF", "team_id": team_id, "votes": 0})
+            self.matches.append({"id": match_id, "team1": f"Team {home}", "team2": f"Team {away}",
+                                 "date": "2026-01-01 18:00:00", "isActive": True,
+                                 "team1_formation": "4-3-3", "team2_formation": "4-4-2"})
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        """Base URL to use as API_BASE_URL."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/api"
+
+    def players_of(self, match_id: int) -> List[int]:
+        """Ids of the players who can be voted for in a match."""
+        team_ids = {2 * match_id - 1, 2 * match_id}
+        return [p["id"] for p in self.players if p["team_id"] in team_ids]
+
+    def start(self) -> "FakeBackend":
+        self._thread = threading.Thread(target=self._server.serve_forever,
+                                        name="fake-backend", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    # --- request handling -------------------------------------------------
+
+    def handle(self, method: str, path: str, body: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        """Route a request. Returns (status, JSON body)."""
+        with self._lock:
+            if method == "GET":
+                return 200, self._get(path)
+            return 200, self._post(path, body)
+
+    def _get(self, path: str) -> Dict[str, Any]:
+        if path == "/api/teams":
+            return {"teams": self.teams}
+        if path == "/api/players":
+            return {"players": self.players}
+        if path == "/api/matches":
+            return {"matches": self.matches}
+        if path == "/api/matches-page":
+            return {"matches": self.matches, "teams": self.teams}
+        if path == "/api/stats":
+            return {"total_players": len(self.players), "total_matches": len(self.matches),
+                    "total_votes": sum(sum(v.values()) for v in self.votes.values())}
+        if path == "/api/match-stats":
+            return {"matches": [self._match_stats(m) for m in self.matches]}
+        match = _VOTES_PATH.match(path)
+        if match:
+            match_id = int(match.group(1))
+            return {"match_id": match_id, "votes": [
+                {"player_id": p, "votes": c} for p, c in sorted(self.votes.get(match_id, {}).items())]}
+        match = _MATCH_STATS_PATH.match(path)
+        if match:
+            return {"match_id": int(match.group(1)), "team1_possession": 50, "team2_possession": 50}
+        return {"error": "Route not found"}
+
+    def _post(self, path: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        if path == "/api/vote":
+            return self._vote(body)
+        if path == "/api/votes/batch":
+            return {"status": "success", "results": [self._vote(v) for v in body.get("votes", [])]}
+        if path in ("/api/matches/close", "/api/matches/set-active"):
+            match = self._match(body.get("match_id"))
+            if match is None:
+                return {"status": "error", "message": "Матч не знайдено"}
+            match["isActive"] = path.endswith("set-active") and str(body.get("is_active")) in ("1", "true", "True")
+            self._version += 1
+            return {"status": "success"}
+        if path == "/api/matches/update-stats":
+            return {"status": "success"}
+        return {"status": "error", "message": "Route not found"}
+
+    def _vote(self, vote: Dict[str, Any]) -> Dict[str, Any]:
+        key = vote.get("vote_key")
+        if key and key in self.vote_keys:
+            return {"status": "success", "message": "Голос зараховано", "duplicate": True}
+        match = self._match(vote.get("match_id"))
+        if match is None or not match["isActive"]:
+            return {"status": "error", "message": "Матч не знайдено або вже завершено"}
+        player_id = int(vote.get("player_id", 0))
+        if not 1 <= player_id <= len(self.players):
+            return {"status": "error", "message": "Гравця не знайдено"}
+        tallies = self.votes.setdefault(match["id"], {})
+        tallies[player_id] = tallies.get(player_id, 0) + 1
+        self.players[player_id - 1]["votes"] += 1
+        if key:
+            self.vote_keys.add(key)
+        self._version += 1
+        return {"status": "success", "message": "Голос зараховано"}
+
+    def _match(self, match_id: Any) -> Dict[str, Any] | None:
+        try:
+            match_id = int(match_id)
+        except (TypeError, ValueError):
+            return None
+        return next((m for m in self.matches if m["id"] == match_id), None)
+
+    def _match_stats(self, match: Dict[str, Any]) -> Dict[str, Any]:
+        tallies = self.votes.get(match["id"], {})
+        return {"match_id": match["id"], "team1": match["team1"], "team2": match["team2"],
+                "date": match["date"], "is_active": match["isActive"],
+                "total_votes": sum(tallies.values())}
+
+    def _handler_class(self):
+        backend = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _serve(self, method: str) -> None:
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length) if length else b""
+                with backend._lock:
+                    backend.requests[f"{method} {self.path}"] += 1
+                delay = backend.latency + backend._random.uniform(0, backend.jitter)
+                if delay > 0:
+                    time.sleep(delay)
+                if backend._random.random() < backend.error_rate:
+                    self._reply(503, {"error": "injected failure"})
+                    return
+                try:
+                    body = json.loads(raw) if raw else {}
+                except ValueError:
+                    body = {}
+                status, payload = backend.handle(method, self.path, body)
+                etag = f'"fake-{backend._version}"'
+                if method == "GET" and self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                self._reply(status, payload, etag if method == "GET" else None)
+
+            def _reply(self, status: int, payload: Dict[str, Any], etag: str | None = None) -> None:
+                data = json.dumps(payload, ensure_ascii=False).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                if etag:
+                    self.send_header("ETag", etag)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                self._serve("GET")
+
+            def do_POST(self):
+                self._serve("POST")
+
+        return Handler
@@ -0,0 +1,103 @@
+"""Login throughput benchmark: python -m loadtest.logins --workers 4 --concurrency 16 --duration 10"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict
+
+import requests
+
+from loadtest.fake_backend import FakeBackend
+from loadtest.runner import Recorder, start_app
+
+PASSWORD = "bench-password"
+
+
+def _post_form(base_url: str, path: str, username: str) -> bool:
+    response = requests.post(f"{base_url}{path}", data={"username": username, "password": PASSWORD},
+                             allow_redirects=False, timeout=60)
+    return response.status_code == 302 and "success=" in response.headers.get("Location", "")
+
+
+def run_logins(base_url: str, users: int, concurrency: int, duration: float) -> Dict[str, Any]:
+    """Register ``users`` accounts, then log in with them from ``concurrency`` threads for ``duration`` s."""
+    usernames = [f"bench{i}" for i in range(users)]
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        registered = sum(executor.map(lambda name: _post_form(base_url, "/register", name), usernames))
+    if registered != users:
+        raise RuntimeError(f"registered {registered} of {users} users")
+
+    recorder = Recorder()
+    deadline = time.monotonic() + duration
+
+    def login_loop(index: int) -> None:
+        i = index
+        while time.monotonic() < deadline:
+            started = time.perf_counter()
+            try:
+                ok = _post_form(base_url, "/login", usernames[i % users])
+            except requests.RequestException:
+                ok = False
+            recorder.record("POST /login", time.perf_counter() - started, ok)
+            i += concurrency
+
+    threads = [threading.Thread(target=login_loop, args=(i,), name=f"bench-login-{i}")
+               for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    recorder.finished_at = time.time()
+    return recorder.report()["routes"].get("POST /login", {"requests": 0, "errors": 0, "rps": 0.0})
+
+
+def main() -> int:
+    cores = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description="Login throughput of the Flask app (password hashing bound)")
+    parser.add_argument("--workers", type=int, default=cores,
+                        help="password hashing processes (0 - hash in the request threads)")
+    parser.add_argument("--method", default=None, help="werkzeug hash method (default: PASSWORD_HASH_METHOD)")
+    parser.add_argument("--concurrency", type=int, default=2 * cores, help="concurrent logins")
+    parser.add_argument("--users", type=int, default=20, help="accounts to log in with")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds to run")
+    parser.add_argument("--json", dest="json_path", help="also write the report to this file")
+    args = parser.parse_args()
+
+    # Settings are read when config is imported (by start_app)
+    os.environ["PASSWORD_HASH_WORKERS"] = str(args.workers)
+    if args.method:
+        os.environ["PASSWORD_HASH_METHOD"] = args.method
+    os.environ.setdefault("API_REFRESHER_ENABLED", "0")
+    os.environ.setdefault("CACHE_SYNC_ENABLED", "0")
+
+    backend = FakeBackend(matches=1).start()
+    with tempfile.TemporaryDirectory() as tmp:
+        base_url, server = start_app(backend.url, os.path.join(tmp, "logins.sqlite"))
+        try:
+            report = run_logins(base_url, users=args.users, concurrency=args.concurrency,
+                                duration=args.duration)
+        finally:
+            server.shutdown()
+            backend.stop()
+    from config import PASSWORD_HASH_METHOD
+    report["cores"] = cores
+    report["logins_per_core"] = round(report["rps"] / cores, 2)
+    report["config"] = dict(vars(args), method=PASSWORD_HASH_METHOD)
+
+    print(f"hash method {PASSWORD_HASH_METHOD}, {args.workers} hashing workers, "
+          f"{args.concurrency} concurrent logins, {cores} cores")
+    print(f"logins: {report['requests']} ({report['errors']} errors) "
+          f"p50 {report['p50_ms']} ms, p95 {report['p95_ms']} ms, p99 {report['p99_ms']} ms")
+    print(f"logins/s: {report['rps']}, logins/s per core: {report['logins_per_core']}")
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+    return 0 if report["errors"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
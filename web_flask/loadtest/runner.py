@@ -0,0 +1,204 @@
+"""Matchday load scenarios against the Flask app, with per-route latency report."""
+import math
+import os
+import random
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, List
+
+import requests
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of unsorted samples (0.0 for none)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(fraction * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+class Recorder:
+    """Collect latencies and failures per route name."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._latencies: Dict[str, List[float]] = defaultdict(list)
+        self._errors: Dict[str, int] = defaultdict(int)
+        self.started_at = time.time()
+        self.finished_at: float | None = None
+
+    def record(self, route: str, seconds: float, ok: bool) -> None:
+        with self._lock:
+            self._latencies[route].append(seconds)
+            if not ok:
+                self._errors[route] += 1
+
+    def report(self) -> Dict[str, Any]:
+        """Per-route count, errors, p50/p95/p99 (ms) and throughput (req/s)."""
+        elapsed = max(1e-9, (self.finished_at or time.time()) - self.started_at)
+        with self._lock:
+            latencies = {route: list(samples) for route, samples in self._latencies.items()}
+            errors = dict(self._errors)
+        routes = {}
+        for route, samples in sorted(latencies.items()):
+            routes[route] = {
+                "requests": len(samples),
+                "errors": errors.get(route, 0),
+                "p50_ms": round(percentile(samples, 0.50) * 1000, 2),
+                "p95_ms": round(percentile(samples, 0.95) * 1000, 2),
+                "p99_ms": round(percentile(samples, 0.99) * 1000, 2),
+                "rps": round(len(samples) / elapsed, 2),
+            }
+        every = [s for samples in latencies.values() for s in samples]
+        total = {
+            "requests": len(every),
+            "errors": sum(errors.values()),
+            "p50_ms": round(percentile(every, 0.50) * 1000, 2),
+            "p95_ms": round(percentile(every, 0.95) * 1000, 2),
+            "p99_ms": round(percentile(every, 0.99) * 1000, 2),
+            "rps": round(len(every) / elapsed, 2),
+        }
+        return {"duration_s": round(elapsed, 2), "routes": routes, "total": total}
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    """Render the report as a fixed-width table."""
+    lines = [f"{'route':<34}{'requests':>9}{'errors':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'req/s':>9}"]
+    rows = list(report["routes"].items()) + [("TOTAL", report["total"])]
+    for route, row in rows:
+        lines.append(f"{route:<34}{row['requests']:>9}{row['errors']:>8}{row['p50_ms']:>9}"
+                     f"{row['p95_ms']:>9}{row['p99_ms']:>9}{row['rps']:>9}")
+    lines.append(f"duration: {report['duration_s']} s")
+    setup = report.get("setup")
+    if setup and setup["routes"]:
+        lines.append(f"setup before the start, not in TOTAL ({setup['duration_s']} s):")
+        for route, row in setup["routes"].items():
+            lines.append(f"{route:<34}{row['requests']:>9}{row['errors']:>8}{row['p50_ms']:>9}"
+                         f"{row['p95_ms']:>9}{row['p99_ms']:>9}{row['rps']:>9}")
+    return "\n".join(lines)
+
+
+class Fan:
+    """A virtual user: logs in, polls stats, watches matches, votes and comments."""
+
+    def __init__(self, base_url: str, index: int, recorder: Recorder, match_players: Dict[int, List[int]],
+                 rng: random.Random, setup_recorder: Recorder | None = None):
+        self.base_url = base_url
+        self.username = f"loadfan{index}"
+        self.recorder = recorder
+        # Register/login happen before the measured window; keep them out of its throughput
+        self.setup_recorder = setup_recorder or recorder
+        self.match_players = match_players
+        self.rng = rng
+        self.session = requests.Session()
+        self.voted: set = set()
+
+    def call(self, route: str, method: str, path: str, recorder: Recorder | None = None,
+             **kwargs: Any) -> requests.Response | None:
+        recorder = recorder or self.recorder
+        started = time.perf_counter()
+        try:
+            response = self.session.request(method, self.base_url + path, timeout=30,
+                                            allow_redirects=False, **kwargs)
+        except requests.RequestException:
+            recorder.record(route, time.perf_counter() - started, ok=False)
+            return None
+        recorder.record(route, time.perf_counter() - started, ok=response.status_code < 500)
+        return response
+
+    def login(self) -> None:
+        credentials = {"username": self.username, "password": "loadtest-password"}
+        self.call("POST /register", "POST", "/register", self.setup_recorder, data=credentials)
+        self.call("POST /login", "POST", "/login", self.setup_recorder, data=credentials)
+
+    def poll_stats(self) -> None:
+        self.call("GET /api/stats-page", "GET", "/api/stats-page")
+
+    def watch_match(self, match_id: int) -> None:
+        self.call("GET /api/match-votes-cpp/<id>", "GET", f"/api/match-votes-cpp/{match_id}")
+        self.call("GET /api/vote-status/<id>", "GET", f"/api/vote-status/{match_id}")
+        self.call("GET /api/matches/<id>/comments", "GET", f"/api/matches/{match_id}/comments")
+
+    def comment(self, match_id: int) -> None:
+        self.call("POST /api/matches/<id>/comments", "POST", f"/api/matches/{match_id}/comments",
+                  json={"comment_text": f"{self.username}: come on!"})
+
+    def vote(self, match_id: int) -> None:
+        self.voted.add(match_id)
+        self.call("POST /api/vote", "POST", "/api/vote",
+                  json={"match_id": match_id, "player_id": self.rng.choice(self.match_players[match_id])})
+
+
+def run_matchday(base_url: str, match_players: Dict[int, List[int]], users: int, duration: float,
+                 burst_every: float, think_time: float = 0.05, seed: int = 1) -> Dict[str, Any]:
+    """Drive ``users`` fans for ``duration`` seconds and return the report.
+
+    Every ``burst_every`` seconds all fans vote in the next match at once (the
+    final whistle); in between they poll stats, watch a match and sometimes
+    comment, pausing up to ``think_time`` seconds between actions. Register
+    and login run before the start and are reported apart, under ``setup``.
+    """
+    recorder = Recorder()
+    setup = Recorder()
+    match_ids = sorted(match_players)
+    clock: Dict[str, float] = {}
+
+    def open_gate() -> None:
+        # Throughput and the schedule count from when every fan is logged in
+        setup.finished_at = recorder.started_at = clock["start"] = time.time()
+
+    start_gate = threading.Barrier(users, action=open_gate)
+
+    def fan_loop(index: int) -> None:
+        rng = random.Random(seed * 100003 + index)
+        fan = Fan(base_url, index, recorder, match_players, rng, setup)
+        fan.login()
+        start_gate.wait()
+        started = clock["start"]
+        while time.time() < started + duration:
+            burst = int((time.time() - started) // burst_every) if burst_every > 0 else -1
+            if 0 <= burst < len(match_ids) and match_ids[burst] not in fan.voted:
+                fan.vote(match_ids[burst])
+                continue
+            roll = rng.random()
+            match_id = rng.choice(match_ids)
+            if roll < 0.55:
+                fan.poll_stats()
+            elif roll < 0.95:
+                fan.watch_match(match_id)
+            else:
+                fan.comment(match_id)
+            time.sleep(rng.uniform(0, think_time))
+
+    threads = [threading.Thread(target=fan_loop, args=(i,), daemon=True) for i in range(users)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    recorder.finished_at = time.time()
+    report = recorder.report()
+    report["setup"] = setup.report()
+    return report
+
+
+def start_app(api_base_url: str, db_path: str):
+    """Start the Flask app in this process on a free port, wired to ``api_base_url``.
+
+    Must run before anything imports ``config``: settings are read at import.
+    Returns (base_url, server).
+    """
+    os.environ["API_BASE_URL"] = api_base_url
+    os.environ["FLASK_DB_PATH"] = db_path
+    os.environ.setdefault("API_SHARED_CACHE_ENABLED", "0")
+    import logging
+    from werkzeug.serving import make_server
+    from app import create_app
+    from utils.database import init_user_db
+
+    init_user_db()
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)  # no per-request access log
+    server = make_server("127.0.0.1", 0, create_app(), threaded=True)
+    threading.Thread(target=server.serve_forever, name="loadtest-flask", daemon=True).start()
+    return f"http://127.0.0.1:{server.server_port}", server
@@ -0,0 +1,30 @@
+"""Rebuild match_vote_tallies from user_votes (after a backfill or bulk import)."""
+import argparse
+import sys
+
+from utils.database import connect, init_user_db
+from utils.vote_tallies import rebuild_tallies
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--match", type=int, help="перерахувати лише цей матч")
+    args = parser.parse_args()
+
+    init_user_db()
+    conn = connect()
+    try:
+        with conn:
+            rows = rebuild_tallies(conn, args.match)
+    except Exception as e:
+        print(f"✗ Помилка перерахунку голосів: {e}")
+        return 1
+    finally:
+        conn.close()
+    scope = f"матчу {args.match}" if args.match else "усіх матчів"
+    print(f"✓ Перераховано лічильники {scope}: {rows} записів (гравець у матчі)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,37 @@
+"""Reconcile backend vote tallies with Flask user_votes (run e.g. nightly from cron)."""
+import argparse
+import json
+import sys
+
+from config import DB_PATH, VOTE_RECONCILE_SETTLE
+from utils.database import init_user_db
+from utils.reconcile import reconcile_votes
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--full", action="store_true",
+                        help="перевірити всі матчі, ігноруючи high-water mark")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="лише показати розбіжності, нічого не виправляти")
+    args = parser.parse_args()
+
+    init_user_db()
+    try:
+        report = reconcile_votes(str(DB_PATH), full=args.full, dry_run=args.dry_run,
+                                 settle=VOTE_RECONCILE_SETTLE)
+    except Exception as e:
+        print(f"✗ Помилка звірки голосів: {e}")
+        return 1
+
+    print(f"✓ Перевірено матчів: {report['checked']}, пропущено без змін: {report['skipped']}")
+    print(f"  Розбіжностей у матчах: {report['mismatched']}, виправлено гравців: {report['repaired']}")
+    for difference in report["differences"]:
+        print("  " + json.dumps(difference, ensure_ascii=False))
+    for error in report["errors"]:
+        print(f"✗ {json.dumps(error, ensure_ascii=False)}")
+    return 1 if report["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,6 +9,7 @@ from .health import bp as health_bp
 from .profile import bp as profile_bp
 from .comments import bp as comments_bp
 from .posts import bp as posts_bp
+from .search import bp as search_bp
 
-__all__ = ['auth_bp', 'dashboard_bp', 'matches_bp', 'players_bp', 'stats_bp', 'admin_bp', 'health_bp', 'profile_bp', 'comments_bp', 'posts_bp']
+__all__ = ['auth_bp', 'dashboard_bp', 'matches_bp', 'players_bp', 'stats_bp', 'admin_bp', 'health_bp', 'profile_bp', 'comments_bp', 'posts_bp', 'search_bp']
 
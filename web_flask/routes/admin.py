@@ -1,31 +1,50 @@
 """Admin routes."""
-from flask import Blueprint, jsonify, request, session, redirect, url_for
-from functools import wraps
-from utils.api_client import _post, _get
+from flask import Blueprint, jsonify, request, redirect, url_for
+from utils.api_client import (
+    _post, _get, get_pool_stats, get_cache_stats, get_refresher_stats,
+    get_breaker_stats, reset_breakers
+)
+from utils.invalidation import VOTES, MATCH, resource_key, publish
+from utils.match_index import match_index
+from utils.vote_batcher import get_batcher_stats
+from utils.vote_outbox import outbox_stats, get_replayer_stats
+from utils.cache_sync import sync_lag, get_cache_sync_stats
+from utils.auth import current_user, invalidate_user, get_user_cache_stats
+from utils.database import get_db
+from utils.passwords import get_password_stats
+from utils.decorators import admin_required
+from utils.vote_archive import archive_match, restore_match
+from utils.idempotency import idempotent, get_idempotency_stats
 
 bp = Blueprint('admin', __name__)
 
 
-def admin_required(f):
-    """Decorator to require admin role."""
-    @wraps(f)
-    def decorated_function(*args, **kwargs):
-        if not session.get('user_id'):
-            return jsonify({"error": "Unauthorized"}), 401
-        if session.get('role') != 'admin':
-            return jsonify({"error": "Admin access required"}), 403
-        return f(*args, **kwargs)
-    return decorated_function
+def _move_votes(move, match_id):
+    """Archive or restore a match's user_votes (the match state change already succeeded)."""
+    db = get_db()
+    try:
+        moved = move(db, match_id)
+        db.commit()
+        from flask import current_app
+        current_app.logger.info("%s: match %s, %s votes", move.__name__, match_id, moved)
+    except Exception as e:
+        db.rollback()
+        from flask import current_app
+        current_app.logger.error(f"Error moving votes of match {match_id}: {e}")
 
 
 @bp.route("/api/admin/match/<int:match_id>/close", methods=["POST"])
 @admin_required
+@idempotent
 def close_match(match_id):
     """Close a match (make it inactive)."""
     try:
         success, result = _post("/api/matches/close",
                                 {"match_id": str(match_id)})
         if success and result.get("status") == "success":
+            match_index.set_active(match_id, False)
+            publish(resource_key(MATCH, match_id))
+            _move_votes(archive_match, match_id)
             return jsonify({"status": "success", "message": "Матч закрито"})
         else:
             error_msg = result.get("message", "Unknown error")
@@ -38,6 +57,7 @@ def close_match(match_id):
 
 @bp.route("/api/admin/match/<int:match_id>/activate", methods=["POST"])
 @admin_required
+@idempotent
 def activate_match(match_id):
     """Activate a match."""
     try:
@@ -45,6 +65,9 @@ def activate_match(match_id):
         success, result = _post("/api/matches/set-active",
                                 {"match_id": str(match_id), "is_active": "1"})
         if success and result.get("status") == "success":
+            match_index.set_active(match_id, True)
+            publish(resource_key(MATCH, match_id))
+            _move_votes(restore_match, match_id)
             return jsonify({"status": "success", "message": "Матч активовано"})
         else:
             error_msg = result.get("message", "Unknown error")
@@ -57,12 +80,15 @@ def activate_match(match_id):
 
 @bp.route("/api/admin/match/<int:match_id>/delete", methods=["POST"])
 @admin_required
+@idempotent
 def delete_match(match_id):
     """Delete a match."""
     try:
         success, result = _post("/api/matches/delete",
                                 {"match_id": str(match_id)})
         if success and result.get("status") == "success":
+            match_index.remove(match_id)
+            publish(resource_key(MATCH, match_id), resource_key(VOTES, match_id))
             return jsonify({"status": "success", "message": "Матч видалено"})
         else:
             error_msg = result.get("message", "Unknown error")
@@ -75,6 +101,7 @@ def delete_match(match_id):
 
 @bp.route("/api/admin/match/<int:match_id>/update-stats", methods=["POST"])
 @admin_required
+@idempotent
 def update_match_stats(match_id):
     """Update match statistics."""
     try:
@@ -92,6 +119,7 @@ def update_match_stats(match_id):
         success, result = _post("/api/matches/update-stats", data)
 
         if success and result.get("status") == "success":
+            publish(resource_key(MATCH, match_id))
             return jsonify({"status": "success", "message": "Статистику оновлено"})
         else:
             error_msg = result.get("message", "Unknown error")
@@ -119,11 +147,122 @@ def get_all_matches():
         return jsonify({"matches": []}), 500
 
 
+@bp.route("/api/admin/backend/pool")
+@admin_required
+def backend_pool_stats():
+    """Get connection reuse counters of the shared backend session."""
+    return jsonify(get_pool_stats())
+
+
+@bp.route("/api/admin/backend/cache")
+@admin_required
+def backend_cache_stats():
+    """Get hit/miss/eviction counters of the backend response cache."""
+    return jsonify(get_cache_stats())
+
+
+@bp.route("/api/admin/backend/refresher")
+@admin_required
+def backend_refresher_stats():
+    """Get age of the data served for hot endpoints."""
+    return jsonify(get_refresher_stats())
+
+
+@bp.route("/api/admin/backend/breakers")
+@admin_required
+def backend_breakers():
+    """Get circuit breaker and bulkhead state per backend endpoint."""
+    return jsonify(get_breaker_stats())
+
+
+@bp.route("/api/admin/backend/breakers/reset", methods=["POST"])
+@admin_required
+def backend_breakers_reset():
+    """Close all circuit breakers."""
+    reset_breakers()
+    return jsonify({"status": "success", "breakers": get_breaker_stats()})
+
+
+@bp.route("/api/admin/backend/votes")
+@admin_required
+def backend_vote_batching():
+    """Get write-behind vote batching counters."""
+    return jsonify(get_batcher_stats())
+
+
+@bp.route("/api/admin/idempotency")
+@admin_required
+def idempotency_stats():
+    """Get replay counters of the Idempotency-Key store."""
+    return jsonify(get_idempotency_stats())
+
+
+@bp.route("/api/admin/votes/outbox")
+@admin_required
+def vote_outbox():
+    """Get depth of the vote outbox and the most recent rejected votes."""
+    db = get_db()
+    stats = outbox_stats(db)
+    stats["replayer"] = get_replayer_stats()
+    stats["recent_rejected"] = [dict(row) for row in db.execute(
+        """SELECT user_id, match_id, player_id, last_error, created_at FROM vote_outbox
+           WHERE status = 'rejected' ORDER BY id DESC LIMIT 20""").fetchall()]
+    return jsonify(stats)
+
+
+@bp.route("/api/admin/cache/sync")
+@admin_required
+def cache_sync():
+    """Get sync lag of the local backend copies and this process's sync counters."""
+    return jsonify({"tables": sync_lag(get_db()), "syncer": get_cache_sync_stats()})
+
+
+@bp.route("/api/admin/users/<int:user_id>/role", methods=["POST"])
+@admin_required
+@idempotent
+def set_user_role(user_id):
+    """Change a user's role (fan or admin)."""
+    role = (request.get_json() or {}).get("role")
+    if role not in ("fan", "admin"):
+        return jsonify({"status": "error", "message": "role має бути fan або admin"}), 400
+    if user_id == current_user()["id"] and role != "admin":
+        return jsonify({"status": "error", "message": "Не можна зняти роль адміністратора із себе"}), 400
+
+    db = get_db()
+    try:
+        cursor = db.execute("UPDATE users SET role = ? WHERE id = ?", (role, user_id))
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        from flask import current_app
+        current_app.logger.error(f"Error changing user role: {e}")
+        return jsonify({"status": "error", "message": str(e)}), 500
+    if cursor.rowcount == 0:
+        return jsonify({"status": "error", "message": "Користувача не знайдено"}), 404
+    invalidate_user(user_id)
+    return jsonify({"status": "success", "message": "Роль змінено", "role": role})
+
+
+@bp.route("/api/admin/users/cache")
+@admin_required
+def user_cache_stats():
+    """Get hit/miss/eviction counters of the logged-in user cache."""
+    return jsonify(get_user_cache_stats())
+
+
+@bp.route("/api/admin/users/passwords")
+@admin_required
+def password_hashing_stats():
+    """Get counters of the password hashing pool."""
+    return jsonify(get_password_stats())
+
+
 @bp.route("/admin")
 def admin_page():
     """Admin page - serve static HTML."""
     # Check if user is admin
-    if not session.get('user_id') or session.get('role') != 'admin':
+    user = current_user()
+    if not user or user["role"] != 'admin':
         return redirect(url_for('auth.login'))
 
     from flask import current_app, send_from_directory
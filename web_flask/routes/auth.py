@@ -1,10 +1,12 @@
 """Authentication routes - completely rewritten."""
 from flask import Blueprint, send_from_directory, request, redirect, session, jsonify
-from werkzeug.security import generate_password_hash, check_password_hash
 from urllib.parse import quote
 import os
 
+from utils.auth import current_user, invalidate_user, login_user, logout_user
 from utils.database import get_db
+from utils.decorators import login_required
+from utils.passwords import HashPoolBusy, hash_password, verify_password, needs_rehash
 
 bp = Blueprint('auth', __name__)
 
@@ -22,11 +24,16 @@ def register():
         if len(password) < 6:
             return redirect(f"/register?error={quote('Пароль має містити мінімум 6 символів')}")
 
+        try:
+            password_hash = hash_password(password)
+        except HashPoolBusy:
+            return redirect(f"/register?error={quote('Сервер перевантажений, спробуйте ще раз')}")
+
         db = get_db()
         try:
             db.execute(
                 "INSERT INTO users (username, password, role) VALUES (?, ?, 'fan')",
-                (username, generate_password_hash(password))
+                (username, password_hash)
             )
             db.commit()
             return redirect(f"/login?success={quote('Реєстрація успішна! Тепер ви можете увійти.')}")
@@ -51,25 +58,22 @@ def login():
 
         db = get_db()
         user = db.execute(
-            "SELECT id, username, password, role FROM users WHERE username = ?", (
+            "SELECT id, username, password, role, auth_version FROM users WHERE username = ?", (
                 username,)
         ).fetchone()
 
-        if user and check_password_hash(user["password"], password):
-            # COMPLETELY CLEAR SESSION FIRST
-            session.clear()
+        try:
+            valid = user is not None and verify_password(user["password"], password)
+        except HashPoolBusy:
+            return redirect(f"/login?error={quote('Сервер перевантажений, спробуйте ще раз')}")
 
-            # SET ALL SESSION DATA
-            session["user_id"] = user["id"]
-            session["username"] = user["username"]
-            session["role"] = user["role"]
-            session.permanent = True
-            session.modified = True
+        if valid:
+            _rehash_if_outdated(user, password)
+            login_user(user)
 
-            # Force session save
             from flask import current_app
             current_app.logger.info(
-                f"User {username} logged in, session user_id={session.get('user_id')}, role={session.get('role')}")
+                f"User {username} logged in, user_id={user['id']}, role={user['role']}")
 
             return redirect(f"/?success={quote(f'Вітаємо, {username}!')}")
         else:
@@ -80,58 +84,72 @@ def login():
     return send_from_directory(current_app.static_folder, 'login.html')
 
 
+def _rehash_if_outdated(user, password):
+    """Replace a hash made with old parameters now that the plain password is known."""
+    try:
+        if not needs_rehash(user["password"]):
+            return
+        db = get_db()
+        # Only if the password was not changed meanwhile; sessions stay valid (same auth_version)
+        db.execute("UPDATE users SET password = ? WHERE id = ? AND password = ?",
+                   (hash_password(password), user["id"], user["password"]))
+        db.commit()
+    except Exception as e:
+        from flask import current_app
+        current_app.logger.warning(f"Could not rehash password of user_id={user['id']}: {e}")
+
+
 @bp.route("/logout")
 def logout():
     """User logout."""
-    session.clear()
+    logout_user()
     return redirect(f"/?info={quote('Ви вийшли з системи')}")
 
 
 @bp.route("/api/user-info")
 def user_info():
-    """Get current user info - completely rewritten."""
-    # First check session
-    user_id = session.get("user_id")
-
-    if not user_id:
+    """Get current user info."""
+    user = current_user()
+    if not user:
         return jsonify({"logged_in": False})
-
-    # Try to get from session first (faster)
-    username = session.get("username")
-    role = session.get("role")
-
-    # If session has all data, return it
-    if username and role:
-        return jsonify({
-            "logged_in": True,
-            "username": username,
-            "role": role
-        })
-
-    # Otherwise, load from database
+    return jsonify({
+        "logged_in": True,
+        "username": user["username"],
+        "role": user["role"]
+    })
+
+
+@bp.route("/api/change-password", methods=["POST"])
+@login_required
+def change_password():
+    """Change own password; other sessions of the user are logged out."""
+    data = request.get_json() or {}
+    current_password = data.get("current_password", "")
+    new_password = data.get("new_password", "").strip()
+    if len(new_password) < 6:
+        return jsonify({"status": "error", "message": "Пароль має містити мінімум 6 символів"}), 400
+
+    user_id = current_user()["id"]
+    db = get_db()
     try:
-        db = get_db()
-        user = db.execute(
-            "SELECT id, username, role FROM users WHERE id = ?", (user_id,)
-        ).fetchone()
-
-        if user:
-            # Update session with missing data
-            if not username:
-                session["username"] = user["username"]
-            if not role:
-                session["role"] = user["role"]
-            session.modified = True
-
-            return jsonify({
-                "logged_in": True,
-                "username": user["username"],
-                "role": user["role"]
-            })
+        row = db.execute("SELECT password, auth_version FROM users WHERE id = ?", (user_id,)).fetchone()
+        if not row or not verify_password(row["password"], current_password):
+            return jsonify({"status": "error", "message": "Невірний поточний пароль"}), 403
+        db.execute(
+            "UPDATE users SET password = ?, auth_version = auth_version + 1 WHERE id = ?",
+            (hash_password(new_password), user_id)
+        )
+        db.commit()
+    except HashPoolBusy:
+        db.rollback()
+        return jsonify({"status": "error", "message": "Сервер перевантажений, спробуйте ще раз"}), 503
     except Exception as e:
+        db.rollback()
         from flask import current_app
-        current_app.logger.error(f"Error loading user info: {e}")
+        current_app.logger.error(f"Error changing password: {e}")
+        return jsonify({"status": "error", "message": str(e)}), 500
 
-    # If user not found, clear session
-    session.clear()
-    return jsonify({"logged_in": False})
+    invalidate_user(user_id)
+    # Keep this session logged in with the new version
+    session["auth_version"] = row["auth_version"] + 1
+    return jsonify({"status": "success", "message": "Пароль змінено"})
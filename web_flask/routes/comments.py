@@ -1,14 +1,21 @@
 """Comments routes for matches."""
 from flask import Blueprint, request, jsonify, session
 from utils.decorators import login_required
+from utils.idempotency import idempotent
 from utils.database import get_db
+from utils.pagination import next_page, page_args
 
 bp = Blueprint('comments', __name__)
 
 
 @bp.route("/api/matches/<int:match_id>/comments", methods=["GET"])
 def get_comments(match_id):
-    """Get comments for a match."""
+    """Get comments for a match, newest first (?limit=, ?cursor= from the previous page's next_cursor)."""
+    try:
+        limit, before = page_args(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
     db = get_db()
     try:
         comments = db.execute("""
@@ -21,9 +28,11 @@ def get_comments(match_id):
                 u.username
             FROM match_comments c
             LEFT JOIN users u ON c.user_id = u.id
-            WHERE c.match_id = ?
-            ORDER BY c.created_at DESC
-        """, (match_id,)).fetchall()
+            WHERE c.match_id = ? AND (c.created_at, c.id) < (?, ?)
+            ORDER BY c.created_at DESC, c.id DESC
+            LIMIT ?
+        """, (match_id, *before, limit + 1)).fetchall()
+        comments, next_cursor = next_page(comments, limit)
         
         comments_list = []
         for comment in comments:
@@ -36,7 +45,7 @@ def get_comments(match_id):
                 "is_own": comment["user_id"] == session.get("user_id")
             })
         
-        return jsonify({"comments": comments_list})
+        return jsonify({"comments": comments_list, "next_cursor": next_cursor})
     except Exception as e:
         from flask import current_app
         current_app.logger.error(f"Error getting comments: {e}")
@@ -45,6 +54,7 @@ def get_comments(match_id):
 
 @bp.route("/api/matches/<int:match_id>/comments", methods=["POST"])
 @login_required
+@idempotent
 def add_comment(match_id):
     """Add a comment to a match."""
     user_id = session.get("user_id")
@@ -75,6 +85,7 @@ def add_comment(match_id):
 
 @bp.route("/api/comments/<int:comment_id>", methods=["DELETE"])
 @login_required
+@idempotent
 def delete_comment(comment_id):
     """Delete a comment (only own comments)."""
     user_id = session.get("user_id")
@@ -3,8 +3,12 @@ from flask import Blueprint, send_from_directory, request, jsonify, session
 import os
 import sqlite3
 from utils.decorators import login_required
+from utils.idempotency import idempotent
 from utils.database import get_db
-from utils.api_client import _post
+from utils.vote_batcher import submit_vote
+from utils.vote_outbox import enqueue, vote_key
+from utils.cache_sync import request_sync
+from utils.invalidation import VOTES, MATCH, resource_key, parse_key, publish, subscribe
 
 bp = Blueprint('matches', __name__)
 
@@ -18,6 +22,7 @@ def matches():
 
 @bp.route("/api/vote", methods=["POST"])
 @login_required
+@idempotent
 def vote():
     """Vote for a player - requires authentication. Syncs to both Flask DB and C++ backend."""
     user_id = session.get("user_id")
@@ -52,25 +57,16 @@ def vote():
         # Continue if check fails
 
     # Check if match is active before allowing vote
-    from utils.api_client import _get
+    from utils.match_index import match_index
     try:
-        matches_data = _get("/api/match-stats")
-        if matches_data and "matches" in matches_data:
-            # Find the specific match
-            current_match = None
-            for match in matches_data["matches"]:
-                if match.get("match_id") == int(match_id):
-                    current_match = match
-                    break
-
-            if current_match:
-                if not current_match.get("is_active", True):
-                    return jsonify({
-                        "status": "error",
-                        "message": "Цей матч закрито, голосування недоступне"
-                    }), 403
-            else:
-                return jsonify({"status": "error", "message": "Матч не знайдено"}), 404
+        current_match = match_index.get(int(match_id))
+        if current_match is None:
+            return jsonify({"status": "error", "message": "Матч не знайдено"}), 404
+        if not current_match.is_active:
+            return jsonify({
+                "status": "error",
+                "message": "Цей матч закрито, голосування недоступне"
+            }), 403
     except Exception as e:
         from flask import current_app
         current_app.logger.warning(f"Could not check match status: {e}")
@@ -78,14 +74,15 @@ def vote():
 
     # 1. First, send vote to C++ backend (main source of truth)
     try:
-        success, vote_response = _post(
-            "/vote", {"match_id": match_id, "player_id": player_id})
+        success, vote_response = submit_vote(
+            match_id, player_id, vote_key(user_id, match_id))
 
         from flask import current_app
         current_app.logger.info(
             f"C++ response: success={success}, vote_response={vote_response}")
 
         if success and vote_response.get("status") == "success":
+            publish(resource_key(VOTES, match_id))
             # Vote accepted by C++ backend, now save to Flask DB for tracking
             db = get_db()
             try:
@@ -116,6 +113,9 @@ def vote():
                     f"Vote sent to backend but local save failed: {e}")
 
             return jsonify({"status": "success", "message": "Голос зараховано"})
+        elif vote_response and vote_response.get("unavailable"):
+            # Backend did not answer: accept now, the outbox replays it later
+            return _accept_for_replay(user_id, match_id, player_id)
         else:
             # C++ backend rejected the vote
             error_msg = vote_response.get(
@@ -125,37 +125,40 @@ def vote():
     except Exception as e:
         from flask import current_app
         current_app.logger.error(f"Error sending vote to backend: {e}")
-
-        # Fallback: save locally only if backend is unavailable
-        db = get_db()
-        try:
-            db.execute(
-                "INSERT INTO user_votes (user_id, match_id, player_id) VALUES (?, ?, ?)",
-                (user_id, match_id, player_id)
-            )
-            db.commit()
-            return jsonify({
-                "status": "success",
-                "message": "Голос збережено локально (backend недоступний)"
-            })
-        except sqlite3.IntegrityError:
-            db.rollback()
-            return jsonify({
-                "status": "error",
-                "message": "Ви вже проголосували за цього гравця"
-            }), 400
-        except Exception as e2:
-            from flask import current_app
-            current_app.logger.error(f"Error saving vote locally: {e2}")
-            return jsonify({
-                "status": "error",
-                "message": "Помилка збереження голосу"
-            }), 500
-            # This is not ideal, but we'll continue
+        return _accept_for_replay(user_id, match_id, player_id)
 
     return jsonify({"status": "success", "message": "Голос зараховано"})
 
 
+def _accept_for_replay(user_id, match_id, player_id):
+    """Save a vote locally and queue it in the outbox while the backend is unavailable."""
+    db = get_db()
+    try:
+        db.execute(
+            "INSERT INTO user_votes (user_id, match_id, player_id) VALUES (?, ?, ?)",
+            (user_id, match_id, player_id)
+        )
+        enqueue(db, user_id, match_id, player_id)
+        db.commit()
+        return jsonify({
+            "status": "success",
+            "message": "Голос збережено локально (backend недоступний)"
+        })
+    except sqlite3.IntegrityError:
+        db.rollback()
+        return jsonify({
+            "status": "error",
+            "message": "Ви вже проголосували за цього гравця"
+        }), 400
+    except Exception as e2:
+        from flask import current_app
+        current_app.logger.error(f"Error saving vote locally: {e2}")
+        return jsonify({
+            "status": "error",
+            "message": "Помилка збереження голосу"
+        }), 500
+
+
 @bp.route("/api/vote-status/<int:match_id>")
 def vote_status(match_id):
     """Check if current user has voted for any player in this match."""
@@ -165,10 +168,12 @@ def vote_status(match_id):
 
     db = get_db()
     try:
-        # Get all votes by this user for this match
+        # Get all votes by this user for this match (archived once the match is closed)
         votes = db.execute(
-            "SELECT player_id FROM user_votes WHERE user_id = ? AND match_id = ?",
-            (user_id, match_id)
+            """SELECT player_id FROM user_votes WHERE user_id = ? AND match_id = ?
+               UNION ALL
+               SELECT player_id FROM user_votes_archive WHERE user_id = ? AND match_id = ?""",
+            (user_id, match_id, user_id, match_id)
         ).fetchall()
 
         if votes:
@@ -197,8 +202,9 @@ def user_player_votes():
     try:
         # Get all players this user has voted for (unique by player_id)
         votes = db.execute(
-            "SELECT DISTINCT player_id FROM user_votes WHERE user_id = ?",
-            (user_id,)
+            """SELECT player_id FROM user_votes WHERE user_id = ?
+               UNION SELECT player_id FROM user_votes_archive WHERE user_id = ?""",
+            (user_id, user_id)
         ).fetchall()
 
         player_ids = [v["player_id"] for v in votes]
@@ -214,19 +220,11 @@ def match_votes(match_id):
     """Get vote counts for all players in a match (from Flask DB, not C++ API)."""
     db = get_db()
     try:
-        # Get vote counts for each player in this match from Flask DB
-        votes = db.execute(
-            """
-            SELECT player_id, COUNT(*) as votes
-            FROM user_votes
-            WHERE match_id = ?
-            GROUP BY player_id
-            """,
-            (match_id,)
-        ).fetchall()
-
-        votes_list = [{"player_id": v["player_id"],
-                       "votes": v["votes"]} for v in votes]
+        # Materialized per-player counts (kept in step with user_votes by triggers)
+        rows = db.execute(
+            "SELECT player_id, votes FROM match_vote_tallies WHERE match_id = ? ORDER BY player_id",
+            (match_id,)).fetchall()
+        votes_list = [{"player_id": row[0], "votes": row[1]} for row in rows]
         return jsonify({"match_id": match_id, "votes": votes_list})
     except Exception as e:
         from flask import current_app
@@ -234,9 +232,16 @@ def match_votes(match_id):
         return jsonify({"match_id": match_id, "votes": []}), 500
 
 
+@subscribe
+def _refresh_local_copies(keys: frozenset) -> None:
+    """Ask the background sync to refresh cached_players/cached_matches after writes."""
+    if {parse_key(key)[0] for key in keys} & {VOTES, MATCH}:
+        request_sync()
+
+
 @bp.route("/api/players-info")
 def players_info():
-    """Get all players from Flask cache (or C++ API if cache empty)."""
+    """Get all players from Flask cache (kept fresh by the background sync)."""
     db = get_db()
     try:
         # Try to get from cache first
@@ -245,25 +250,12 @@ def players_info():
             players = [dict(p) for p in cached]
             return jsonify({"players": players})
 
-        # If cache empty, fetch from C++ API and cache
-        import requests
-        from utils.api_client import API_BASE_URL
+        # Not synced yet: pass the backend's data through (the sync fills the cache)
+        from utils.api_client import _request
 
-        resp = requests.get(f"{API_BASE_URL}/players", timeout=3)
+        resp = _request("GET", "/players")
         if resp.status_code == 200:
-            players_data = resp.json().get("players", [])
-
-            # Cache players
-            for p in players_data:
-                db.execute(
-                    """INSERT OR REPLACE INTO cached_players (id, name, position, team_id, votes)
-                       VALUES (?, ?, ?, ?, ?)""",
-                    (p.get("id"), p.get("name"), p.get("position"),
-                     p.get("team_id"), p.get("votes", 0))
-                )
-            db.commit()
-
-            return jsonify({"players": players_data})
+            return jsonify({"players": resp.json().get("players", [])})
     except Exception as e:
         from flask import current_app
         current_app.logger.debug(f"Error getting players info: {e}")
@@ -273,7 +265,7 @@ def players_info():
 
 @bp.route("/api/matches-info")
 def matches_info():
-    """Get all matches from Flask cache (or C++ API if cache empty)."""
+    """Get all matches from Flask cache (kept fresh by the background sync)."""
     db = get_db()
     try:
         # Try to get from cache first
@@ -282,25 +274,12 @@ def matches_info():
             matches = [dict(m) for m in cached]
             return jsonify({"matches": matches})
 
-        # If cache empty, fetch from C++ API and cache
-        import requests
-        from utils.api_client import API_BASE_URL
+        # Not synced yet: pass the backend's data through (the sync fills the cache)
+        from utils.api_client import _request
 
-        resp = requests.get(f"{API_BASE_URL}/matches-page", timeout=3)
+        resp = _request("GET", "/matches-page")
         if resp.status_code == 200:
-            matches_data = resp.json().get("matches", [])
-
-            # Cache matches
-            for m in matches_data:
-                db.execute(
-                    """INSERT OR REPLACE INTO cached_matches (id, team1, team2, date, is_active)
-                       VALUES (?, ?, ?, ?, ?)""",
-                    (m.get("id"), m.get("team1"), m.get("team2"),
-                     m.get("date"), m.get("isActive", 1))
-                )
-            db.commit()
-
-            return jsonify({"matches": matches_data})
+            return jsonify({"matches": resp.json().get("matches", [])})
     except Exception as e:
         from flask import current_app
         current_app.logger.debug(f"Error getting matches info: {e}")
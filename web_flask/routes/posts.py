@@ -2,7 +2,9 @@
 from flask import Blueprint, send_from_directory, request, jsonify, session
 import os
 from utils.decorators import login_required, admin_required
+from utils.idempotency import idempotent
 from utils.database import get_db
+from utils.pagination import next_page, page_args
 
 bp = Blueprint('posts', __name__)
 
@@ -16,7 +18,12 @@ def posts():
 
 @bp.route("/api/posts", methods=["GET"])
 def get_posts():
-    """Get all posts."""
+    """Get posts, newest first (?limit=, ?cursor= from the previous page's next_cursor)."""
+    try:
+        limit, before = page_args(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
     db = get_db()
     try:
         posts = db.execute("""
@@ -29,8 +36,11 @@ def get_posts():
                 u.username
             FROM posts p
             LEFT JOIN users u ON p.user_id = u.id
-            ORDER BY p.created_at DESC
-        """).fetchall()
+            WHERE (p.created_at, p.id) < (?, ?)
+            ORDER BY p.created_at DESC, p.id DESC
+            LIMIT ?
+        """, (*before, limit + 1)).fetchall()
+        posts, next_cursor = next_page(posts, limit)
 
         posts_list = []
         for post in posts:
@@ -44,7 +54,7 @@ def get_posts():
                 "is_own": post["user_id"] == session.get("user_id")
             })
 
-        return jsonify({"posts": posts_list})
+        return jsonify({"posts": posts_list, "next_cursor": next_cursor})
     except Exception as e:
         from flask import current_app
         current_app.logger.error(f"Error getting posts: {e}")
@@ -53,6 +63,7 @@ def get_posts():
 
 @bp.route("/api/posts", methods=["POST"])
 @admin_required
+@idempotent
 def create_post():
     """Create a new post (admin only)."""
     user_id = session.get("user_id")
@@ -88,33 +99,16 @@ def create_post():
 
 @bp.route("/api/posts/<int:post_id>", methods=["DELETE"])
 @admin_required
+@idempotent
 def delete_post(post_id):
     """Delete a post (admin only)."""
-    user_id = session.get("user_id")
-    if not user_id:
-        return jsonify({"error": "Not authenticated"}), 401
-
     db = get_db()
     try:
-        # Check if post exists
-        post = db.execute(
-            "SELECT user_id FROM posts WHERE id = ?", (post_id,)
-        ).fetchone()
-
-        if not post:
-            return jsonify({"error": "Post not found"}), 404
-
-        # Only allow deleting own posts or if admin
-        if post["user_id"] != user_id:
-            # Check if user is admin
-            user = db.execute(
-                "SELECT role FROM users WHERE id = ?", (user_id,)
-            ).fetchone()
-            if not user or user["role"] != "admin":
-                return jsonify({"error": "You can only delete your own posts"}), 403
-
-        db.execute("DELETE FROM posts WHERE id = ?", (post_id,))
+        # admin_required already checked the role (from the user cache)
+        cursor = db.execute("DELETE FROM posts WHERE id = ?", (post_id,))
         db.commit()
+        if cursor.rowcount == 0:
+            return jsonify({"error": "Post not found"}), 404
 
         return jsonify({"status": "success", "message": "Post deleted"})
     except Exception as e:
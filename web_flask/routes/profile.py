@@ -1,10 +1,9 @@
 """Profile routes."""
-from flask import Blueprint, send_from_directory, request, jsonify, session, g
+from flask import Blueprint, send_from_directory, request, jsonify, session, g, current_app
 import os
-import requests
 from utils.decorators import login_required
 from utils.database import get_db
-from utils.api_client import API_BASE_URL
+from utils.pagination import next_page, page_args
 
 bp = Blueprint('profile', __name__)
 
@@ -20,7 +19,7 @@ def profile():
 @bp.route("/api/profile/votes")
 @login_required
 def get_user_votes():
-    """Get user's voting history."""
+    """Get user's voting history, newest first (?limit=, ?cursor= from the previous page's next_cursor)."""
     # Allow an optional debug user_id via query param for diagnostics
     user_id = session.get("user_id") or request.args.get("user_id")
     if isinstance(user_id, str) and user_id.isdigit():
@@ -29,19 +28,26 @@ def get_user_votes():
     if not user_id:
         return jsonify({"error": "Not authenticated"}), 401
 
+    try:
+        limit, before = page_args(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
     db = get_db()
     try:
-        # Get all votes by user from Flask DB
+        # One page of the user's votes from Flask DB (open and archived matches, merged in order)
         votes = db.execute("""
-            SELECT 
-                id,
-                match_id,
-                player_id,
-                created_at
+            SELECT id, match_id, player_id, created_at
             FROM user_votes
-            WHERE user_id = ?
-            ORDER BY created_at DESC
-        """, (user_id,)).fetchall()
+            WHERE user_id = ? AND (created_at, id) < (?, ?)
+            UNION ALL
+            SELECT id, match_id, player_id, created_at
+            FROM user_votes_archive
+            WHERE user_id = ? AND (created_at, id) < (?, ?)
+            ORDER BY created_at DESC, id DESC
+            LIMIT ?
+        """, (user_id, *before, user_id, *before, limit + 1)).fetchall()
+        votes, next_cursor = next_page(votes, limit)
 
         # Fetch matches and players from Flask DB (fast, local - not from C++ API)
         matches_map = {}
@@ -61,41 +67,22 @@ def get_user_votes():
                 players_map[p["id"]] = {
                     "name": p["name"], "position": p["position"]}
 
-            # If cache empty, fetch from C++ API and populate cache
+            # Not synced yet: fetch from C++ API (both endpoints concurrently); the sync fills the cache
             if not matches_map or not players_map:
-                import requests
-                from utils.api_client import API_BASE_URL
+                from utils.api_client import _get_many
 
                 try:
-                    resp = requests.get(
-                        f"{API_BASE_URL}/matches-page", timeout=2)
-                    if resp.status_code == 200:
-                        matches_data = resp.json().get("matches", [])
-                        for m in matches_data:
-                            mid = m.get("id")
-                            matches_map[mid] = {"team1": m.get("team1"), "team2": m.get(
-                                "team2"), "date": m.get("date", "")}
-                            # Cache it
-                            db.execute(
-                                "INSERT OR REPLACE INTO cached_matches (id, team1, team2, date) VALUES (?, ?, ?, ?)",
-                                (mid, m.get("team1"), m.get(
-                                    "team2"), m.get("date", ""))
-                            )
-
-                    resp = requests.get(f"{API_BASE_URL}/players", timeout=2)
-                    if resp.status_code == 200:
-                        players_data = resp.json().get("players", [])
-                        for p in players_data:
-                            pid = p.get("id")
-                            players_map[pid] = {"name": p.get(
-                                "name"), "position": p.get("position")}
-                            # Cache it
-                            db.execute(
-                                "INSERT OR REPLACE INTO cached_players (id, name, position, team_id) VALUES (?, ?, ?, ?)",
-                                (pid, p.get("name"), p.get(
-                                    "position"), p.get("team_id", 0))
-                            )
-                    db.commit()
+                    results, errors = _get_many({
+                        "matches": ("/matches-page", {"matches": []}),
+                        "players": ("/players", {"players": []}),
+                    })
+                    for m in results["matches"].get("matches", []):
+                        matches_map[m.get("id")] = {"team1": m.get("team1"), "team2": m.get(
+                            "team2"), "date": m.get("date", "")}
+
+                    for p in results["players"].get("players", []):
+                        players_map[p.get("id")] = {"name": p.get(
+                            "name"), "position": p.get("position")}
                 except Exception as api_err:
                     current_app.logger.debug(
                         f"Could not fetch from C++ API: {api_err}")
@@ -136,7 +123,7 @@ def get_user_votes():
             })
         # If debug flag provided, include some diagnostics
         debug_mode = request.args.get("debug") == "1"
-        result = {"votes": votes_list}
+        result = {"votes": votes_list, "next_cursor": next_cursor}
         if debug_mode:
             result["debug"] = {
                 "user_id": user_id,
@@ -0,0 +1,39 @@
+"""Search routes."""
+from flask import Blueprint, request, jsonify
+from utils.database import get_db
+from utils.pagination import limit_arg
+from utils.search import KINDS, search as search_text
+
+bp = Blueprint('search', __name__)
+
+
+@bp.route("/api/search")
+def search():
+    """Search posts and match comments (?q=, ?type=posts|comments, ?limit=, ?offset=)."""
+    q = request.args.get("q", "").strip()
+    if not q:
+        return jsonify({"error": "Query (q) is required"}), 400
+    kind = request.args.get("type")
+    if kind and kind not in KINDS:
+        return jsonify({"error": f"type must be one of: {', '.join(KINDS)}"}), 400
+    offset = request.args.get("offset", "0")
+    try:
+        limit = limit_arg(request.args)
+        if not offset.isdigit():
+            raise ValueError("offset must be a non-negative integer")
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    offset = int(offset)
+
+    db = get_db()
+    try:
+        results, has_more = search_text(db, q, (kind,) if kind else KINDS, limit, offset)
+        return jsonify({
+            "query": q,
+            "results": results,
+            "next_offset": offset + limit if has_more else None,
+        })
+    except Exception as e:
+        from flask import current_app
+        current_app.logger.error(f"Error searching: {e}")
+        return jsonify({"error": str(e)}), 500
@@ -1,7 +1,7 @@
 """Stats routes."""
 from flask import Blueprint, send_from_directory, jsonify
 import os
-from utils.api_client import _get
+from utils.api_client import _get_many
 
 bp = Blueprint('stats', __name__)
 
@@ -17,14 +17,18 @@ def stats():
 def stats_page():
     """Get statistics for stats page from C++ backend API."""
     try:
-        # Get data from C++ backend
-        stats_data = _get("/api/stats")
+        # Get stats, players and match stats from C++ backend concurrently
+        results, errors = _get_many({
+            "stats": ("/api/stats", {}),
+            "players": ("/api/players", {}),
+            "matches": ("/api/match-stats", {}),
+        })
+        stats_data = results["stats"]
 
         if not stats_data:
             return jsonify({"error": "Failed to fetch stats from backend"}), 500
 
-        # Get players data
-        players_data = _get("/api/players")
+        players_data = results["players"]
         if not players_data:
             players_list = []
         else:
@@ -33,8 +37,8 @@ def stats_page():
             players_list = sorted(players, key=lambda p: p.get(
                 "votes", 0), reverse=True)[:20]
 
-        # Get matches data with full statistics
-        matches_data = _get("/api/match-stats")
+        # Matches data with full statistics
+        matches_data = results["matches"]
         matches_list = matches_data.get("matches", []) if matches_data else []
 
         return jsonify({
@@ -926,22 +926,32 @@ document.querySelector('.modal-close')?.addEventListener('click', () => {
     document.getElementById('playerModal').style.display = 'none';
 });
 
-// Load comments for match
-async function loadComments(matchId) {
+// Cursor of the next comments page (null when everything is shown)
+let commentsCursor = null;
+
+// Load comments for match (the next page when a cursor is given)
+async function loadComments(matchId, cursor = null) {
     if (!matchId) return;
 
     try {
-        const response = await fetch(`/api/matches/${matchId}/comments`);
+        const query = cursor ? `?cursor=${encodeURIComponent(cursor)}` : '';
+        const response = await fetch(`/api/matches/${matchId}/comments${query}`);
         const data = await response.json();
         const comments = data.comments || [];
         const commentsDiv = document.getElementById('comments-container');
 
         if (!commentsDiv) return;
 
-        if (comments.length === 0) {
+        commentsCursor = data.next_cursor || null;
+        const moreButton = document.getElementById('comments-more');
+        if (moreButton) {
+            moreButton.style.display = commentsCursor ? '' : 'none';
+        }
+
+        if (comments.length === 0 && !cursor) {
             commentsDiv.innerHTML = '<p class="muted">Коментарів ще немає. Будьте першим!</p>';
         } else {
-            commentsDiv.innerHTML = comments.map(comment => `
+            const html = comments.map(comment => `
                 <div style="padding: 1rem; margin-bottom: 1rem; background: #f9fafb; border-radius: 8px; border-left: 3px solid #3b82f6;">
                     <div style="display: flex; justify-content: space-between; align-items: start; margin-bottom: 0.5rem;">
                         <div>
@@ -957,6 +967,11 @@ async function loadComments(matchId) {
                     <p style="margin: 0; white-space: pre-wrap;">${comment.comment_text}</p>
                 </div>
             `).join('');
+            if (cursor) {
+                commentsDiv.insertAdjacentHTML('beforeend', html);
+            } else {
+                commentsDiv.innerHTML = html;
+            }
         }
 
         // Show/hide comment form based on login status
@@ -0,0 +1,34 @@
+"""Shared fixtures for tests that need the migrated Flask database."""
+import os
+import tempfile
+import unittest
+
+from flask import Flask, g
+
+from utils.database import connect
+from utils.migrations import migrate
+
+
+class DatabaseTestCase(unittest.TestCase):
+    """Test case with a migrated database in a temporary directory (``self.conn``).
+
+    Subclasses call ``super().setUp()`` before seeding their data, and
+    ``make_app`` to serve blueprints from that database.
+    """
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.conn = connect(os.path.join(self.tmp.name, "database.sqlite"))
+        self.addCleanup(self.conn.close)
+        migrate(self.conn)
+
+    def make_app(self, *blueprints) -> Flask:
+        """Create an app with the blueprints whose requests use ``self.conn``; sets ``self.client``."""
+        app = Flask(__name__)
+        app.secret_key = "test"
+        for blueprint in blueprints:
+            app.register_blueprint(blueprint)
+        app.before_request(lambda: setattr(g, "db", self.conn))
+        self.client = app.test_client()
+        return app
@@ -0,0 +1,304 @@
+"""Unit tests for the backend API client."""
+import tempfile
+import threading
+import time
+import unittest
+import sys
+import os
+from unittest import mock
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(
+    os.path.join(os.path.dirname(__file__), '..')))
+
+from utils import http_pool
+from utils import api_client
+from utils.api_client import _normalize_endpoint
+from utils.cache import TTLCache, Versioned
+from utils.refresher import BackgroundRefresher
+from utils.shared_cache import SharedCache
+
+
+class TestHttpPool(unittest.TestCase):
+    """Test shared backend session."""
+
+    def test_session_is_shared(self):
+        """Test the same session is returned on every call."""
+        self.assertIs(http_pool.get_session(), http_pool.get_session())
+
+    def test_timeout_longest_prefix(self):
+        """Test per-endpoint timeouts use the longest matching prefix."""
+        self.assertEqual(http_pool.timeout_for("/votes/12", 9.0),
+                         http_pool.API_ENDPOINT_TIMEOUTS["/votes/"])
+        self.assertEqual(http_pool.timeout_for("/unknown", 9.0), 9.0)
+
+    def test_pool_stats_keys(self):
+        """Test connection reuse counters are reported."""
+        stats = http_pool.get_pool_stats()
+        for key in ("requests", "new_connections", "reused_connections", "reuse_ratio"):
+            self.assertIn(key, stats)
+
+    def test_normalize_endpoint(self):
+        """Test /api prefix is stripped from endpoints."""
+        self.assertEqual(_normalize_endpoint("/api/stats"), "/stats")
+        self.assertEqual(_normalize_endpoint("players"), "/players")
+
+
+class TestTTLCache(unittest.TestCase):
+    """Test bounded LRU/TTL cache."""
+
+    def test_lru_eviction(self):
+        """Test least recently used entry is evicted when full."""
+        cache = TTLCache(max_entries=2, default_ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        self.assertEqual(cache.get("a"), (True, 1))
+        self.assertEqual(cache.get("b"), (False, None))
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_ttl_policy(self):
+        """Test per-prefix TTL policies and expiry."""
+        cache = TTLCache(max_entries=10, default_ttl=60,
+                         ttl_policies={"/votes/": 0.05})
+        self.assertEqual(cache.ttl_for("/teams"), 60)
+        cache.set("/votes/1", {"votes": []})
+        time.sleep(0.1)
+        self.assertFalse(cache.get("/votes/1")[0])
+
+    def test_concurrent_misses_coalesced(self):
+        """Test concurrent misses for one key run the loader once."""
+        cache = TTLCache(max_entries=10, default_ttl=60)
+        calls = []
+        start = threading.Barrier(50)
+
+        def loader():
+            calls.append(1)
+            time.sleep(0.1)
+            return {"matches": []}
+
+        def worker(results):
+            start.wait()
+            results.append(cache.get_or_load("/match-stats", loader))
+
+        results = []
+        threads = [threading.Thread(target=worker, args=(results,))
+                   for _ in range(50)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len(results), 50)
+
+    def test_versioned_loader_result(self):
+        """Test a Versioned loader result stores its version with the value."""
+        cache = TTLCache(max_entries=10, default_ttl=60)
+        value = cache.get_or_load("/players", lambda: Versioned({"players": []}, '"1-7"'))
+        self.assertEqual(value, {"players": []})
+        self.assertEqual(cache.peek_version("/players"), (True, '"1-7"', {"players": []}))
+
+    def test_invalidate_during_load(self):
+        """Test data read before an invalidation is not cached by the load in flight."""
+        cache = TTLCache(max_entries=10, default_ttl=60)
+        reading, written = threading.Event(), threading.Event()
+
+        def slow_loader():
+            reading.set()
+            written.wait(5)
+            return "pre-write"
+
+        result = []
+        loader = threading.Thread(target=lambda: result.append(cache.get_or_load("/stats", slow_loader)))
+        loader.start()
+        reading.wait(5)
+        cache.invalidate("/stats")  # the write lands while the loader is reading
+        self.assertEqual(cache.get_or_load("/stats", lambda: "post-write"), "post-write")
+        written.set()
+        loader.join()
+        self.assertEqual(result, ["pre-write"])
+        self.assertEqual(cache.peek("/stats")[2], "post-write")
+
+        cache.invalidate("/stats")
+        reading.clear()
+        written.clear()
+        loader = threading.Thread(target=lambda: cache.get_or_load("/stats", slow_loader))
+        loader.start()
+        reading.wait(5)
+        cache.clear()
+        written.set()
+        loader.join()
+        self.assertEqual(cache.peek("/stats"), (False, 0.0, None))
+
+    def test_loader_error_not_cached(self):
+        """Test a failed load is not cached."""
+        cache = TTLCache(max_entries=10, default_ttl=60)
+
+        def failing():
+            raise ValueError("backend down")
+
+        with self.assertRaises(ValueError):
+            cache.get_or_load("/stats", failing)
+        self.assertEqual(cache.get_or_load("/stats", lambda: 1), 1)
+
+
+class TestBackgroundRefresher(unittest.TestCase):
+    """Test stale-while-revalidate refresher."""
+
+    def test_serves_stale_and_revalidates(self):
+        """Test an expired hot entry is served and refreshed in background."""
+        cache = TTLCache(max_entries=10, default_ttl=0.05)
+        loads = []
+
+        def loader(key):
+            loads.append(key)
+            return {"total_votes": len(loads)}
+
+        refresher = BackgroundRefresher(cache, loader, interval=0.05, max_staleness=5)
+        refresher.register(["/stats"])
+        cache.set("/stats", {"total_votes": 0})
+        time.sleep(0.1)
+
+        served, value = refresher.serve("/stats")
+        self.assertTrue(served)
+        self.assertEqual(value, {"total_votes": 0})
+
+        refresher.start()
+        time.sleep(0.3)
+        self.assertTrue(loads)
+        self.assertGreater(cache.peek("/stats")[2]["total_votes"], 0)
+        self.assertEqual(refresher.stats()["endpoints"]["/stats"]["stale_served"], 1)
+
+    def test_too_stale_not_served(self):
+        """Test entries older than max staleness are not served."""
+        cache = TTLCache(max_entries=10, default_ttl=0.01)
+        refresher = BackgroundRefresher(cache, lambda key: None, interval=1, max_staleness=0.02)
+        cache.set("/players", {"players": []})
+        time.sleep(0.05)
+        self.assertEqual(refresher.serve("/players"), (False, None))
+
+
+class TestSharedCache(unittest.TestCase):
+    """Test node-wide SQLite cache tier."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "api_cache.sqlite")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_entries_survive_restart(self):
+        """Test a new instance (fresh worker) sees stored versioned entries."""
+        SharedCache(self.path, max_entries=10).set("/players", {"players": [1]}, '"1-3"')
+        found, age, value, version = SharedCache(self.path, max_entries=10).get("/players")
+        self.assertTrue(found)
+        self.assertLess(age, 1.0)
+        self.assertEqual(value, {"players": [1]})
+        self.assertEqual(version, '"1-3"')
+
+    def test_older_entry_does_not_overwrite(self):
+        """Test a slower worker cannot replace a newer entry with older data."""
+        cache = SharedCache(self.path, max_entries=10)
+        cache.set("/stats", {"total_votes": 2}, '"1-2"')
+        cache.set("/stats", {"total_votes": 1}, '"1-1"', age=5.0)
+        self.assertEqual(cache.get("/stats")[2], {"total_votes": 2})
+
+    def test_invalidated_during_load_not_stored(self):
+        """Test an entry loaded before another worker's invalidation is not stored."""
+        cache = SharedCache(self.path, max_entries=10)
+        started = time.time()
+        SharedCache(self.path, max_entries=10).invalidate("/stats")
+        cache.set("/stats", {"total_votes": 1}, '"1-1"', loaded_since=started)
+        self.assertFalse(cache.get("/stats")[0])
+        cache.set("/stats", {"total_votes": 2}, '"1-2"', loaded_since=time.time() + 1)
+        self.assertEqual(cache.get("/stats")[2], {"total_votes": 2})
+
+    def test_load_prefers_fresh_shared_entry(self):
+        """Test a fresh shared entry is used instead of calling the backend."""
+        cache = SharedCache(self.path, max_entries=10)
+        cache.set("/shared-hit", {"from": "shared"}, '"1-1"')
+        with mock.patch.object(api_client, "_shared_cache", cache), \
+                mock.patch.object(api_client, "_fetch") as fetch:
+            loaded = api_client._load("/shared-hit")
+        fetch.assert_not_called()
+        self.assertEqual(loaded.value, {"from": "shared"})
+
+
+class TestFetch(unittest.TestCase):
+    """Test conditional GETs against the backend."""
+
+    def setUp(self):
+        api_client._api_cache.clear()
+        self.addCleanup(api_client._api_cache.clear)
+
+    @staticmethod
+    def response(status, body=None, etag=None):
+        response = mock.Mock(status_code=status, headers={"ETag": etag} if etag else {})
+        response.json.return_value = body
+        response.raise_for_status.return_value = None
+        return response
+
+    def counters(self):
+        return dict(api_client._revalidation_stats)
+
+    def test_revalidated_with_etag(self):
+        """Test a cached ETag is sent as If-None-Match and a 304 reuses the cached body."""
+        before = self.counters()
+        with mock.patch.object(api_client, "_send", side_effect=[
+                self.response(200, {"teams": [1]}, '"v1"'), self.response(304)]) as send:
+            first = api_client._fetch("/fetch-teams")
+            api_client._api_cache.set("/fetch-teams", first.value, version=first.version)
+            second = api_client._fetch("/fetch-teams")
+
+        self.assertEqual(send.call_args_list[0].kwargs["headers"], {})
+        self.assertEqual(send.call_args_list[1].kwargs["headers"], {"If-None-Match": '"v1"'})
+        self.assertEqual((first.value, first.version), ({"teams": [1]}, '"v1"'))
+        self.assertEqual((second.value, second.version), ({"teams": [1]}, '"v1"'))
+        after = self.counters()
+        self.assertEqual(after["downloaded"] - before["downloaded"], 1)
+        self.assertEqual(after["not_modified"] - before["not_modified"], 1)
+
+    def test_unexpected_not_modified(self):
+        """Test a 304 to a request without If-None-Match is an error, not a parsed body."""
+        response = self.response(304)
+        with mock.patch.object(api_client, "_send", return_value=response):
+            with self.assertRaises(api_client._FetchError):
+                api_client._fetch("/fetch-teams")
+        response.json.assert_not_called()
+
+
+class TestFanOut(unittest.TestCase):
+    """Test concurrent multi-endpoint GETs."""
+
+    def setUp(self):
+        api_client._api_cache.clear()
+
+    def test_partial_failure_and_deadline(self):
+        """Test slow and failing endpoints get defaults without affecting others."""
+        def fake_fetch(endpoint):
+            if endpoint == "/fanout-slow":
+                time.sleep(0.5)
+            if endpoint == "/fanout-broken":
+                raise api_client._FetchError("HTTP 500")
+            return {"endpoint": endpoint}
+
+        with mock.patch.object(api_client, "_fetch", side_effect=fake_fetch):
+            started = time.time()
+            results, errors = api_client._get_many({
+                "ok": ("/api/fanout-ok", {}),
+                "slow": ("/fanout-slow", {"slow": True}),
+                "broken": ("/fanout-broken", []),
+            }, deadline=0.2)
+            elapsed = time.time() - started
+
+        self.assertLess(elapsed, 0.45)
+        self.assertEqual(results["ok"], {"endpoint": "/fanout-ok"})
+        self.assertEqual(results["slow"], {"slow": True})
+        self.assertEqual(results["broken"], [])
+        self.assertEqual(set(errors), {"slow", "broken"})
+
+
+if __name__ == '__main__':
+    unittest.main()
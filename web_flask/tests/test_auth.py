@@ -0,0 +1,119 @@
+"""Unit tests for the request auth context and user cache."""
+import os
+import sys
+import unittest
+
+from flask import jsonify
+from werkzeug.security import generate_password_hash
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(
+    os.path.join(os.path.dirname(__file__), '..')))
+
+from routes import auth as auth_routes
+from routes import posts as posts_routes
+from tests.helpers import DatabaseTestCase
+from utils import auth
+from utils.decorators import admin_required, login_required
+
+
+class TestAuthContext(DatabaseTestCase):
+    """Test users are resolved from the cache and invalidated on role/password changes."""
+
+    def setUp(self):
+        auth._users.clear()
+        super().setUp()
+        self.conn.execute("INSERT INTO users (username, password, role) VALUES ('fan', ?, 'fan')",
+                          (generate_password_hash("secret1", method="pbkdf2:sha256:1000"),))
+        self.conn.commit()
+        self.user_id = self.conn.execute("SELECT id FROM users WHERE username = 'fan'").fetchone()[0]
+        self.user_queries = []
+        self.conn.set_trace_callback(
+            lambda sql: self.user_queries.append(sql) if "FROM users" in sql else None)
+
+        app = self.make_app(auth_routes.bp, posts_routes.bp)
+
+        @app.before_request
+        def load_logged_in_user():
+            auth.current_user()
+
+        @app.route("/dashboard", endpoint="dashboard.dashboard")
+        def dashboard():
+            return "dashboard"
+
+        @app.route("/api/me")
+        @login_required
+        def me():
+            return jsonify(auth.current_user())
+
+        @app.route("/api/admin-only")
+        @admin_required
+        def admin_only():
+            return jsonify({"status": "success"})
+
+        self.app = app
+        self.client = self.login(app)
+
+    def login(self, app):
+        client = app.test_client()
+        client.post("/login", data={"username": "fan", "password": "secret1"})
+        return client
+
+    def test_resolved_from_cache(self):
+        """Test repeated authenticated calls load the user from SQLite once."""
+        self.user_queries.clear()
+        for _ in range(5):
+            self.assertEqual(self.client.get("/api/me").get_json()["role"], "fan")
+        self.assertEqual(len(self.user_queries), 1)
+
+    def test_anonymous_and_forbidden(self):
+        """Test the decorators answer 401 without a session and 403 without the role."""
+        self.assertEqual(self.app.test_client().get("/api/me").status_code, 401)
+        self.assertEqual(self.client.get("/api/admin-only").status_code, 403)
+
+    def test_role_change_invalidates(self):
+        """Test a role change is seen on the next request after invalidation."""
+        self.client.get("/api/me")
+        self.conn.execute("UPDATE users SET role = 'admin' WHERE id = ?", (self.user_id,))
+        self.conn.commit()
+        self.assertEqual(self.client.get("/api/admin-only").status_code, 403)  # cached
+        with self.app.test_request_context():
+            auth.invalidate_user(self.user_id)
+        self.assertEqual(self.client.get("/api/admin-only").status_code, 200)
+
+    def test_admin_delete_without_role_query(self):
+        """Test an admin-only view trusts the cached role instead of querying users."""
+        self.conn.execute("UPDATE users SET role = 'admin' WHERE id = ?", (self.user_id,))
+        author_id = self.conn.execute(
+            "INSERT INTO users (username, password, role) VALUES ('author', 'x', 'fan')").lastrowid
+        post_id = self.conn.execute(
+            "INSERT INTO posts (user_id, title, content) VALUES (?, 'title', 'text')", (author_id,)).lastrowid
+        self.conn.commit()
+        with self.app.test_request_context():
+            auth.invalidate_user(self.user_id)
+        self.client.get("/api/me")
+        self.user_queries.clear()
+        self.assertEqual(self.client.delete(f"/api/posts/{post_id}").status_code, 200)
+        self.assertEqual(self.user_queries, [])
+        self.assertEqual(self.client.delete(f"/api/posts/{post_id}").status_code, 404)
+
+    def test_password_change_ends_other_sessions(self):
+        """Test changing the password keeps this session and logs out the others."""
+        other = self.login(self.app)
+        self.assertEqual(other.get("/api/me").status_code, 200)
+        response = self.client.post("/api/change-password",
+                                    json={"current_password": "secret1", "new_password": "secret2"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.client.get("/api/me").status_code, 200)
+        self.assertEqual(other.get("/api/me").status_code, 401)
+        self.assertFalse(other.get("/api/user-info").get_json()["logged_in"])
+
+    def test_wrong_current_password(self):
+        """Test the password is not changed without the current one."""
+        response = self.client.post("/api/change-password",
+                                    json={"current_password": "nope", "new_password": "secret2"})
+        self.assertEqual(response.status_code, 403)
+
+
+if __name__ == '__main__':
+    unittest.main()
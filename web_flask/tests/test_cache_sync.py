@@ -0,0 +1,109 @@
+"""Unit tests for the background sync of cached backend tables."""
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(
+    os.path.join(os.path.dirname(__file__), '..')))
+
+from utils import cache_sync
+from utils.cache import Versioned
+from utils.cache_sync import CachedTable, CacheSyncer, apply_diff, diff_rows, sync_lag
+from utils.database import connect, connections
+from utils.migrations import migrate
+
+
+class TestCacheSync(unittest.TestCase):
+    """Test only changed rows are written and the sync lag is recorded."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp.name, "database.sqlite")
+        self.conn = connect(self.db_path)
+        migrate(self.conn)
+        self.remote = {1: ("Kane", "ST", 1, 3), 2: ("Rice", "CM", 1, 0)}
+        self.players = CachedTable("cached_players", ("name", "position", "team_id", "votes"),
+                                   lambda: dict(self.remote))
+
+    def tearDown(self):
+        self.conn.close()
+        connections.close_all()
+        self.tmp.cleanup()
+
+    def rows(self):
+        return {row[0]: tuple(row[1:]) for row in self.conn.execute(
+            "SELECT id, name, position, team_id, votes FROM cached_players")}
+
+    def test_diff_rows(self):
+        """Test the diff holds new and changed rows, and ids gone from the backend."""
+        local = {1: ("a",), 2: ("b",), 3: ("c",)}
+        remote = {1: ("a",), 2: ("B",), 4: ("d",)}
+        self.assertEqual(diff_rows(local, remote), ([(2, "B"), (4, "d")], [3]))
+
+    def test_apply_only_changes(self):
+        """Test a second sync with one changed row writes only that row."""
+        self.assertEqual(apply_diff(self.conn, self.players, self.remote), (2, 0))
+        self.assertEqual(apply_diff(self.conn, self.players, self.remote), (0, 0))
+
+        self.conn.execute("UPDATE cached_players SET synced_at = '2000-01-01 00:00:00'")
+        self.conn.commit()
+        self.remote[1] = ("Kane", "ST", 1, 4)
+        del self.remote[2]
+        self.assertEqual(apply_diff(self.conn, self.players, self.remote), (1, 1))
+        self.assertEqual(self.rows(), {1: ("Kane", "ST", 1, 4)})
+        synced_at = self.conn.execute("SELECT synced_at FROM cached_players WHERE id = 1").fetchone()[0]
+        self.assertGreater(synced_at, "2000-01-01 00:00:00")
+
+    def test_sync_lag(self):
+        """Test lag is unknown before the first sync and small right after it."""
+        self.assertIsNone(sync_lag(self.conn)["cached_players"]["lag"])
+        apply_diff(self.conn, self.players, self.remote)
+        lag = sync_lag(self.conn)["cached_players"]
+        self.assertLess(lag["lag"], 5)
+        self.assertEqual((lag["rows"], lag["last_changed"]), (2, 2))
+
+    def test_failed_fetch_keeps_rows(self):
+        """Test a backend failure leaves the last synced rows in place and is counted."""
+        syncer = CacheSyncer(self.db_path, interval=60, min_interval=0, tables=(self.players,))
+        self.assertEqual(syncer.sync_once(), {"cached_players": (2, 0)})
+
+        def fail():
+            raise ConnectionError("backend down")
+
+        syncer.tables = (self.players._replace(fetch=fail),)
+        with self.assertRaises(ConnectionError):
+            syncer.sync_once()
+        self.assertEqual(len(self.rows()), 2)
+        stats = syncer.stats()
+        self.assertEqual((stats["syncs"], stats["failures"], stats["last_error"]), (1, 1, "backend down"))
+
+    def test_unchanged_documents_skip_diff(self):
+        """Test a sync whose documents revalidate to the same ETags writes nothing."""
+        players = CachedTable("cached_players", self.players.columns,
+                              lambda doc: dict(doc["players"]), ("/players",))
+        documents = {"/players": Versioned({"players": self.remote}, '"v1"')}
+        revalidated = []
+
+        def revalidate(endpoint, known):
+            revalidated.append(known)
+            return documents[endpoint]
+
+        syncer = CacheSyncer(self.db_path, interval=60, min_interval=0, tables=(players,))
+        with mock.patch("utils.api_client._revalidate", side_effect=revalidate):
+            self.assertEqual(syncer.sync_once(), {"cached_players": (2, 0)})
+            with mock.patch.object(cache_sync, "apply_diff") as apply:
+                self.assertEqual(syncer.sync_once(), {"cached_players": (0, 0)})
+            apply.assert_not_called()
+            self.assertEqual(revalidated[1], documents["/players"])
+
+            documents["/players"] = Versioned({"players": {1: ("Kane", "ST", 1, 5)}}, '"v2"')
+            self.assertEqual(syncer.sync_once(), {"cached_players": (1, 1)})
+        self.assertEqual(syncer.stats()["not_modified"], 1)
+        self.assertEqual(sync_lag(self.conn)["cached_players"]["last_changed"], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
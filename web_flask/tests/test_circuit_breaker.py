@@ -0,0 +1,78 @@
+"""Unit tests for circuit breakers and bulkheads."""
+import time
+import unittest
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(
+    os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.circuit_breaker import CircuitBreaker, Bulkhead, EndpointGuards
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    """Test breaker state transitions."""
+
+    def test_opens_after_threshold(self):
+        """Test circuit opens after consecutive failures and rejects calls."""
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+        breaker.record_failure()
+        self.assertTrue(breaker.allow())
+        breaker.record_failure()
+        self.assertEqual(breaker.state, "open")
+        self.assertFalse(breaker.allow())
+        self.assertEqual(breaker.snapshot()["rejected"], 1)
+
+    def test_half_open_single_trial(self):
+        """Test only one trial call is allowed after the reset timeout."""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+        breaker.record_failure()
+        time.sleep(0.1)
+        self.assertTrue(breaker.allow())
+        self.assertEqual(breaker.state, "half_open")
+        self.assertFalse(breaker.allow())
+        breaker.record_success()
+        self.assertEqual(breaker.state, "closed")
+
+    def test_half_open_failure_reopens(self):
+        """Test a failed trial call opens the circuit again."""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+        breaker.record_failure()
+        time.sleep(0.1)
+        self.assertTrue(breaker.allow())
+        breaker.record_failure()
+        self.assertEqual(breaker.state, "open")
+
+
+class TestBulkhead(unittest.TestCase):
+    """Test per-endpoint concurrency limits."""
+
+    def test_rejects_when_full(self):
+        """Test acquiring beyond the limit fails after the wait."""
+        bulkhead = Bulkhead(max_concurrent=1, wait=0.01)
+        self.assertTrue(bulkhead.acquire())
+        self.assertFalse(bulkhead.acquire())
+        bulkhead.release()
+        self.assertTrue(bulkhead.acquire())
+        self.assertEqual(bulkhead.snapshot()["rejected"], 1)
+
+    def test_endpoint_groups(self):
+        """Test endpoints with ids share one guard."""
+        guards = EndpointGuards(5, 10, 4, 0.01)
+        self.assertIs(guards.get("/votes/1"), guards.get("/votes/2"))
+        self.assertEqual(EndpointGuards.group("/match-stats/3"), "/match-stats")
+        self.assertIn("/votes", guards.snapshot())
+
+    def test_writes_grouped_apart_from_reads(self):
+        """Test write endpoints get their own guard, separate from reads of the same resource."""
+        guards = EndpointGuards(5, 10, 4, 0.01)
+        self.assertEqual(EndpointGuards.group("/votes/batch", "POST"), "POST /votes/batch")
+        self.assertEqual(EndpointGuards.group("/votes/reconcile?dry=1", "post"), "POST /votes/reconcile")
+        self.assertIsNot(guards.get("/votes/batch", "POST"), guards.get("/votes/12"))
+        self.assertIsNot(guards.get("/votes/batch", "POST"), guards.get("/votes/reconcile", "POST"))
+        self.assertIsNot(guards.get("/votes/checksums"), guards.get("/votes/12"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+"""Unit tests for the SQLite connection manager."""
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+import requests
+from flask import Flask, jsonify
+from werkzeug.serving import make_server
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(
+    os.path.join(os.path.dirname(__file__), '..')))
+
+from utils import database
+from utils.database import ConnectionManager, close_db, connect, get_db
+
+
+class TestConnectionManager(unittest.TestCase):
+    """Test pragmas, pooled reuse across threads and readers during a write."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp.name, "database.sqlite")
+        self.manager = ConnectionManager()
+        conn = connect(self.db_path)
+        conn.execute("CREATE TABLE user_votes (id INTEGER PRIMARY KEY, match_id INTEGER)")
+        conn.execute("INSERT INTO user_votes (match_id) VALUES (1)")
+        conn.commit()
+        conn.close()
+
+    def tearDown(self):
+        self.manager.close_all()
+        self.tmp.cleanup()
+
+    def test_pragmas(self):
+        """Test connections use WAL, synchronous=NORMAL and a busy timeout."""
+        conn = self.manager.connection(self.db_path)
+        self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+        self.assertEqual(conn.execute("PRAGMA synchronous").fetchone()[0], 1)
+        self.assertGreater(conn.execute("PRAGMA busy_timeout").fetchone()[0], 0)
+
+    def test_pool_reuse_and_bound(self):
+        """Test returned connections are reused and only pool_size of them are kept idle."""
+        manager = ConnectionManager(pool_size=1)
+        first, second = manager.connection(self.db_path), manager.connection(self.db_path)
+        self.assertIsNot(first, second)
+        manager.release(first)
+        manager.release(second)  # pool is full: closed
+        self.assertIs(manager.connection(self.db_path), first)
+        self.assertEqual(manager.stats(), {"opened": 2, "reused": 1, "closed": 1, "idle": 0})
+        manager.release(first)
+        manager.close_all()
+
+    def test_reused_across_request_threads(self):
+        """Test a threaded server (a new thread per request) reuses pooled connections."""
+        app = Flask(__name__)
+        app.teardown_appcontext(close_db)
+
+        @app.route("/count")
+        def count():
+            return jsonify(get_db().execute("SELECT COUNT(*) FROM user_votes").fetchone()[0])
+
+        with mock.patch.object(database, "connections", self.manager), \
+                mock.patch.object(database, "DB_PATH", self.db_path):
+            server = make_server("127.0.0.1", 0, app, threaded=True)
+            thread = threading.Thread(target=server.serve_forever, daemon=True)
+            thread.start()
+            try:
+                for _ in range(20):
+                    response = requests.get(f"http://127.0.0.1:{server.server_port}/count", timeout=5)
+                    self.assertEqual(response.json(), 1)
+            finally:
+                server.shutdown()
+        self.assertEqual(self.manager.stats(), {"opened": 1, "reused": 19, "closed": 0, "idle": 1})
+
+    def test_release_drops_uncommitted_writes(self):
+        """Test a request's uncommitted transaction does not leak into the next one."""
+        conn = self.manager.connection(self.db_path)
+        conn.execute("INSERT INTO user_votes (match_id) VALUES (2)")
+        self.manager.release(conn)
+        self.assertFalse(conn.in_transaction)
+        self.assertEqual(conn.execute("SELECT COUNT(*) FROM user_votes").fetchone()[0], 1)
+
+    def test_reader_not_blocked_by_writer(self):
+        """Test a read succeeds while another connection holds the write lock."""
+        writer = self.manager.connection(self.db_path)
+        writer.execute("BEGIN IMMEDIATE")
+        writer.execute("INSERT INTO user_votes (match_id) VALUES (3)")
+        counts = []
+
+        def read():
+            reader = connect(self.db_path)
+            reader.execute("PRAGMA busy_timeout=0")
+            counts.append(reader.execute("SELECT COUNT(*) FROM user_votes").fetchone()[0])
+            reader.close()
+
+        thread = threading.Thread(target=read)
+        thread.start()
+        thread.join()
+        writer.commit()
+        self.assertEqual(counts, [1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+"""Unit tests for Idempotency-Key handling."""
+import os
+import sys
+import unittest
+
+from flask import Flask, jsonify, request, session
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(
+    os.path.join(os.path.dirname(__file__), '..')))
+
+from utils import idempotency
+from utils.idempotency import idempotent
+
+
+class TestIdempotency(unittest.TestCase):
+    """Test stored responses are replayed without running the view again."""
+
+    def setUp(self):
+        idempotency._store.clear()
+        self.calls = 0
+        self.status = 200
+        app = Flask(__name__)
+        app.secret_key = "test"
+
+        @app.route("/login/<int:user_id>")
+        def login(user_id):
+            session["user_id"] = user_id
+            return "ok"
+
+        @app.route("/api/things", methods=["POST"])
+        @idempotent
+        def create_thing():
+            self.calls += 1
+            return jsonify({"status": "success", "n": self.calls,
+                            "name": request.get_json()["name"]}), self.status
+
+        self.client = app.test_client()
+        self.client.get("/login/1")
+
+    def post(self, key=None, name="a"):
+        headers = {"Idempotency-Key": key} if key else {}
+        return self.client.post("/api/things", json={"name": name}, headers=headers)
+
+    def test_retry_replays_stored_response(self):
+        """Test a retry gets the first response and the view runs once."""
+        first = self.post("k1")
+        retry = self.post("k1")
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(retry.get_json(), first.get_json())
+        self.assertEqual(retry.headers.get("Idempotent-Replayed"), "true")
+        self.assertIsNone(first.headers.get("Idempotent-Replayed"))
+
+    def test_without_key_or_other_key_runs_view(self):
+        """Test requests without a key, or with another key, are not deduplicated."""
+        self.post()
+        self.post()
+        self.post("k1")
+        self.post("k2")
+        self.assertEqual(self.calls, 4)
+
+    def test_key_reused_with_other_body(self):
+        """Test a key reused for a different request is rejected."""
+        self.post("k1", name="a")
+        response = self.post("k1", name="b")
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(self.calls, 1)
+
+    def test_keys_are_scoped_to_user(self):
+        """Test another user's request with the same key is not replayed."""
+        self.post("k1")
+        self.client.get("/login/2")
+        self.assertEqual(self.post("k1").get_json()["n"], 2)
+
+    def test_server_errors_are_not_stored(self):
+        """Test a retry after a 5xx response runs the view again."""
+        self.status = 503
+        self.assertEqual(self.post("k1").status_code, 503)
+        self.status = 200
+        self.assertEqual(self.post("k1").status_code, 200)
+        self.assertEqual(self.calls, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
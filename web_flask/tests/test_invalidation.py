@@ -0,0 +1,71 @@
+"""Unit tests for write-driven cache invalidation."""
+import os
+import sys
+import tempfile
+import unittest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(
+    os.path.join(os.path.dirname(__file__), '..')))
+
+from utils import api_client
+from utils.invalidation import InvalidationBus, VOTES, MATCH, resource_key, publish
+from utils.shared_cache import SharedCache
+
+
+class TestInvalidationBus(unittest.TestCase):
+    """Test publish/subscribe of changed resources."""
+
+    def test_failing_subscriber_does_not_block_others(self):
+        """Test every subscriber is notified even if one raises."""
+        bus = InvalidationBus()
+        received = []
+
+        def broken(keys):
+            raise RuntimeError("boom")
+
+        bus.subscribe(broken)
+        bus.subscribe(received.append)
+        bus.publish(["votes:1", "votes:1"])
+        self.assertEqual(received, [frozenset({"votes:1"})])
+
+    def test_vote_invalidates_dependent_endpoints(self):
+        """Test a published vote drops /votes/<id>, /stats and /match-stats."""
+        for endpoint in ("/votes/7", "/votes/8", "/stats", "/match-stats", "/teams"):
+            api_client._api_cache.set(endpoint, {"cached": True}, ttl=600)
+        publish(resource_key(VOTES, 7))
+        self.assertFalse(api_client._api_cache.get("/votes/7")[0])
+        self.assertFalse(api_client._api_cache.get("/stats")[0])
+        self.assertFalse(api_client._api_cache.get("/match-stats")[0])
+        self.assertTrue(api_client._api_cache.get("/votes/8")[0])
+        self.assertTrue(api_client._api_cache.get("/teams")[0])
+
+    def test_match_change_invalidates_matches_page(self):
+        """Test closing a match drops the matches page."""
+        api_client._api_cache.set("/matches-page", {"matches": []}, ttl=600)
+        publish(resource_key(MATCH, 3))
+        self.assertFalse(api_client._api_cache.get("/matches-page")[0])
+
+
+class TestSharedInvalidations(unittest.TestCase):
+    """Test invalidations reach other workers through the shared tier."""
+
+    def test_other_worker_sees_invalidation(self):
+        """Test keys invalidated by one worker are reported to another."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "api_cache.sqlite")
+            writer = SharedCache(path, max_entries=10)
+            reader = SharedCache(path, max_entries=10)
+            writer.set("/stats", {"total_votes": 1})
+            seq, keys = reader.invalidations_since(None)
+            self.assertEqual(keys, [])
+
+            writer.invalidate("/stats", "/votes/2")
+            seq, keys = reader.invalidations_since(seq)
+            self.assertEqual(keys, ["/stats", "/votes/2"])
+            self.assertFalse(reader.get("/stats")[0])
+            self.assertEqual(reader.invalidations_since(seq), (seq, []))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+"""Unit tests for the load-test harness."""
+import os
+import sys
+import unittest
+
+import requests
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(
+    os.path.join(os.path.dirname(__file__), '..')))
+
+from loadtest.fake_backend import FakeBackend
+from loadtest.runner import Recorder, format_report, percentile
+
+
+class TestFakeBackend(unittest.TestCase):
+    """Test the stand-in backend speaks the API the Flask app uses."""
+
+    def setUp(self):
+        self.backend = FakeBackend(matches=2, players_per_team=2, seed=1).start()
+
+    def tearDown(self):
+        self.backend.stop()
+
+    def test_votes_and_etags(self):
+        """Test votes are counted once per key and GETs revalidate with ETags."""
+        url = self.backend.url
+        first = requests.get(f"{url}/votes/1", timeout=5)
+        self.assertEqual(first.json(), {"match_id": 1, "votes": []})
+        not_modified = requests.get(f"{url}/votes/1", timeout=5,
+                                    headers={"If-None-Match": first.headers["ETag"]})
+        self.assertEqual(not_modified.status_code, 304)
+
+        vote = {"match_id": 1, "player_id": 2, "vote_key": "7:1"}
+        results = requests.post(f"{url}/votes/batch", json={"votes": [vote, vote]}, timeout=5).json()
+        self.assertEqual([r.get("duplicate", False) for r in results["results"]], [False, True])
+        self.assertEqual(requests.get(f"{url}/votes/1", timeout=5).json()["votes"],
+                         [{"player_id": 2, "votes": 1}])
+        self.assertEqual(self.backend.players_of(2), [5, 6, 7, 8])
+
+    def test_injected_errors(self):
+        """Test error_rate makes the backend answer 503."""
+        self.backend.error_rate = 1.0
+        self.assertEqual(requests.get(f"{self.backend.url}/stats", timeout=5).status_code, 503)
+        self.assertEqual(self.backend.requests["GET /api/stats"], 1)
+
+
+class TestReport(unittest.TestCase):
+    """Test latency percentiles and the per-route report."""
+
+    def test_percentile(self):
+        """Test nearest-rank percentiles."""
+        samples = [i / 1000 for i in range(100, 0, -1)]
+        self.assertEqual(percentile(samples, 0.50), 0.05)
+        self.assertEqual(percentile(samples, 0.99), 0.099)
+        self.assertEqual(percentile([], 0.95), 0.0)
+
+    def test_report_per_route(self):
+        """Test requests, errors and percentiles are reported per route."""
+        recorder = Recorder()
+        for ms in (10, 20, 30):
+            recorder.record("GET /a", ms / 1000, ok=True)
+        recorder.record("POST /b", 0.5, ok=False)
+        recorder.finished_at = recorder.started_at + 2
+        report = recorder.report()
+        self.assertEqual(report["routes"]["GET /a"]["p50_ms"], 20.0)
+        self.assertEqual(report["routes"]["GET /a"]["rps"], 1.5)
+        self.assertEqual(report["routes"]["POST /b"]["errors"], 1)
+        self.assertEqual(report["total"]["requests"], 4)
+
+    def test_setup_reported_apart(self):
+        """Test register/login before the start stay out of TOTAL."""
+        recorder, setup = Recorder(), Recorder()
+        setup.record("POST /login", 2.0, ok=True)
+        recorder.record("GET /a", 0.01, ok=True)
+        setup.finished_at = recorder.finished_at = recorder.started_at + 1
+        report = recorder.report()
+        report["setup"] = setup.report()
+        self.assertEqual(report["total"]["p99_ms"], 10.0)
+        lines = format_report(report).splitlines()
+        total = next(i for i, line in enumerate(lines) if line.startswith("TOTAL"))
+        self.assertTrue(any(line.startswith("POST /login") for line in lines[total:]))
+        self.assertFalse(any(line.startswith("POST /login") for line in lines[:total]))
+
+
+if __name__ == '__main__':
+    unittest.main()
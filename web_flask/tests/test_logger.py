@@ -0,0 +1,75 @@
+"""Unit tests for logging configuration."""
+import logging
+import queue
+import unittest
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(
+    os.path.join(os.path.dirname(__file__), '..')))
+
+from utils import logger as app_logger
+
+
+class _Exploding:
+    """Payload whose repr must never be computed in the logging thread."""
+
+    def __repr__(self):
+        raise AssertionError("payload rendered eagerly")
+
+
+class TestPayloadLogging(unittest.TestCase):
+    """Test lazy, truncated, sampled payload logging."""
+
+    def setUp(self):
+        self.logger = logging.getLogger("test-payload")
+        self.logger.propagate = False
+        self.records = queue.Queue()
+        self.handler = app_logger._DroppingQueueHandler(self.records)
+        self.logger.addHandler(self.handler)
+
+    def tearDown(self):
+        self.logger.removeHandler(self.handler)
+
+    def test_payload_not_rendered_in_caller(self):
+        """Test the queue handler leaves formatting to the listener."""
+        record = self.logger.makeRecord(
+            "test-payload", logging.INFO, __file__, 0, "API GET response %s",
+            (app_logger._Payload(_Exploding(), 100),), None)
+        self.handler.handle(record)
+        self.assertIs(self.records.get_nowait(), record)
+        with self.assertRaises(AssertionError):
+            record.getMessage()
+
+    def test_payload_truncated(self):
+        """Test long payloads are cut to the configured length."""
+        self.logger.setLevel(logging.DEBUG)
+        app_logger.log_payload(self.logger, "API GET response", "/players", "x" * 5000)
+        message = self.records.get_nowait().getMessage()
+        self.assertLess(len(message), 5000)
+        self.assertIn("chars)", message)
+
+    def test_info_level_sampled(self):
+        """Test payloads at INFO are skipped when sampling is off."""
+        self.logger.setLevel(logging.INFO)
+        rate = app_logger.LOG_PAYLOAD_SAMPLE_RATE
+        app_logger.LOG_PAYLOAD_SAMPLE_RATE = 0
+        try:
+            app_logger.log_payload(self.logger, "API GET response", "/stats", {})
+        finally:
+            app_logger.LOG_PAYLOAD_SAMPLE_RATE = rate
+        self.assertTrue(self.records.empty())
+
+    def test_full_queue_drops(self):
+        """Test a full queue drops records instead of blocking."""
+        self.logger.setLevel(logging.INFO)
+        self.handler.queue = queue.Queue(maxsize=1)
+        dropped = app_logger._DroppingQueueHandler.dropped
+        self.logger.info("first")
+        self.logger.info("second")
+        self.assertEqual(app_logger._DroppingQueueHandler.dropped, dropped + 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
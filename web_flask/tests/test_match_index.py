@@ -0,0 +1,76 @@
+"""Unit tests for the vote route's match index."""
+import os
+import sys
+import unittest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(
+    os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.match_index import MatchIndex
+
+
+class TestMatchIndex(unittest.TestCase):
+    """Test match_id -> state lookups."""
+
+    def setUp(self):
+        self.document = {"matches": [
+            {"id": 1, "team1": "A", "team2": "B", "isActive": True,
+             "team1_formation": "4-3-3", "team2_formation": "4-4-2"},
+            {"id": 2, "team1": "C", "team2": "D", "isActive": False},
+        ]}
+        self.loads = 0
+
+        def loader():
+            self.loads += 1
+            return self.document["matches"]
+
+        self.index = MatchIndex(loader, lambda: self.document,
+                                max_age=300, reload_interval=0)
+
+    def test_lookup_without_reload(self):
+        """Test repeated lookups use the index built once."""
+        for _ in range(100):
+            state = self.index.get(1)
+        self.assertTrue(state.is_active)
+        self.assertEqual(state.team2_formation, "4-4-2")
+        self.assertFalse(self.index.get(2).is_active)
+        self.assertEqual(self.loads, 1)
+
+    def test_rebuilds_when_document_changes(self):
+        """Test a replaced or invalidated document triggers a rebuild."""
+        self.index.get(1)
+        self.document = {"matches": [{"id": 1, "team1": "A", "team2": "B", "isActive": False}]}
+        self.assertFalse(self.index.get(1).is_active)
+        self.assertEqual(self.loads, 2)
+
+    def test_admin_updates(self):
+        """Test close/activate/delete are applied directly."""
+        self.index.get(1)
+        self.index.set_active(1, False)
+        self.assertFalse(self.index.get(1).is_active)
+        self.index.remove(2)
+        self.index.reload_interval = 60
+        self.assertIsNone(self.index.get(2))
+
+    def test_unknown_match_reloads(self):
+        """Test an unknown match id reloads to pick up new matches."""
+        self.index.get(1)
+        self.document["matches"].append({"id": 3, "team1": "E", "team2": "F", "isActive": True})
+        self.assertTrue(self.index.get(3).is_active)
+
+    def test_keeps_old_index_when_reload_fails(self):
+        """Test a failing rebuild keeps serving the previous index."""
+        self.index.get(1)
+
+        def failing():
+            raise RuntimeError("backend down")
+
+        self.index.loader = failing
+        self.document = {"matches": []}
+        self.assertTrue(self.index.get(1).is_active)
+        self.assertEqual(self.index.stats()["rebuild_errors"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
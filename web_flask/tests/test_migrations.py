@@ -0,0 +1,77 @@
+"""Unit tests for versioned schema migrations."""
+import os
+import sys
+import tempfile
+import threading
+import unittest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(
+    os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.database import connect
+from utils.migrations import latest_version, migrate, schema_version
+
+
+class TestMigrations(unittest.TestCase):
+    """Test pending migrations are applied once and legacy databases are upgraded."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp.name, "database.sqlite")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_fresh_database(self):
+        """Test a new database gets every migration, and a second run applies none."""
+        conn = connect(self.db_path)
+        self.assertEqual(migrate(conn), list(range(1, latest_version() + 1)))
+        self.assertEqual(schema_version(conn), latest_version())
+        self.assertEqual(conn.execute("SELECT username FROM users WHERE role='admin'").fetchone()[0],
+                         "admin")
+        self.assertEqual(migrate(conn), [])
+        conn.close()
+
+    def test_legacy_database(self):
+        """Test an unversioned database keeps its data and gets the missing columns."""
+        conn = connect(self.db_path)
+        conn.execute("CREATE TABLE users (id INTEGER PRIMARY KEY AUTOINCREMENT, username TEXT UNIQUE NOT NULL,"
+                     " password TEXT NOT NULL, role TEXT NOT NULL DEFAULT 'fan')")
+        conn.execute("INSERT INTO users (username, password, role) VALUES ('boss', 'x', 'admin')")
+        conn.execute("CREATE TABLE cached_matches (id INTEGER PRIMARY KEY, team1 TEXT NOT NULL,"
+                     " team2 TEXT NOT NULL, date TEXT, is_active BOOLEAN DEFAULT 1,"
+                     " team1_goals INTEGER DEFAULT 0)")
+        conn.execute("INSERT INTO cached_matches (id, team1, team2, team1_goals) VALUES (1, 'A', 'B', 2)")
+        conn.commit()
+
+        migrate(conn)
+        row = conn.execute("SELECT team1_goals, team2_red_cards, team1_possession FROM cached_matches").fetchone()
+        self.assertEqual(tuple(row), (2, 0, 50))
+        self.assertEqual(conn.execute("SELECT COUNT(*) FROM users").fetchone()[0], 1)
+        conn.close()
+
+    def test_concurrent_startup(self):
+        """Test workers starting together apply the migrations exactly once."""
+        results, errors = [], []
+
+        def start_worker():
+            conn = connect(self.db_path)
+            try:
+                results.append(migrate(conn))
+            except Exception as e:
+                errors.append(e)
+            finally:
+                conn.close()
+
+        threads = [threading.Thread(target=start_worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(sorted(len(applied) for applied in results), [0, 0, 0, latest_version()])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+"""Unit tests for keyset pagination."""
+import os
+import sys
+import unittest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(
+    os.path.join(os.path.dirname(__file__), '..')))
+
+from routes import comments
+from tests.helpers import DatabaseTestCase
+from utils.pagination import decode_cursor, encode_cursor, page_args
+
+
+class TestCursor(unittest.TestCase):
+    """Test cursor encoding and query-string parsing."""
+
+    def test_round_trip(self):
+        """Test a cursor decodes back to its row key."""
+        self.assertEqual(decode_cursor(encode_cursor("2026-01-02 10:00:00", 42)),
+                         ("2026-01-02 10:00:00", 42))
+
+    def test_invalid_input(self):
+        """Test bad cursors and limits are rejected, large limits capped."""
+        for args in ({"cursor": "not-a-cursor"}, {"cursor": encode_cursor("x", 1)[:-2] + "!!"},
+                     {"limit": "0"}, {"limit": "ten"}):
+            with self.assertRaises(ValueError, msg=args):
+                page_args(args)
+        self.assertEqual(page_args({"limit": "100000"})[0], 200)
+
+
+class TestCommentPages(DatabaseTestCase):
+    """Test walking a comment thread page by page."""
+
+    def setUp(self):
+        super().setUp()
+        # Same timestamp for several rows: the id breaks ties
+        for i in range(7):
+            self.conn.execute("INSERT INTO match_comments (user_id, match_id, comment_text, created_at)"
+                              " VALUES (1, 1, ?, ?)", (f"c{i}", f"2026-01-01 10:00:0{i // 3}"))
+        self.conn.execute("INSERT INTO match_comments (user_id, match_id, comment_text) VALUES (1, 2, 'other')")
+        self.conn.commit()
+        self.make_app(comments.bp)
+
+    def test_pages_cover_thread_once(self):
+        """Test pages are newest first with no gaps or repeats, and the last has no cursor."""
+        seen, cursor, pages = [], None, 0
+        while True:
+            query = {"limit": 3, **({"cursor": cursor} if cursor else {})}
+            data = self.client.get("/api/matches/1/comments", query_string=query).get_json()
+            seen += [c["comment_text"] for c in data["comments"]]
+            pages += 1
+            cursor = data["next_cursor"]
+            if cursor is None:
+                break
+        self.assertEqual(seen, [f"c{i}" for i in reversed(range(7))])
+        self.assertEqual(pages, 3)
+
+    def test_bad_cursor(self):
+        """Test a malformed cursor is a client error."""
+        response = self.client.get("/api/matches/1/comments?cursor=%%%")
+        self.assertEqual(response.status_code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+"""Unit tests for pooled password hashing and rehash-on-login."""
+import os
+import sys
+import unittest
+from unittest import mock
+
+from werkzeug.security import generate_password_hash
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(
+    os.path.join(os.path.dirname(__file__), '..')))
+
+from routes import auth as auth_routes
+from tests.helpers import DatabaseTestCase
+from utils import auth, passwords
+from utils.passwords import HashPoolBusy, PasswordHasher
+
+CHEAP = "pbkdf2:sha256:1000"
+
+
+class TestPasswordHasher(unittest.TestCase):
+    """Test hashing, checking and the rehash decision."""
+
+    def test_hash_and_verify_inline(self):
+        """Test workers=0 hashes in the calling thread with the configured parameters."""
+        hasher = PasswordHasher(CHEAP, 8, workers=0, max_pending=1, wait=0)
+        stored = hasher.hash("secret1")
+        self.assertTrue(stored.startswith(CHEAP + "$"))
+        self.assertTrue(hasher.verify(stored, "secret1"))
+        self.assertFalse(hasher.verify(stored, "secret2"))
+        self.assertEqual(hasher.stats()["hashed"], 1)
+        self.assertEqual(hasher.stats()["verified"], 2)
+
+    def test_needs_rehash(self):
+        """Test hashes with another method, cost or salt length are rehashed."""
+        hasher = PasswordHasher("pbkdf2:sha256", 16, workers=0, max_pending=1, wait=0)
+        self.assertFalse(hasher.needs_rehash(hasher.hash("secret1")))
+        self.assertTrue(hasher.needs_rehash(generate_password_hash("secret1", CHEAP, 16)))
+        self.assertTrue(hasher.needs_rehash(generate_password_hash("secret1", "pbkdf2:sha256", 8)))
+
+    def test_process_pool(self):
+        """Test hashes made in worker processes check in this one."""
+        hasher = PasswordHasher(CHEAP, 16, workers=1, max_pending=2, wait=5)
+        try:
+            stored = hasher.hash("secret1")
+            self.assertTrue(hasher.verify(stored, "secret1"))
+            self.assertTrue(passwords.check_password_hash(stored, "secret1"))
+        finally:
+            hasher.shutdown()
+
+    def test_busy(self):
+        """Test a caller gets HashPoolBusy when every slot is taken."""
+        hasher = PasswordHasher(CHEAP, 16, workers=1, max_pending=1, wait=0)
+        hasher._slots.acquire()
+        with self.assertRaises(HashPoolBusy):
+            hasher.hash("secret1")
+        self.assertEqual(hasher.stats()["busy"], 1)
+
+
+class TestRehashOnLogin(DatabaseTestCase):
+    """Test login replaces hashes made with old parameters."""
+
+    def setUp(self):
+        auth._users.clear()
+        super().setUp()
+        self.conn.execute("INSERT INTO users (username, password, role) VALUES ('fan', ?, 'fan')",
+                          (generate_password_hash("secret1", CHEAP, 16),))
+        self.conn.commit()
+        self.make_app(auth_routes.bp)
+
+        self.hasher = PasswordHasher("pbkdf2:sha256:2000", 16, workers=0, max_pending=1, wait=0)
+        patcher = mock.patch.object(passwords, "_hasher", self.hasher)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def stored(self):
+        return self.conn.execute(
+            "SELECT password, auth_version FROM users WHERE username = 'fan'").fetchone()
+
+    def login(self, password="secret1"):
+        return self.client.post("/login", data={"username": "fan", "password": password})
+
+    def test_rehashed_once(self):
+        """Test the first login rehashes with the new parameters and keeps auth_version."""
+        version = self.stored()["auth_version"]
+        self.assertIn("success=", self.login().headers["Location"])
+        rehashed = self.stored()["password"]
+        self.assertTrue(rehashed.startswith("pbkdf2:sha256:2000$"))
+        self.assertEqual(self.stored()["auth_version"], version)
+
+        self.assertIn("success=", self.login().headers["Location"])
+        self.assertEqual(self.stored()["password"], rehashed)
+
+    def test_wrong_password_not_rehashed(self):
+        """Test a failed login leaves the stored hash alone."""
+        self.assertIn("error=", self.login("nope").headers["Location"])
+        self.assertTrue(self.stored()["password"].startswith(CHEAP + "$"))
+
+    def test_busy_login(self):
+        """Test a login that cannot get a hashing slot is asked to retry."""
+        with mock.patch.object(passwords, "_hasher", PasswordHasher(CHEAP, 16, 1, 1, 0)) as hasher:
+            hasher._slots.acquire()
+            response = self.login()
+        self.assertTrue(response.headers["Location"].startswith("/login?error="))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+"""Query-plan regression tests: no SQL in routes/ may fall back to a full table scan."""
+import ast
+import glob
+import os
+import re
+import sys
+import tempfile
+import unittest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(
+    os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.database import connect
+from utils.migrations import migrate
+
+ROUTES_DIR = os.path.join(os.path.dirname(__file__), '..', 'routes')
+
+# Queries that read a whole table on purpose (matched on whitespace-normalized SQL)
+ALLOWED_FULL_SCANS = {
+    "SELECT * FROM cached_players": "players-info returns the whole player cache",
+    "SELECT * FROM cached_matches": "matches-info returns the whole match cache",
+    "SELECT id, team1, team2, date FROM cached_matches": "profile builds a map of all matches",
+    "SELECT id, name, position FROM cached_players": "profile builds a map of all players",
+}
+
+
+def _normalize(sql: str) -> str:
+    return re.sub(r"\s+", " ", sql).strip()
+
+
+def route_queries():
+    """Yield (location, sql) for every literal SQL string passed to execute() in routes/."""
+    for path in sorted(glob.glob(os.path.join(ROUTES_DIR, "*.py"))):
+        with open(path, encoding="utf-8") as f:
+            tree = ast.parse(f.read(), filename=path)
+        for node in ast.walk(tree):
+            if (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute)
+                    and node.func.attr in ("execute", "executemany") and node.args
+                    and isinstance(node.args[0], ast.Constant) and isinstance(node.args[0].value, str)):
+                yield f"{os.path.basename(path)}:{node.lineno}", _normalize(node.args[0].value)
+
+
+class TestQueryPlans(unittest.TestCase):
+    """Run EXPLAIN QUERY PLAN on every route query against the migrated schema."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.conn = connect(os.path.join(cls.tmp.name, "database.sqlite"))
+        migrate(cls.conn)
+        cls.queries = list(route_queries())
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.conn.close()
+        cls.tmp.cleanup()
+
+    def plan(self, sql):
+        rows = self.conn.execute(f"EXPLAIN QUERY PLAN {sql}", [None] * sql.count("?")).fetchall()
+        return [row["detail"] for row in rows]
+
+    def test_queries_found(self):
+        """Test the extractor sees the route queries (guards against a silent no-op)."""
+        self.assertGreater(len(self.queries), 20)
+        self.assertTrue(any("match_comments" in sql for _, sql in self.queries))
+
+    def test_no_full_table_scans(self):
+        """Test every route query uses an index or the primary key."""
+        offenders = []
+        for location, sql in self.queries:
+            if sql in ALLOWED_FULL_SCANS:
+                continue
+            for detail in self.plan(sql):
+                if detail.startswith("SCAN ") and "INDEX" not in detail:
+                    offenders.append(f"{location}: {detail} <- {sql}")
+        self.assertEqual(offenders, [])
+
+    def test_hot_queries_use_covering_indexes(self):
+        """Test the hot read paths are answered from an index alone."""
+        covering = {
+            "SELECT player_id FROM user_votes WHERE user_id = ? "
+            "UNION SELECT player_id FROM user_votes_archive WHERE user_id = ?":
+                ("idx_user_votes_user_history", "idx_user_votes_archive_user_history"),
+        }
+        for sql, indexes in covering.items():
+            for index in indexes:
+                self.assertIn(f"USING COVERING INDEX {index}", " ".join(self.plan(sql)), sql)
+        tallies = " ".join(self.plan(
+            "SELECT player_id, votes FROM match_vote_tallies WHERE match_id = ? ORDER BY player_id"))
+        self.assertIn("USING PRIMARY KEY", tallies)
+        self.assertNotIn("TEMP B-TREE", tallies)
+        # Keyset pages: a range seek in index order, so page N costs the same as page 1
+        keyset = re.compile(r"\((\w+\.)?created_at, (\w+\.)?id\) < \(\?, \?\)")
+        pages = [sql for _, sql in self.queries if keyset.search(sql)]
+        self.assertEqual(len(pages), 3)
+        for sql in pages:
+            plan = " ".join(self.plan(sql))
+            self.assertIn("created_at<?", plan, sql)
+            self.assertNotIn("TEMP B-TREE", plan, sql)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,128 @@
+"""Unit tests for vote reconciliation."""
+import os
+import sqlite3
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(
+    os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.database import init_user_db
+from utils.reconcile import VoteReconciler, tally_checksum
+from utils.vote_archive import archive_match
+from utils.vote_outbox import enqueue
+
+
+class FakeBackend:
+    """In-memory backend tallies."""
+
+    def __init__(self, votes):
+        self.votes = votes
+        self.tally_calls = []
+        self.writes = []
+
+    def checksums(self):
+        return {m: (sum(t.values()), tally_checksum(t)) for m, t in self.votes.items()}
+
+    def tallies(self, match_id):
+        self.tally_calls.append(match_id)
+        return dict(self.votes[match_id])
+
+    def set_tallies(self, match_id, tallies):
+        self.writes.append((match_id, dict(tallies)))
+        for player_id, count in tallies.items():
+            self.votes[match_id][player_id] = count
+        return True, ""
+
+
+class TestVoteReconciler(unittest.TestCase):
+    """Test checksum comparison, per-player repair and the high-water mark."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp.name, "database.sqlite")
+        with mock.patch("utils.database.DB_PATH", self.db_path):
+            init_user_db()
+        self.db = sqlite3.connect(self.db_path)
+        # Match 1: players 10 x2, 11 x1; match 2: player 20 x1
+        self.add_votes((1, 1, 10), (2, 1, 10), (3, 1, 11), (1, 2, 20))
+
+    def tearDown(self):
+        self.db.close()
+        self.tmp.cleanup()
+
+    def add_votes(self, *votes):
+        self.db.executemany("INSERT INTO user_votes (user_id, match_id, player_id) VALUES (?, ?, ?)",
+                            votes)
+        self.db.commit()
+
+    def test_checksum_matches_backend_format(self):
+        """Test checksum is order independent, skips zeros and matches the C++ value."""
+        self.assertEqual(tally_checksum({1: 57}), "d986cc43d0619677")
+        self.assertEqual(tally_checksum({2: 1, 1: 3}), tally_checksum({1: 3, 2: 1, 5: 0}))
+        self.assertNotEqual(tally_checksum({1: 3}), tally_checksum({1: 4}))
+
+    def test_repairs_only_differing_players(self):
+        """Test agreeing matches are not diffed and only differences are written."""
+        backend = FakeBackend({1: {10: 2, 11: 4, 12: 1}, 2: {20: 1}})
+        report = VoteReconciler(self.db, backend, settle=0).run()
+        self.assertEqual(report["mismatched"], 1)
+        self.assertEqual(report["repaired"], 2)
+        self.assertEqual(backend.writes, [(1, {11: 1, 12: 0})])
+        self.assertNotIn(2, backend.tally_calls)
+
+    def test_incremental_run_skips_untouched_matches(self):
+        """Test a second run only checks matches with new votes or changed checksums."""
+        backend = FakeBackend({1: {10: 2, 11: 1}, 2: {20: 1}})
+        reconciler = VoteReconciler(self.db, backend, settle=0)
+        self.assertEqual(reconciler.run()["checked"], 2)
+
+        self.add_votes((4, 2, 20))
+        backend.votes[2][20] = 2
+        report = reconciler.run()
+        self.assertEqual((report["checked"], report["skipped"]), (1, 1))
+        self.assertEqual(report["mismatched"], 0)
+
+        # A backend-side change is found without new user_votes rows
+        backend.votes[1][10] = 5
+        report = reconciler.run()
+        self.assertEqual(report["checked"], 1)
+        self.assertEqual(backend.writes, [(1, {10: 2})])
+
+    def test_archived_votes_still_count(self):
+        """Test votes moved to the archive are part of the local tallies."""
+        archive_match(self.db, 1)
+        self.db.commit()
+        backend = FakeBackend({1: {10: 2, 11: 1}, 2: {20: 1}})
+        report = VoteReconciler(self.db, backend, settle=0).run(full=True)
+        self.assertEqual((report["checked"], report["mismatched"]), (2, 0))
+        self.assertEqual(backend.writes, [])
+
+    def test_dry_run_and_outbox_votes(self):
+        """Test dry run repairs nothing and votes awaiting replay are not counted."""
+        self.add_votes((5, 2, 20))
+        enqueue(self.db, 5, 2, 20)
+        self.db.commit()
+        backend = FakeBackend({1: {10: 2}, 2: {20: 1}})
+        report = VoteReconciler(self.db, backend, settle=0).run(dry_run=True)
+        self.assertEqual(report["differences"],
+                         [{"match_id": 1, "player_id": 11, "flask": 1, "backend": 0}])
+        self.assertEqual(backend.writes, [])
+        self.assertEqual(VoteReconciler(self.db, backend, settle=0).run()["checked"], 2)
+
+    def test_rejected_outbox_votes_counted(self):
+        """Test a vote left as rejected in the outbox is reconciled like any other."""
+        self.add_votes((5, 2, 20))
+        enqueue(self.db, 5, 2, 20)
+        self.db.execute("UPDATE vote_outbox SET status = 'rejected'")
+        self.db.commit()
+        backend = FakeBackend({1: {10: 2, 11: 1}, 2: {20: 1}})
+        VoteReconciler(self.db, backend, settle=0).run(full=True)
+        self.assertEqual(backend.writes, [(2, {20: 2})])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+"""Unit tests for full-text search over posts and comments."""
+import os
+import sys
+import unittest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(
+    os.path.join(os.path.dirname(__file__), '..')))
+
+from routes import search as search_routes
+from tests.helpers import DatabaseTestCase
+from utils.search import fts_query, highlight, search
+
+
+class TestSearch(DatabaseTestCase):
+    """Test the FTS indexes follow the tables and results are ranked and escaped."""
+
+    def setUp(self):
+        super().setUp()
+        self.conn.executemany("INSERT INTO posts (user_id, title, content) VALUES (1, ?, ?)", [
+            ("Фінал кубка", "Динамо зіграє у фіналі в суботу"),
+            ("Розклад", "Матчі туру: Динамо, Шахтар, Зоря"),
+        ])
+        self.conn.executemany("INSERT INTO match_comments (user_id, match_id, comment_text) VALUES (1, ?, ?)", [
+            (1, "Динамо <b>молодці</b>"), (1, "нудний матч"), (2, "Зоря грала краще"),
+        ])
+        self.conn.commit()
+
+    def ids(self, text, **kwargs):
+        return [(r["kind"], r["id"]) for r in search(self.conn, text, **kwargs)[0]]
+
+    def test_fts_query(self):
+        """Test input is reduced to quoted words with a prefix on the last one."""
+        self.assertEqual(fts_query('Динамо "фін'), '"Динамо" "фін"*')
+        self.assertEqual(fts_query("a OR b NEAR(c)"), '"a" "OR" "b" "NEAR" "c"*')
+        self.assertIsNone(fts_query(" -*- "))
+
+    def test_ranking_and_kinds(self):
+        """Test all words must match, prefixes match, and a title hit ranks first."""
+        self.assertEqual(self.ids("динамо фіна"), [("post", 1)])
+        self.assertEqual(set(self.ids("динамо")), {("post", 1), ("post", 2), ("comment", 1)})
+        self.assertEqual(self.ids("зоря", kinds=("comments",)), [("comment", 3)])
+        self.assertEqual(self.ids("фінал")[0], ("post", 1))
+
+    def test_index_follows_writes(self):
+        """Test updates and deletes are reflected in the search index."""
+        self.conn.execute("UPDATE match_comments SET comment_text = 'чудовий матч' WHERE id = 2")
+        self.conn.execute("DELETE FROM posts WHERE id = 2")
+        self.assertEqual(self.ids("нудний"), [])
+        self.assertEqual(self.ids("чудовий"), [("comment", 2)])
+        self.assertEqual(self.ids("розклад"), [])
+
+    def test_snippet_is_escaped(self):
+        """Test user markup is escaped and only the matched words are marked."""
+        snippet = search(self.conn, "молодці", kinds=("comments",))[0][0]["snippet"]
+        self.assertEqual(snippet, "Динамо &lt;b&gt;<mark>молодці</mark>&lt;/b&gt;")
+        self.assertEqual(highlight(None), "")
+
+    def test_uses_fts_index(self):
+        """Test the query is answered by the FTS index and primary-key joins."""
+        plan = " ".join(row["detail"] for row in self.conn.execute(
+            "EXPLAIN QUERY PLAN SELECT c.id FROM match_comments_fts"
+            " JOIN match_comments c ON c.id = match_comments_fts.rowid"
+            " WHERE match_comments_fts MATCH ?", ('"x"',)))
+        self.assertIn("VIRTUAL TABLE INDEX", plan)
+        self.assertIn("USING INTEGER PRIMARY KEY", plan)
+
+
+class TestSearchRoute(DatabaseTestCase):
+    """Test /api/search validation and pagination."""
+
+    def setUp(self):
+        super().setUp()
+        self.conn.executemany("INSERT INTO match_comments (user_id, match_id, comment_text) VALUES (1, 1, ?)",
+                              [(f"гол номер {i}",) for i in range(5)])
+        self.conn.commit()
+        self.make_app(search_routes.bp)
+
+    def test_pages(self):
+        """Test offset pages cover all results once."""
+        seen, offset = [], 0
+        while offset is not None:
+            data = self.client.get("/api/search", query_string={"q": "гол", "limit": 2, "offset": offset}).get_json()
+            seen += [r["id"] for r in data["results"]]
+            offset = data["next_offset"]
+        self.assertEqual(sorted(seen), [1, 2, 3, 4, 5])
+
+    def test_bad_input(self):
+        """Test missing query, unknown type and bad offset are client errors."""
+        for query in ({}, {"q": "гол", "type": "users"}, {"q": "гол", "offset": "-1"}):
+            self.assertEqual(self.client.get("/api/search", query_string=query).status_code, 400, query)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+"""Unit tests for archiving the votes of closed matches."""
+import os
+import sys
+import tempfile
+import unittest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(
+    os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.database import connect
+from utils.migrations import migrate
+from utils.pagination import FIRST_PAGE
+from utils.vote_archive import archive_match, closed_matches_to_archive, restore_match
+from utils.vote_tallies import rebuild_tallies
+
+
+class TestVoteArchive(unittest.TestCase):
+    """Test votes move between user_votes and the archive without changing tallies."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.conn = connect(os.path.join(self.tmp.name, "database.sqlite"))
+        migrate(self.conn)
+        for user_id, match_id, player_id, created_at in (
+                (1, 1, 10, "2026-01-01 10:00:00"), (2, 1, 10, "2026-01-01 10:01:00"),
+                (3, 1, 11, "2026-01-01 10:02:00"), (1, 2, 20, "2026-01-02 10:00:00")):
+            self.conn.execute("INSERT INTO user_votes (user_id, match_id, player_id, created_at)"
+                              " VALUES (?, ?, ?, ?)", (user_id, match_id, player_id, created_at))
+        self.conn.commit()
+
+    def tearDown(self):
+        self.conn.close()
+        self.tmp.cleanup()
+
+    def count(self, table):
+        return self.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+    def tallies(self):
+        return [tuple(row) for row in self.conn.execute(
+            "SELECT match_id, player_id, votes FROM match_vote_tallies ORDER BY match_id, player_id")]
+
+    def test_archive_keeps_tallies(self):
+        """Test archiving empties the hot rows of the match and leaves tallies intact."""
+        before = self.tallies()
+        self.assertEqual(archive_match(self.conn, 1), 3)
+        self.conn.commit()
+        self.assertEqual((self.count("user_votes"), self.count("user_votes_archive")), (1, 3))
+        self.assertEqual(self.tallies(), before)
+        rebuild_tallies(self.conn)
+        self.assertEqual(self.tallies(), before)
+
+    def test_restore(self):
+        """Test a reopened match gets its votes back, still counted once."""
+        before = self.tallies()
+        archive_match(self.conn, 1)
+        self.assertEqual(restore_match(self.conn, 1), 3)
+        self.assertEqual((self.count("user_votes"), self.count("user_votes_archive")), (4, 0))
+        self.assertEqual(self.tallies(), before)
+        # The unique vote per user and match applies again
+        with self.assertRaises(Exception):
+            self.conn.execute("INSERT INTO user_votes (user_id, match_id, player_id) VALUES (1, 1, 11)")
+
+    def test_history_merges_archive(self):
+        """Test the vote history query reads both tables in (created_at, id) order."""
+        archive_match(self.conn, 1)
+        rows = self.conn.execute(
+            """SELECT id, match_id, created_at FROM user_votes WHERE user_id = ? AND (created_at, id) < (?, ?)
+               UNION ALL
+               SELECT id, match_id, created_at FROM user_votes_archive
+               WHERE user_id = ? AND (created_at, id) < (?, ?)
+               ORDER BY created_at DESC, id DESC""",
+            (1, *FIRST_PAGE, 1, *FIRST_PAGE)).fetchall()
+        self.assertEqual([row[1] for row in rows], [2, 1])
+
+    def test_closed_matches_to_archive(self):
+        """Test only closed matches with hot votes are picked for the backfill."""
+        self.conn.executemany("INSERT INTO cached_matches (id, team1, team2, is_active) VALUES (?, 'A', 'B', ?)",
+                              [(1, 0), (2, 1), (3, 0)])
+        self.assertEqual(closed_matches_to_archive(self.conn), [1])
+        archive_match(self.conn, 1)
+        self.assertEqual(closed_matches_to_archive(self.conn), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
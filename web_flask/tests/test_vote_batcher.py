@@ -0,0 +1,74 @@
+"""Unit tests for write-behind vote batching."""
+import os
+import sys
+import threading
+import time
+import unittest
+from unittest import mock
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(
+    os.path.join(os.path.dirname(__file__), '..')))
+
+from utils import vote_batcher
+from utils.vote_batcher import VoteBatcher
+
+
+class TestVoteBatcher(unittest.TestCase):
+    """Test coalescing of concurrent votes."""
+
+    def test_concurrent_votes_coalesced_with_own_results(self):
+        """Test concurrent votes share batches and each gets its own result."""
+        batches = []
+
+        def send_batch(votes):
+            batches.append(len(votes))
+            time.sleep(0.02)
+            return [(v["player_id"] % 2 == 0, {"player_id": v["player_id"]}) for v in votes]
+
+        batcher = VoteBatcher(send_batch, window=0.05, max_batch=100, senders=2)
+        results = {}
+        start = threading.Barrier(40)
+
+        def worker(player_id):
+            start.wait()
+            results[player_id] = batcher.submit(1, player_id, timeout=5)
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(40)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(sum(batches), 40)
+        self.assertLess(len(batches), 10)
+        for player_id, (success, data) in results.items():
+            self.assertEqual(success, player_id % 2 == 0)
+            self.assertEqual(data["player_id"], player_id)
+
+    def test_send_error_reported_per_vote(self):
+        """Test a failing batch request fails each vote instead of hanging."""
+        def send_batch(votes):
+            raise RuntimeError("backend down")
+
+        batcher = VoteBatcher(send_batch, window=0.01, max_batch=10)
+        success, data = batcher.submit(1, 2, timeout=5)
+        self.assertFalse(success)
+        self.assertIn("backend down", data["message"])
+
+    def test_fallback_without_batch_endpoint(self):
+        """Test votes are sent one by one when the backend lacks /votes/batch."""
+        def fake_post(endpoint, payload):
+            if endpoint == "/votes/batch":
+                return True, {"error": "Route not found"}
+            return True, {"status": "success", "message": "ok"}
+
+        with mock.patch("utils.api_client._post", side_effect=fake_post) as post:
+            results = vote_batcher.send_votes(
+                [{"match_id": 1, "player_id": 2}, {"match_id": 1, "player_id": 3}])
+        self.assertEqual(post.call_count, 3)
+        self.assertTrue(all(success for success, _ in results))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+"""Unit tests for the durable vote outbox."""
+import os
+import sqlite3
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(
+    os.path.join(os.path.dirname(__file__), '..')))
+
+from utils import vote_outbox
+from utils.database import init_user_db
+from utils.vote_archive import archive_match
+from utils.vote_outbox import OutboxReplayer, enqueue, outbox_stats
+
+
+class TestVoteOutbox(unittest.TestCase):
+    """Test outbox replay, backoff and rejection handling."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp.name, "database.sqlite")
+        with mock.patch("utils.database.DB_PATH", self.db_path):
+            init_user_db()
+        self.db = sqlite3.connect(self.db_path)
+        self.db.row_factory = sqlite3.Row
+        for user_id in (1, 2, 3):
+            enqueue(self.db, user_id, 7, 10 + user_id)
+        enqueue(self.db, 1, 7, 99)  # same user and match: ignored
+        self.db.commit()
+        self.replayer = OutboxReplayer(self.db_path, interval=1, batch_size=10,
+                                       max_backoff=60, lease=10)
+
+    def tearDown(self):
+        self.db.close()
+        self.tmp.cleanup()
+
+    def test_backoff_when_backend_unavailable(self):
+        """Test unreachable backend keeps votes pending with a later retry."""
+        down = (False, {"status": "error", "unavailable": True})
+        with mock.patch.object(vote_outbox, "send_votes", return_value=[down] * 3) as send:
+            self.assertEqual(self.replayer.replay_once(), 3)
+            self.assertEqual(self.replayer.replay_once(), 0)
+        self.assertEqual(send.call_count, 1)
+        stats = outbox_stats(self.db)
+        self.assertEqual(stats["pending"], 3)
+        self.assertEqual(stats["max_attempts"], 1)
+        self.assertGreater(stats["next_attempt_in"], 0)
+
+    def test_replay_sends_keys_and_clears_outbox(self):
+        """Test replayed votes carry idempotency keys and leave the outbox."""
+        def send(votes):
+            self.assertEqual([v["vote_key"] for v in votes], ["1:7", "2:7", "3:7"])
+            return [(True, {"status": "success"}),
+                    (True, {"status": "success", "duplicate": True}),
+                    (False, {"status": "error", "message": "Матч не знайдено або вже завершено"})]
+
+        with mock.patch.object(vote_outbox, "send_votes", side_effect=send):
+            self.replayer.replay_once()
+        stats = outbox_stats(self.db)
+        self.assertEqual((stats["pending"], stats["rejected"]), (0, 1))
+        self.assertEqual(self.replayer.stats()["duplicates"], 1)
+
+    def seed_votes(self):
+        insert = "INSERT INTO user_votes (user_id, match_id, player_id) VALUES (?, ?, ?)"
+        self.db.executemany(insert, [(3, 7, 13), (4, 7, 13)])
+        archive_match(self.db, 7)
+        self.db.executemany(insert, [(1, 7, 11), (2, 7, 12)])
+        self.db.commit()
+
+    def local_votes(self):
+        votes = self.db.execute(
+            """SELECT user_id FROM user_votes UNION ALL SELECT user_id FROM user_votes_archive
+               ORDER BY user_id""").fetchall()
+        tallies = self.db.execute(
+            "SELECT player_id, votes FROM match_vote_tallies WHERE match_id = 7 ORDER BY player_id").fetchall()
+        return [row[0] for row in votes], [tuple(row) for row in tallies]
+
+    def test_rejected_vote_dropped_locally(self):
+        """Test a vote rejected as never counted leaves user_votes (or the archive) and the tallies."""
+        self.seed_votes()
+        rejected = (False, {"status": "error", "message": "Гравця не знайдено"})
+        with mock.patch.object(vote_outbox, "send_votes",
+                               return_value=[(True, {"status": "success"}), rejected, rejected]):
+            self.replayer.replay_once()
+        self.assertEqual(self.local_votes(), ([1, 4], [(11, 1), (13, 1)]))
+        self.assertEqual(outbox_stats(self.db)["rejected"], 2)
+
+    def test_closed_match_rejection_kept_locally(self):
+        """Test a vote rejected because the match closed stays local and in the outbox for review."""
+        self.seed_votes()
+        rejected = (False, {"status": "error", "message": "Матч не знайдено або вже завершено"})
+        with mock.patch.object(vote_outbox, "send_votes",
+                               return_value=[(True, {"status": "success"}), rejected, rejected]):
+            self.replayer.replay_once()
+        self.assertEqual(self.local_votes(), ([1, 2, 3, 4], [(11, 1), (12, 1), (13, 2)]))
+        rows = self.db.execute("SELECT status, last_error FROM vote_outbox ORDER BY id").fetchall()
+        self.assertEqual([row["status"] for row in rows], ["rejected", "rejected"])
+
+if __name__ == '__main__':
+    unittest.main()
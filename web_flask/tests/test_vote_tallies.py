@@ -0,0 +1,92 @@
+"""Unit tests for the materialized match vote tallies."""
+import os
+import sys
+import tempfile
+import unittest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(
+    os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.database import connect
+from utils.migrations import migrate
+from utils.vote_tallies import rebuild_tallies
+
+
+class TestVoteTallies(unittest.TestCase):
+    """Test the user_votes triggers keep match_vote_tallies exact."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.conn = connect(os.path.join(self.tmp.name, "database.sqlite"))
+        migrate(self.conn)
+
+    def tearDown(self):
+        self.conn.close()
+        self.tmp.cleanup()
+
+    def vote(self, user_id, match_id, player_id):
+        self.conn.execute("INSERT INTO user_votes (user_id, match_id, player_id) VALUES (?, ?, ?)",
+                          (user_id, match_id, player_id))
+
+    def tallies(self):
+        rows = self.conn.execute("SELECT match_id, player_id, votes FROM match_vote_tallies"
+                                 " ORDER BY match_id, player_id").fetchall()
+        return [tuple(row) for row in rows]
+
+    def expected(self):
+        rows = self.conn.execute("SELECT match_id, player_id, COUNT(*) FROM user_votes"
+                                 " GROUP BY match_id, player_id ORDER BY match_id, player_id").fetchall()
+        return [tuple(row) for row in rows]
+
+    def test_insert(self):
+        """Test each vote increments its player's tally."""
+        self.vote(1, 1, 10)
+        self.vote(2, 1, 10)
+        self.vote(3, 1, 11)
+        self.vote(1, 2, 20)
+        self.assertEqual(self.tallies(), [(1, 10, 2), (1, 11, 1), (2, 20, 1)])
+
+    def test_delete_and_update(self):
+        """Test removed and moved votes adjust tallies and drop empty rows."""
+        self.vote(1, 1, 10)
+        self.vote(2, 1, 10)
+        self.vote(3, 1, 11)
+        self.conn.execute("DELETE FROM user_votes WHERE user_id = 3")
+        self.conn.execute("UPDATE user_votes SET player_id = 12 WHERE user_id = 2")
+        self.assertEqual(self.tallies(), [(1, 10, 1), (1, 12, 1)])
+        self.assertEqual(self.tallies(), self.expected())
+
+    def test_rollback(self):
+        """Test a rolled-back vote leaves no tally behind."""
+        self.vote(1, 1, 10)
+        self.conn.commit()
+        self.vote(2, 1, 10)
+        self.conn.rollback()
+        self.assertEqual(self.tallies(), [(1, 10, 1)])
+
+    def test_rebuild(self):
+        """Test rebuild repairs drift, for one match or all of them."""
+        self.vote(1, 1, 10)
+        self.vote(2, 2, 20)
+        self.conn.execute("UPDATE match_vote_tallies SET votes = 99")
+        self.assertEqual(rebuild_tallies(self.conn, 1), 1)
+        self.assertEqual(self.tallies(), [(1, 10, 1), (2, 20, 99)])
+        self.assertEqual(rebuild_tallies(self.conn), 2)
+        self.assertEqual(self.tallies(), self.expected())
+
+    def test_migration_backfills(self):
+        """Test votes cast before the migration are counted."""
+        self.conn.execute("DROP TABLE match_vote_tallies")
+        self.conn.execute("PRAGMA user_version=4")
+        for name in ("insert", "delete", "update"):
+            self.conn.execute(f"DROP TRIGGER trg_user_votes_tally_{name}")
+        self.vote(1, 1, 10)
+        self.vote(2, 1, 10)
+        self.conn.commit()
+        self.assertIn(5, migrate(self.conn))
+        self.assertEqual(self.tallies(), [(1, 10, 2)])
+
+
+if __name__ == '__main__':
+    unittest.main()
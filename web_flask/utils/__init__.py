@@ -1,12 +1,12 @@
 """Utility functions and helpers."""
-from .api_client import _get, _post, _invalidate_cache
+from .api_client import _get, _get_many, _post, _invalidate_cache
 from .database import get_db, close_db, init_user_db
 from .decorators import login_required, admin_required
 from .helpers import _normalize, get_team_by_name, build_roster
 from .teams import TEAMS_DATA, TEAM_BY_SLUG, TEAM_LOOKUP, _load_teams_from_api, sync_teams_and_players
 
 __all__ = [
-    '_get', '_post', '_invalidate_cache',
+    '_get', '_get_many', '_post', '_invalidate_cache',
     'get_db', 'close_db', 'init_user_db',
     'login_required', 'admin_required',
     '_normalize', 'get_team_by_name', 'build_roster',
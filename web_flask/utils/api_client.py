@@ -1,29 +1,79 @@
 """API client for communicating with the C++ backend."""
 import json
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, wait
 from typing import Any, Dict, List, Tuple
 
 import requests
 
-from config import API_BASE_URL, REQUEST_TIMEOUT, REQUEST_TIMEOUT_POST, CACHE_TTL
+from config import (
+    API_BASE_URL, REQUEST_TIMEOUT, REQUEST_TIMEOUT_POST, CACHE_TTL,
+    API_CACHE_MAX_ENTRIES, API_CACHE_TTLS,
+    API_HOT_ENDPOINTS, API_REFRESH_INTERVAL, API_MAX_STALENESS,
+    API_SHARED_CACHE_ENABLED, API_SHARED_CACHE_PATH, API_SHARED_CACHE_MAX_ENTRIES,
+    API_INVALIDATION_POLL_INTERVAL,
+    API_FANOUT_WORKERS, API_FANOUT_DEADLINE,
+    API_BREAKER_FAILURE_THRESHOLD, API_BREAKER_RESET_TIMEOUT,
+    API_BULKHEAD_MAX_CONCURRENT, API_BULKHEAD_WAIT,
+)
+from utils import http_pool
+from utils.cache import TTLCache, Versioned
+from utils.circuit_breaker import EndpointGuards, CircuitOpenError, BulkheadFullError
+from utils.refresher import BackgroundRefresher
+from utils.shared_cache import SharedCache
+from utils.http_pool import timeout_for, get_pool_stats
+from utils.invalidation import VOTES, MATCH, parse_key, subscribe
+from utils.logger import log_payload
 
-# Global API cache
-_api_cache: Dict[str, Tuple[float, Any]] = {}
+# Global API cache (bounded LRU, per-endpoint TTL, coalesced misses)
+_api_cache = TTLCache(API_CACHE_MAX_ENTRIES, CACHE_TTL, API_CACHE_TTLS)
 
-# Global stats cache
-_global_stats_cache: Tuple[float, Dict[str, Any]] | None = None
-STATS_CACHE_TTL = 10.0
+# Optional node-wide tier behind _api_cache, shared by all worker processes
+_shared_cache = (SharedCache(API_SHARED_CACHE_PATH, API_SHARED_CACHE_MAX_ENTRIES)
+                 if API_SHARED_CACHE_ENABLED else None)
 
+# Position in the shared invalidation log applied to _api_cache
+_invalidation_lock = threading.Lock()
+_invalidation_state: Dict[str, Any] = {"seq": None, "polled_at": 0.0}
 
-def _get(endpoint: str, default: Dict[str, Any] | List[Any] | None = None) -> Any:
-    """Make a GET request to the API with caching."""
+# API endpoints whose payload depends on each kind of resource
+_ENDPOINTS_BY_RESOURCE = {
+    VOTES: ("/votes/{id}", "/stats", "/match-stats", "/players"),
+    MATCH: ("/votes/{id}", "/stats", "/match-stats", "/matches-page"),
+}
+
+# Keeps hot endpoints warm; serves stale entries up to API_MAX_STALENESS seconds old
+_refresher = BackgroundRefresher(
+    _api_cache,
+    lambda endpoint: _load(endpoint, _api_cache.ttl_for(endpoint) * _refresher.refresh_ahead),
+    interval=API_REFRESH_INTERVAL, max_staleness=API_MAX_STALENESS)
+_refresher.register(API_HOT_ENDPOINTS)
+
+# Circuit breaker and concurrency limit per endpoint group
+_guards = EndpointGuards(
+    failure_threshold=API_BREAKER_FAILURE_THRESHOLD,
+    reset_timeout=API_BREAKER_RESET_TIMEOUT,
+    max_concurrent=API_BULKHEAD_MAX_CONCURRENT,
+    wait=API_BULKHEAD_WAIT)
+
+# Conditional GET counters (304 reuses vs. full downloads)
+_revalidation_lock = threading.Lock()
+_revalidation_stats: Dict[str, int] = {"not_modified": 0, "downloaded": 0}
+
+# Worker threads for concurrent multi-endpoint GETs (_get_many)
+_fanout_executor = ThreadPoolExecutor(
+    max_workers=API_FANOUT_WORKERS, thread_name_prefix="api-fanout")
+
+
+def _normalize_endpoint(endpoint: str) -> str:
+    """Normalize endpoint to a path relative to API_BASE_URL."""
     # Ensure endpoint starts with /
     if not endpoint.startswith("/"):
         endpoint = "/" + endpoint
 
     # API_BASE_URL is http://cpp_backend:8080/api
     # If endpoint already has /api prefix, don't add it again
-    # Just pass endpoint as-is to be appended to base URL
     # For example: _get("/api/stats") -> http://cpp_backend:8080/api + /api/stats (WRONG)
     # We need to remove /api from endpoint: /api/stats -> /stats
     # Then: http://cpp_backend:8080/api + /stats = http://cpp_backend:8080/api/stats (CORRECT)
@@ -34,108 +84,313 @@ def _get(endpoint: str, default: Dict[str, Any] | List[Any] | None = None) -> An
         endpoint = endpoint[4:]  # Remove "/api" prefix: "/api" -> ""
         if not endpoint.startswith("/"):
             endpoint = "/" + endpoint
+    return endpoint
 
-    now = time.time()
-    cached = _api_cache.get(endpoint)
-    if cached and now - cached[0] <= CACHE_TTL:
-        return cached[1]
 
-    max_retries = 2
-    last_error = None
+def _request(method: str, endpoint: str, **kwargs: Any) -> requests.Response:
+    """Send a raw request to the backend through the shared pooled session.
 
-    for attempt in range(max_retries):
+    Raises CircuitOpenError / BulkheadFullError when the endpoint is guarded off.
+    """
+    endpoint = _normalize_endpoint(endpoint)
+    default_timeout = REQUEST_TIMEOUT if method == "GET" else REQUEST_TIMEOUT_POST
+    kwargs.setdefault("timeout", timeout_for(endpoint, default_timeout))
+    return _send(method, endpoint, **kwargs)
+
+
+def _send(method: str, endpoint: str, **kwargs: Any) -> requests.Response:
+    """Send a request through the endpoint's bulkhead and circuit breaker."""
+    breaker, bulkhead = _guards.get(endpoint, method)
+    if not bulkhead.acquire():
+        raise BulkheadFullError(
+            f"Too many concurrent requests to {_guards.group(endpoint, method)}")
+    try:
+        if not breaker.allow():
+            raise CircuitOpenError(
+                f"Circuit open for {_guards.group(endpoint, method)}")
         try:
-            full_url = f"{API_BASE_URL}{endpoint}"
-            try:
-                from flask import current_app
-                current_app.logger.info(f"API GET request: {full_url}")
-            except:
-                pass
-            response = requests.get(full_url, timeout=REQUEST_TIMEOUT)
-            response.raise_for_status()
-            data = response.json()
-            try:
-                from flask import current_app
-                current_app.logger.info(f"API GET response: {data}")
-            except:
-                pass
-            _api_cache[endpoint] = (now, data)
-            return data
-        except requests.ConnectionError as exc:
-            last_error = f"Backend not available at {API_BASE_URL}"
-            try:
-                from flask import current_app
-                current_app.logger.warning(
-                    "API GET %s connection error (attempt %d/%d)", endpoint, attempt + 1, max_retries)
-            except:
-                pass
-            if attempt < max_retries - 1:
-                import time as time_module
-                time_module.sleep(0.3)
-                continue
-        except requests.Timeout as exc:
-            last_error = f"Timeout after {REQUEST_TIMEOUT}s"
-            try:
-                from flask import current_app
-                current_app.logger.warning(
-                    "API GET %s timeout (attempt %d/%d)", endpoint, attempt + 1, max_retries)
-            except:
-                pass
-            if attempt < max_retries - 1:
-                continue
-        except requests.HTTPError as exc:
-            try:
-                from flask import current_app
-                current_app.logger.warning(
-                    "API GET %s HTTP %s", endpoint, exc.response.status_code)
-            except:
-                pass
-            return default if default is not None else {}
+            response = http_pool.request(
+                method, f"{API_BASE_URL}{endpoint}", **kwargs)
         except requests.RequestException as exc:
+            breaker.record_failure(exc.__class__.__name__)
+            raise
+        except BaseException:
+            breaker.release()
+            raise
+        if response.status_code >= 500:
+            breaker.record_failure(f"HTTP {response.status_code}")
+        else:
+            breaker.record_success()
+        return response
+    finally:
+        bulkhead.release()
+
+
+class _FetchError(Exception):
+    """Backend GET failed; the caller should fall back to its default."""
+
+
+def _get(endpoint: str, default: Dict[str, Any] | List[Any] | None = None) -> Any:
+    """Make a GET request to the API with caching."""
+    try:
+        return _cached_get(endpoint)
+    except _FetchError:
+        return default if default is not None else {}
+
+
+def _cached_get(endpoint: str) -> Any:
+    """Get an endpoint through the cache, raising _FetchError on failure."""
+    endpoint = _normalize_endpoint(endpoint)
+    if _shared_cache is not None:
+        _apply_shared_invalidations()
+        _warm_from_shared(endpoint)
+
+    # Hot endpoints are served from cache (even if stale) while refreshed in background
+    if _refresher.is_hot(endpoint):
+        served, value = _refresher.serve(endpoint)
+        if served:
+            return value
+
+    try:
+        # Concurrent misses for the same endpoint share one backend request
+        return _api_cache.get_or_load(endpoint, lambda: _load(endpoint))
+    except _FetchError:
+        # Backend failing or guarded off: serve whatever we still have
+        found, _, value = _api_cache.peek(endpoint)
+        if found:
+            return value
+        raise
+
+
+def _peek_cached(endpoint: str) -> Any:
+    """Get the locally cached document for an endpoint regardless of TTL (None if absent)."""
+    endpoint = _normalize_endpoint(endpoint)
+    if _shared_cache is not None:
+        _apply_shared_invalidations()
+    return _api_cache.peek(endpoint)[2]
+
+
+def _apply_shared_invalidations() -> None:
+    """Drop local entries invalidated by other workers (polled at most every interval)."""
+    now = time.time()
+    with _invalidation_lock:
+        if now - _invalidation_state["polled_at"] < API_INVALIDATION_POLL_INTERVAL:
+            return
+        _invalidation_state["polled_at"] = now
+        seq = _invalidation_state["seq"]
+    last_seq, keys = _shared_cache.invalidations_since(seq)
+    for key in keys:
+        _api_cache.invalidate(key)
+    with _invalidation_lock:
+        _invalidation_state["seq"] = max(last_seq, _invalidation_state["seq"] or 0)
+
+
+def _warm_from_shared(endpoint: str) -> None:
+    """Seed a missing local entry from the shared tier, keeping its age."""
+    if _api_cache.peek_version(endpoint)[0]:
+        return
+    found, age, value, version = _shared_cache.get(endpoint)
+    if found:
+        _api_cache.set(endpoint, value, version=version, age=age)
+
+
+def _load(endpoint: str, max_age: float | None = None) -> Versioned:
+    """Load an endpoint from the shared tier if younger than max_age, else from the backend."""
+    if _shared_cache is None:
+        return _fetch(endpoint)
+    if max_age is None:
+        max_age = _api_cache.ttl_for(endpoint)
+    found, age, value, version = _shared_cache.get(endpoint)
+    if found and age < max_age:
+        return Versioned(value, version, age)
+    started = time.time()
+    loaded = _fetch(endpoint)
+    # Not stored if a worker invalidated the endpoint while it was being fetched
+    _shared_cache.set(endpoint, loaded.value, loaded.version, loaded_since=started)
+    return loaded
+
+
+def _revalidate(endpoint: str, known: Versioned | None = None) -> Versioned:
+    """Reload an endpoint now (If-None-Match on the cached ETag) and return it with its ETag.
+
+    ``known`` is a copy the caller kept: it seeds the revalidation when the
+    cached entry was invalidated or evicted, so an unchanged document is
+    still answered with 304 instead of downloaded again.
+    """
+    endpoint = _normalize_endpoint(endpoint)
+    if known is not None and known.version and not _api_cache.peek_version(endpoint)[0]:
+        # Already expired: only its ETag is used, readers still load a fresh copy
+        _api_cache.set(endpoint, known.value, version=known.version, age=_api_cache.ttl_for(endpoint))
+    value = _api_cache.get_or_load(endpoint, lambda: _load(endpoint), force=True)
+    return Versioned(value, _api_cache.peek_version(endpoint)[1])
+
+
+def _get_many(calls: Dict[str, Tuple[str, Any]],
+              deadline: float | None = None) -> Tuple[Dict[str, Any], Dict[str, str]]:
+    """Make several cached GET requests concurrently.
+
+    ``calls`` maps a result name to ``(endpoint, default)``. All requests share
+    one deadline (API_FANOUT_DEADLINE seconds by default). Returns
+    ``(results, errors)``: a failed or late request gets its default in
+    ``results`` and a reason in ``errors``; the others are unaffected.
+    """
+    if deadline is None:
+        deadline = API_FANOUT_DEADLINE
+
+    try:
+        from flask import current_app
+        app = current_app._get_current_object()
+    except Exception:
+        app = None
+
+    def run(endpoint: str) -> Any:
+        # Keep app logging available inside worker threads
+        if app is None:
+            return _cached_get(endpoint)
+        with app.app_context():
+            return _cached_get(endpoint)
+
+    futures = {name: _fanout_executor.submit(run, endpoint)
+               for name, (endpoint, _) in calls.items()}
+    wait(futures.values(), timeout=deadline)
+
+    results: Dict[str, Any] = {}
+    errors: Dict[str, str] = {}
+    for name, future in futures.items():
+        default = calls[name][1]
+        if not future.done():
+            results[name] = default
+            errors[name] = f"Deadline of {deadline}s exceeded"
+            continue
+        try:
+            results[name] = future.result()
+        except Exception as exc:
+            results[name] = default
+            errors[name] = str(exc) or exc.__class__.__name__
+
+    if errors:
+        try:
+            from flask import current_app
+            current_app.logger.warning("API fan-out partial failure: %s", errors)
+        except:
+            pass
+    return results, errors
+
+
+def _fetch(endpoint: str) -> Versioned:
+    """Fetch an endpoint from the backend, raising _FetchError on failure.
+
+    Sends If-None-Match when the endpoint is already cached and reuses the
+    cached body on 304 Not Modified.
+    """
+    full_url = f"{API_BASE_URL}{endpoint}"
+    timeout = timeout_for(endpoint, REQUEST_TIMEOUT)
+    try:
+        try:
+            from flask import current_app
+            current_app.logger.info("API GET request: %s", full_url)
+        except:
+            pass
+        # Revalidate an existing entry instead of re-downloading it
+        found, etag, cached_data = _api_cache.peek_version(endpoint)
+        headers = {"If-None-Match": etag} if found and etag else {}
+        response = _send("GET", endpoint, headers=headers, timeout=timeout)
+        if response.status_code == 304 and headers:
+            with _revalidation_lock:
+                _revalidation_stats["not_modified"] += 1
             try:
                 from flask import current_app
-                current_app.logger.warning("API GET %s failed", endpoint)
+                current_app.logger.info("API GET not modified: %s", full_url)
             except:
                 pass
-            return default if default is not None else {}
-
-    return default if default is not None else {}
+            return Versioned(cached_data, etag)
+        if response.status_code == 304:
+            # Nothing cached to reuse: a 304 without If-None-Match has no body to parse
+            raise _FetchError("HTTP 304 without a cached entry")
+        response.raise_for_status()
+        data = response.json()
+        with _revalidation_lock:
+            _revalidation_stats["downloaded"] += 1
+        try:
+            from flask import current_app
+            log_payload(current_app.logger, "API GET response", endpoint, data)
+        except:
+            pass
+        return Versioned(data, response.headers.get("ETag"))
+    except (CircuitOpenError, BulkheadFullError) as exc:
+        try:
+            from flask import current_app
+            current_app.logger.warning("API GET %s rejected: %s", endpoint, exc)
+        except:
+            pass
+        raise _FetchError(str(exc))
+    except requests.ConnectionError as exc:
+        try:
+            from flask import current_app
+            current_app.logger.warning("API GET %s connection error", endpoint)
+        except:
+            pass
+        raise _FetchError(f"Backend not available at {API_BASE_URL}")
+    except requests.Timeout as exc:
+        try:
+            from flask import current_app
+            current_app.logger.warning("API GET %s timeout", endpoint)
+        except:
+            pass
+        raise _FetchError(f"Timeout after {timeout}s")
+    except requests.HTTPError as exc:
+        try:
+            from flask import current_app
+            current_app.logger.warning(
+                "API GET %s HTTP %s", endpoint, exc.response.status_code)
+        except:
+            pass
+        raise _FetchError(f"HTTP {exc.response.status_code}")
+    except (requests.RequestException, ValueError) as exc:
+        try:
+            from flask import current_app
+            current_app.logger.warning("API GET %s failed", endpoint)
+        except:
+            pass
+        raise _FetchError("Request failed")
 
 
 def _post(endpoint: str, payload: Dict[str, Any]) -> Tuple[bool, Dict[str, Any]]:
-    """Make a POST request to the API (no retry - backend is slow)."""
-    # Ensure endpoint starts with /
-    if not endpoint.startswith("/"):
-        endpoint = "/" + endpoint
+    """Make a POST request to the API (no retry - backend is slow).
 
-    # Remove /api prefix if present (API_BASE_URL already contains it)
-    if endpoint.startswith("/api/"):
-        endpoint = endpoint[4:]  # Remove "/api" prefix, keep the slash
-    elif endpoint.startswith("/api"):
-        endpoint = endpoint[4:]  # Remove "/api" prefix
-        if not endpoint.startswith("/"):
-            endpoint = "/" + endpoint
+    Failures where the backend did not answer carry ``"unavailable": True``.
+    """
+    endpoint = _normalize_endpoint(endpoint)
 
     try:
         full_url = f"{API_BASE_URL}{endpoint}"
         try:
             from flask import current_app
-            current_app.logger.info(f"API POST request: {full_url}")
+            current_app.logger.info("API POST request: %s", full_url)
         except:
             pass
-        response = requests.post(
-            full_url,
+        response = _send(
+            "POST",
+            endpoint,
             json=payload,
-            timeout=REQUEST_TIMEOUT_POST  # Use longer timeout for POST
+            timeout=timeout_for(endpoint, REQUEST_TIMEOUT_POST)
         )
         response.raise_for_status()
         data = response.json()
         try:
             from flask import current_app
-            current_app.logger.info(f"API POST response: {data}")
+            log_payload(current_app.logger, "API POST response", endpoint, data)
         except:
             pass
         return True, data
+    except (CircuitOpenError, BulkheadFullError) as exc:
+        try:
+            from flask import current_app
+            current_app.logger.error("API POST %s rejected: %s", endpoint, exc)
+        except:
+            pass
+        return False, {"status": "error", "message": "Backend temporarily unavailable, try again later",
+                       "unavailable": True}
     except requests.ConnectionError as exc:
         error_msg = f"Backend server is not available at {API_BASE_URL}"
         try:
@@ -144,7 +399,7 @@ def _post(endpoint: str, payload: Dict[str, Any]) -> Tuple[bool, Dict[str, Any]]
                 "API POST %s connection error: %s", endpoint, exc)
         except:
             pass
-        return False, {"status": "error", "message": error_msg}
+        return False, {"status": "error", "message": error_msg, "unavailable": True}
     except requests.Timeout as exc:
         error_msg = f"Request timeout after {REQUEST_TIMEOUT_POST}s - backend is too slow"
         try:
@@ -152,7 +407,7 @@ def _post(endpoint: str, payload: Dict[str, Any]) -> Tuple[bool, Dict[str, Any]]
             current_app.logger.error("API POST %s timeout", endpoint)
         except:
             pass
-        return False, {"status": "error", "message": error_msg}
+        return False, {"status": "error", "message": error_msg, "unavailable": True}
     except requests.HTTPError as exc:
         try:
             from flask import current_app
@@ -160,35 +415,74 @@ def _post(endpoint: str, payload: Dict[str, Any]) -> Tuple[bool, Dict[str, Any]]
                 "API POST %s HTTP error %s", endpoint, exc.response.status_code)
         except:
             pass
-        return False, {"status": "error", "message": f"Server error: {exc.response.status_code}"}
+        return False, {"status": "error", "message": f"Server error: {exc.response.status_code}",
+                       "unavailable": exc.response.status_code >= 500}
     except requests.RequestException as exc:
         try:
             from flask import current_app
             current_app.logger.error("API POST %s failed", endpoint)
         except:
             pass
-        return False, {"status": "error", "message": "Request failed"}
+        return False, {"status": "error", "message": "Request failed", "unavailable": True}
 
 
 def _invalidate_cache(*endpoints: str) -> None:
     """Invalidate cache for specified endpoints."""
-    for ep in endpoints:
-        _api_cache.pop(ep, None)
+    normalized = [_normalize_endpoint(ep) for ep in endpoints]
+    for endpoint in normalized:
+        _api_cache.invalidate(endpoint)
+    if _shared_cache is not None and normalized:
+        _shared_cache.invalidate(*normalized)
 
 
-def get_cached_stats():
-    """Get cached stats or fetch new ones."""
-    global _global_stats_cache
-    now = time.time()
+@subscribe
+def _on_resources_changed(keys: frozenset) -> None:
+    """Invalidate cached endpoints built from the changed resources."""
+    endpoints = set()
+    for key in keys:
+        kind, resource_id = parse_key(key)
+        for template in _ENDPOINTS_BY_RESOURCE.get(kind, ()):
+            if "{id}" in template and resource_id is None:
+                continue
+            endpoints.add(template.format(id=resource_id))
+    _invalidate_cache(*sorted(endpoints))
+
+
+def get_breaker_stats() -> Dict[str, Any]:
+    """Get circuit breaker and bulkhead state per endpoint group."""
+    return _guards.snapshot()
+
 
-    if _global_stats_cache and now - _global_stats_cache[0] <= STATS_CACHE_TTL:
-        return _global_stats_cache[1]
+def reset_breakers() -> None:
+    """Close all circuit breakers."""
+    _guards.reset()
 
+
+def get_cache_stats() -> Dict[str, Any]:
+    """Get API cache and conditional GET counters."""
+    stats = _api_cache.stats()
+    with _revalidation_lock:
+        stats.update(_revalidation_stats)
+    if _shared_cache is not None:
+        stats["shared"] = _shared_cache.stats()
+    return stats
+
+
+def start_refresher() -> None:
+    """Start keeping hot endpoints warm in this process."""
+    _refresher.start()
+
+
+def get_refresher_stats() -> Dict[str, Any]:
+    """Get served data age for hot endpoints."""
+    return _refresher.stats()
+
+
+def get_cached_stats():
+    """Get global stats (served from the background-refreshed /stats entry)."""
     try:
-        stats = _get(
+        return _get(
             "/stats", default={"total_players": 0, "total_matches": 0, "total_votes": 0})
-        _global_stats_cache = (now, stats)
-        return stats
     except Exception as e:
         try:
             from flask import current_app
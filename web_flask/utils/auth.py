@@ -0,0 +1,84 @@
+"""Request auth context: the logged-in user, resolved once per request through a bounded user cache."""
+from typing import Any, Dict
+
+from flask import g, session
+
+from config import USER_CACHE_MAX_ENTRIES, USER_CACHE_TTL
+from utils.cache import TTLCache
+
+# user:<id> -> {id, username, role, auth_version} (None for a deleted user)
+_users = TTLCache(max_entries=USER_CACHE_MAX_ENTRIES, default_ttl=USER_CACHE_TTL)
+
+
+def _key(user_id: Any) -> str:
+    return f"user:{int(user_id)}"
+
+
+def _load_user(user_id: Any) -> Dict[str, Any] | None:
+    from utils.database import get_db
+    row = get_db().execute(
+        "SELECT id, username, role, auth_version FROM users WHERE id = ?", (user_id,)
+    ).fetchone()
+    return dict(row) if row else None
+
+
+def get_user(user_id: Any) -> Dict[str, Any] | None:
+    """Get a user record from the cache, loading it from the database on a miss."""
+    return _users.get_or_load(_key(user_id), lambda: _load_user(user_id))
+
+
+def invalidate_user(user_id: Any) -> None:
+    """Drop a cached user after its role or password changed (this process).
+
+    Other processes see the change within USER_CACHE_TTL seconds.
+    """
+    _users.invalidate(_key(user_id))
+    if g and g.get("user") and g.user["id"] == int(user_id):
+        g.pop("user")
+
+
+def current_user() -> Dict[str, Any] | None:
+    """Get the logged-in user ({id, username, role}) or None, resolved at most once per request."""
+    if "user" in g:
+        return g.user
+    user = None
+    user_id = session.get("user_id")
+    if user_id:
+        try:
+            record = get_user(user_id)
+        except Exception as e:
+            record = None
+            try:
+                from flask import current_app
+                current_app.logger.error(f"Error loading user: {e}")
+            except:
+                pass
+        else:
+            # Deleted, or the password changed after this session logged in
+            if record is None or record["auth_version"] != session.get("auth_version", 0):
+                session.clear()
+                record = None
+        if record is not None:
+            user = {"id": record["id"], "username": record["username"], "role": record["role"]}
+    g.user = user
+    return user
+
+
+def login_user(user: Dict[str, Any]) -> None:
+    """Start a session for a user row with id, username, role and auth_version."""
+    session.clear()
+    session["user_id"] = user["id"]
+    session["auth_version"] = user["auth_version"]
+    session.permanent = True
+    g.user = {"id": user["id"], "username": user["username"], "role": user["role"]}
+
+
+def logout_user() -> None:
+    """End the session."""
+    session.clear()
+    g.user = None
+
+
+def get_user_cache_stats() -> Dict[str, Any]:
+    """Get hit/miss/eviction counters of the user cache."""
+    return _users.stats()
@@ -0,0 +1,174 @@
+"""Bounded, thread-safe LRU cache with per-entry TTL and request coalescing."""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, NamedTuple, Tuple
+
+
+class Versioned(NamedTuple):
+    """Loader result carrying a version tag (e.g. an HTTP ETag) to store with it.
+
+    ``age`` is how old the value already is (e.g. when taken from a shared tier).
+    """
+    value: Any
+    version: str | None
+    age: float = 0.0
+
+
+class _InFlight:
+    """A load in progress that concurrent callers wait on."""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value: Any = None
+        self.error: BaseException | None = None
+        # Set when the key is invalidated mid-load: the (pre-write) result is not stored
+        self.invalidated = False
+
+
+class TTLCache:
+    """LRU cache whose entries expire after a per-key TTL.
+
+    ``get_or_load`` coalesces concurrent misses for the same key: one caller
+    runs the loader, the others wait for its result (or its exception). An
+    ``invalidate`` during a load keeps that load's result out of the cache,
+    and later callers start a new load.
+    """
+
+    def __init__(self, max_entries: int, default_ttl: float,
+                 ttl_policies: Dict[str, float] | None = None):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.ttl_policies = dict(ttl_policies or {})
+        # key -> (stored_at, ttl, value, version)
+        self._entries: "OrderedDict[str, Tuple[float, float, Any, str | None]]" = OrderedDict()
+        self._in_flight: Dict[str, _InFlight] = {}
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "coalesced": 0, "evictions": 0}
+
+    def ttl_for(self, key: str) -> float:
+        """Get TTL for a key from the longest matching prefix policy."""
+        best = None
+        for prefix in self.ttl_policies:
+            if key.startswith(prefix) and (best is None or len(prefix) > len(best)):
+                best = prefix
+        return self.ttl_policies[best] if best is not None else self.default_ttl
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """Get a fresh value. Returns (hit, value)."""
+        with self._lock:
+            return self._get_unlocked(key, time.time())
+
+    def set(self, key: str, value: Any, ttl: float | None = None,
+            version: str | None = None, age: float = 0.0) -> None:
+        """Store a value, evicting the least recently used entries if full."""
+        if ttl is None:
+            ttl = self.ttl_for(key)
+        with self._lock:
+            self._set_unlocked(key, value, ttl, time.time() - age, version)
+
+    def peek(self, key: str) -> Tuple[bool, float, Any]:
+        """Get a value regardless of TTL. Returns (found, age, value)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, 0.0, None
+            self._entries.move_to_end(key)
+            return True, time.time() - entry[0], entry[2]
+
+    def peek_version(self, key: str) -> Tuple[bool, str | None, Any]:
+        """Get a value and its version regardless of TTL. Returns (found, version, value)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None, None
+            return True, entry[3], entry[2]
+
+    def get_or_load(self, key: str, loader: Callable[[], Any], ttl: float | None = None,
+                    force: bool = False) -> Any:
+        """Get a fresh value or load it, with one loader call per key at a time.
+
+        The loader may return a ``Versioned`` to store a version with the value.
+        With ``force`` the cached value is ignored and reloaded (used for
+        background revalidation).
+        """
+        with self._lock:
+            if not force:
+                hit, value = self._get_unlocked(key, time.time())
+                if hit:
+                    return value
+            flight = self._in_flight.get(key)
+            leader = flight is None
+            if leader:
+                flight = _InFlight()
+                self._in_flight[key] = flight
+            else:
+                self._stats["coalesced"] += 1
+
+        if not leader:
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            loaded = loader()
+            version, age = None, 0.0
+            if isinstance(loaded, Versioned):
+                loaded, version, age = loaded
+            flight.value = loaded
+            if ttl is None:
+                ttl = self.ttl_for(key)
+            with self._lock:
+                if not flight.invalidated:
+                    self._set_unlocked(key, loaded, ttl, time.time() - age, version)
+            return loaded
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        finally:
+            with self._lock:
+                if self._in_flight.get(key) is flight:
+                    del self._in_flight[key]
+            flight.event.set()
+
+    def invalidate(self, key: str) -> None:
+        """Drop a single entry (a load in progress for it will not be stored)."""
+        with self._lock:
+            self._entries.pop(key, None)
+            flight = self._in_flight.pop(key, None)
+            if flight is not None:
+                flight.invalidated = True
+
+    def clear(self) -> None:
+        """Drop all entries (loads in progress will not be stored)."""
+        with self._lock:
+            self._entries.clear()
+            for flight in self._in_flight.values():
+                flight.invalidated = True
+            self._in_flight.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hit/miss/eviction counters."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._entries)
+        stats["max_entries"] = self.max_entries
+        return stats
+
+    def _get_unlocked(self, key: str, now: float) -> Tuple[bool, Any]:
+        entry = self._entries.get(key)
+        if entry is not None and now - entry[0] <= entry[1]:
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return True, entry[2]
+        self._stats["misses"] += 1
+        return False, None
+
+    def _set_unlocked(self, key: str, value: Any, ttl: float, now: float,
+                      version: str | None = None) -> None:
+        self._entries[key] = (now, ttl, value, version)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats["evictions"] += 1
@@ -0,0 +1,219 @@
+"""Background bulk sync of ``cached_players`` / ``cached_matches`` from the backend."""
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, List, NamedTuple, Tuple
+
+from config import DB_PATH, CACHE_SYNC_INTERVAL, CACHE_SYNC_MIN_INTERVAL
+from utils.cache import Versioned
+from utils.database import connections
+from utils.migrations import _MATCH_STAT_COLUMNS
+
+Rows = Dict[int, Tuple[Any, ...]]
+
+
+class CachedTable(NamedTuple):
+    """A local copy of backend data: ``fetch`` turns the ``endpoints`` documents into {id: values}.
+
+    Values are in ``columns`` order.
+    """
+    name: str
+    columns: Tuple[str, ...]
+    fetch: Callable[..., Rows]
+    endpoints: Tuple[str, ...] = ()
+
+
+def _fetch_players(players: Dict[str, Any]) -> Rows:
+    return {
+        int(p["id"]): (p.get("name"), p.get("position"), p.get("team_id"), int(p.get("votes") or 0))
+        for p in players.get("players", [])
+    }
+
+
+MATCH_STATS = tuple(column for column, _ in _MATCH_STAT_COLUMNS)
+
+
+def _fetch_matches(matches: Dict[str, Any], match_stats: Dict[str, Any]) -> Rows:
+    stats = {int(s["match_id"]): s for s in match_stats.get("matches", [])}
+    rows = {}
+    for m in matches.get("matches", []):
+        match_id = int(m["id"])
+        row_stats = stats.get(match_id, {})
+        rows[match_id] = (m.get("team1"), m.get("team2"), m.get("date"), int(bool(m.get("isActive", True))),
+                          *(int(row_stats.get(column, default)) for column, default in _MATCH_STAT_COLUMNS))
+    return rows
+
+
+TABLES = (
+    CachedTable("cached_players", ("name", "position", "team_id", "votes"), _fetch_players, ("/players",)),
+    CachedTable("cached_matches", ("team1", "team2", "date", "is_active") + MATCH_STATS, _fetch_matches,
+                ("/matches", "/match-stats")),
+)
+
+
+def diff_rows(local: Rows, remote: Rows) -> Tuple[List[Tuple[Any, ...]], List[int]]:
+    """Get (rows to upsert as (id, *values), ids to delete) turning ``local`` into ``remote``."""
+    upserts = [(row_id, *values) for row_id, values in remote.items() if local.get(row_id) != values]
+    deletes = [row_id for row_id in local if row_id not in remote]
+    return upserts, deletes
+
+
+def apply_diff(conn: sqlite3.Connection, table: CachedTable, remote: Rows) -> Tuple[int, int]:
+    """Write only the changed rows of ``table`` in one transaction. Returns (upserted, deleted)."""
+    columns = ", ".join(table.columns)
+    upsert_sql = (
+        f"INSERT INTO {table.name} (id, {columns}, synced_at)"
+        f" VALUES (?, {', '.join('?' for _ in table.columns)}, CURRENT_TIMESTAMP)"
+        f" ON CONFLICT (id) DO UPDATE SET "
+        + ", ".join(f"{column} = excluded.{column}" for column in table.columns)
+        + ", synced_at = excluded.synced_at"
+    )
+    with conn:
+        conn.execute("BEGIN IMMEDIATE")
+        local = {row[0]: tuple(row[1:]) for row in conn.execute(f"SELECT id, {columns} FROM {table.name}")}
+        upserts, deletes = diff_rows(local, remote)
+        conn.executemany(upsert_sql, upserts)
+        conn.executemany(f"DELETE FROM {table.name} WHERE id = ?", [(row_id,) for row_id in deletes])
+        conn.execute(
+            """INSERT INTO cache_sync_state (table_name, synced_at, row_count, changed)
+               VALUES (?, ?, ?, ?)
+               ON CONFLICT (table_name) DO UPDATE SET synced_at = excluded.synced_at,
+                   row_count = excluded.row_count, changed = excluded.changed""",
+            (table.name, time.time(), len(remote), len(upserts) + len(deletes)))
+    return len(upserts), len(deletes)
+
+
+def mark_synced(conn: sqlite3.Connection, table: CachedTable) -> None:
+    """Record a sync that found the backend data unchanged (nothing to write)."""
+    with conn:
+        conn.execute("UPDATE cache_sync_state SET synced_at = ?, changed = 0 WHERE table_name = ?",
+                     (time.time(), table.name))
+
+
+def _load_documents(endpoints: Tuple[str, ...], known: List[Versioned] | None) -> List[Versioned]:
+    from utils.api_client import _revalidate
+    return [_revalidate(endpoint, old) for endpoint, old in zip(endpoints, known or [None] * len(endpoints))]
+
+
+def sync_lag(conn: sqlite3.Connection) -> Dict[str, Any]:
+    """Seconds since each table was last synced (by any process); None if never."""
+    state = {row["table_name"]: row for row in conn.execute("SELECT * FROM cache_sync_state").fetchall()}
+    now = time.time()
+    lag = {}
+    for table in TABLES:
+        row = state.get(table.name)
+        lag[table.name] = {
+            "lag": round(now - row["synced_at"], 3) if row else None,
+            "rows": row["row_count"] if row else 0,
+            "last_changed": row["changed"] if row else 0,
+        }
+    return lag
+
+
+class CacheSyncer:
+    """Keep the local copies of backend tables fresh from a background thread.
+
+    Every ``interval`` seconds (or sooner when a write asks for it, but no
+    more often than ``min_interval``) each table's documents are revalidated
+    with their ETags. When none changed since the last applied sync there is
+    nothing to do; otherwise they are diffed against the local rows and only
+    the differences are written. Request handlers only read these tables.
+    """
+
+    def __init__(self, db_path: str, interval: float, min_interval: float, tables=TABLES):
+        self.db_path = db_path
+        self.interval = interval
+        self.min_interval = min_interval
+        self.tables = tables
+        self._thread: threading.Thread | None = None
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+        self._app = None
+        # table name -> documents of the last applied sync (their ETags are revalidated)
+        self._applied: Dict[str, List[Versioned]] = {}
+        self._stats = {"syncs": 0, "upserted": 0, "deleted": 0, "not_modified": 0, "failures": 0,
+                       "last_error": None, "last_duration": None}
+
+    def start(self, app) -> None:
+        """Start the sync thread (once per process)."""
+        with self._lock:
+            self._app = app
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name="cache-sync", daemon=True)
+            self._thread.start()
+
+    def request_sync(self) -> None:
+        """Ask for a sync soon (after a write changed backend data)."""
+        self._wake.set()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get sync counters of this process."""
+        with self._lock:
+            stats = dict(self._stats)
+        stats["running"] = self._thread is not None and self._thread.is_alive()
+        return stats
+
+    def sync_once(self) -> Dict[str, Tuple[int, int]]:
+        """Sync every table. Returns {table: (upserted, deleted)}."""
+        started = time.monotonic()
+        conn = connections.connection(self.db_path)
+        changes, not_modified = {}, 0
+        try:
+            for table in self.tables:
+                known = self._applied.get(table.name)
+                documents = _load_documents(table.endpoints, known)
+                if known and all(doc.version and doc.version == old.version
+                                 for doc, old in zip(documents, known)):
+                    mark_synced(conn, table)
+                    changes[table.name] = (0, 0)
+                    not_modified += 1
+                    continue
+                changes[table.name] = apply_diff(
+                    conn, table, table.fetch(*(doc.value for doc in documents)))
+                self._applied[table.name] = documents
+        except Exception as e:
+            with self._lock:
+                self._stats["failures"] += 1
+                self._stats["last_error"] = str(e) or e.__class__.__name__
+            raise
+        finally:
+            connections.release(conn)
+        with self._lock:
+            self._stats["syncs"] += 1
+            self._stats["upserted"] += sum(upserted for upserted, _ in changes.values())
+            self._stats["deleted"] += sum(deleted for _, deleted in changes.values())
+            self._stats["not_modified"] += not_modified
+            self._stats["last_duration"] = round(time.monotonic() - started, 4)
+        return changes
+
+    def _run(self) -> None:
+        while True:
+            started = time.monotonic()
+            try:
+                self.sync_once()
+            except Exception as e:
+                if self._app is not None:
+                    self._app.logger.warning("Cache sync failed: %s", e)
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            # Coalesce bursts of writes into one sync per min_interval
+            time.sleep(max(0.0, self.min_interval - (time.monotonic() - started)))
+
+
+_syncer = CacheSyncer(str(DB_PATH), CACHE_SYNC_INTERVAL, CACHE_SYNC_MIN_INTERVAL)
+
+
+def start_cache_sync(app) -> None:
+    """Start syncing the local backend copies in this process."""
+    _syncer.start(app)
+
+
+def request_sync() -> None:
+    """Ask the sync thread to refresh soon."""
+    _syncer.request_sync()
+
+
+def get_cache_sync_stats() -> Dict[str, Any]:
+    """Get sync counters of this process."""
+    return _syncer.stats()
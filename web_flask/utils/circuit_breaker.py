@@ -0,0 +1,178 @@
+"""Per-endpoint circuit breakers and concurrency limits (bulkheads)."""
+import threading
+import time
+from typing import Any, Dict, Tuple
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """The endpoint's circuit is open; the call was not attempted."""
+
+
+class BulkheadFullError(Exception):
+    """Too many concurrent calls to the endpoint; the call was not attempted."""
+
+
+class CircuitBreaker:
+    """Closed -> open after consecutive failures, half-open after a cool-down.
+
+    In half-open state a single trial call is let through: success closes the
+    circuit, failure opens it again for another ``reset_timeout`` seconds.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.rejected = 0
+        self.last_error: str | None = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Check whether a call may be attempted now."""
+        with self._lock:
+            if self.state == OPEN and time.time() - self.opened_at >= self.reset_timeout:
+                self.state = HALF_OPEN
+                self._trial_in_flight = False
+            if self.state == CLOSED:
+                return True
+            if self.state == HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            self.rejected += 1
+            return False
+
+    def release(self) -> None:
+        """Give back a permit obtained from allow() without recording an outcome."""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_success(self) -> None:
+        """Record a successful call."""
+        with self._lock:
+            self.state = CLOSED
+            self.failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self, error: str | None = None) -> None:
+        """Record a failed call, opening the circuit if needed."""
+        with self._lock:
+            self.failures += 1
+            self.last_error = error
+            self._trial_in_flight = False
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = OPEN
+                self.opened_at = time.time()
+
+    def reset(self) -> None:
+        """Force the circuit closed."""
+        with self._lock:
+            self.state = CLOSED
+            self.failures = 0
+            self._trial_in_flight = False
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Get current state for monitoring."""
+        with self._lock:
+            retry_in = None
+            if self.state == OPEN:
+                retry_in = round(max(0.0, self.reset_timeout - (time.time() - self.opened_at)), 3)
+            return {
+                "state": self.state,
+                "consecutive_failures": self.failures,
+                "rejected": self.rejected,
+                "last_error": self.last_error,
+                "retry_in": retry_in,
+            }
+
+
+class Bulkhead:
+    """Limits concurrent calls so one slow endpoint cannot occupy every worker."""
+
+    def __init__(self, max_concurrent: int, wait: float):
+        self.max_concurrent = max_concurrent
+        self.wait = wait
+        self.rejected = 0
+        self._active = 0
+        self._semaphore = threading.BoundedSemaphore(max_concurrent)
+        self._lock = threading.Lock()
+
+    def acquire(self) -> bool:
+        """Take a slot, waiting at most ``wait`` seconds."""
+        if not self._semaphore.acquire(timeout=self.wait):
+            with self._lock:
+                self.rejected += 1
+            return False
+        with self._lock:
+            self._active += 1
+        return True
+
+    def release(self) -> None:
+        """Give back a slot."""
+        with self._lock:
+            self._active -= 1
+        self._semaphore.release()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Get current usage for monitoring."""
+        with self._lock:
+            return {"active": self._active, "max_concurrent": self.max_concurrent,
+                    "rejected": self.rejected}
+
+
+class EndpointGuards:
+    """Breaker and bulkhead per endpoint group.
+
+    Ids are dropped from the path ("/votes/12" -> "/votes") and the first two
+    segments are kept ("/votes/checksums"); writes are grouped per method too
+    ("POST /votes/batch"), so slow or failing batch calls don't trip or fill
+    the guard of the per-match reads and vice versa.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float,
+                 max_concurrent: int, wait: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_concurrent = max_concurrent
+        self.wait = wait
+        self._guards: Dict[str, Tuple[CircuitBreaker, Bulkhead]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def group(endpoint: str, method: str = "GET") -> str:
+        """Get the group key for a request to an endpoint."""
+        segments = endpoint.lstrip("/").split("?", 1)[0].split("/")[:2]
+        path = "/" + "/".join(segment for segment in segments if not segment.isdigit())
+        method = method.upper()
+        return path if method == "GET" else f"{method} {path}"
+
+    def get(self, endpoint: str, method: str = "GET") -> Tuple[CircuitBreaker, Bulkhead]:
+        """Get (creating on first use) the breaker and bulkhead for a request."""
+        key = self.group(endpoint, method)
+        with self._lock:
+            guard = self._guards.get(key)
+            if guard is None:
+                guard = (CircuitBreaker(self.failure_threshold, self.reset_timeout),
+                         Bulkhead(self.max_concurrent, self.wait))
+                self._guards[key] = guard
+            return guard
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Get state of every known endpoint group."""
+        with self._lock:
+            guards = dict(self._guards)
+        return {key: {"breaker": breaker.snapshot(), "bulkhead": bulkhead.snapshot()}
+                for key, (breaker, bulkhead) in sorted(guards.items())}
+
+    def reset(self) -> None:
+        """Close every circuit."""
+        with self._lock:
+            guards = list(self._guards.values())
+        for breaker, _ in guards:
+            breaker.reset()
@@ -1,239 +1,127 @@
 """Database utilities."""
 import sqlite3
-from typing import Any
+import threading
+from typing import Any, Dict, List
 
 from flask import g
-from werkzeug.security import generate_password_hash
 
-from config import DB_PATH
+from config import (
+    DB_PATH, SQLITE_JOURNAL_MODE, SQLITE_SYNCHRONOUS, SQLITE_BUSY_TIMEOUT,
+    SQLITE_MMAP_SIZE, SQLITE_STATEMENT_CACHE, SQLITE_POOL_SIZE, MIGRATION_LOCK_TIMEOUT,
+)
+
+
+def connect(path: Any = None, check_same_thread: bool = True) -> sqlite3.Connection:
+    """Open a connection to the Flask database with the configured pragmas."""
+    conn = sqlite3.connect(str(path or DB_PATH), timeout=SQLITE_BUSY_TIMEOUT,
+                           cached_statements=SQLITE_STATEMENT_CACHE,
+                           check_same_thread=check_same_thread)
+    conn.row_factory = sqlite3.Row
+    conn.execute(f"PRAGMA journal_mode={SQLITE_JOURNAL_MODE}")
+    conn.execute(f"PRAGMA synchronous={SQLITE_SYNCHRONOUS}")
+    conn.execute(f"PRAGMA busy_timeout={int(SQLITE_BUSY_TIMEOUT * 1000)}")
+    conn.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+    return conn
+
+
+class ConnectionManager:
+    """Pool of open connections (per database path) shared by all threads.
+
+    A connection is checked out for one request (or one background job) and
+    returned afterwards, so requests served by short-lived threads still
+    reuse connections opened once with the tuned pragmas. Up to ``pool_size``
+    idle connections per path are kept; extra ones are closed on return.
+    In WAL mode readers are not blocked by a vote being written.
+    """
+
+    def __init__(self, pool_size: int = SQLITE_POOL_SIZE):
+        self.pool_size = pool_size
+        self._idle: Dict[str, List[sqlite3.Connection]] = {}
+        self._paths: Dict[sqlite3.Connection, str] = {}
+        self._lock = threading.Lock()
+        self._stats = {"opened": 0, "reused": 0, "closed": 0}
+
+    def connection(self, path: Any = None) -> sqlite3.Connection:
+        """Check out a connection to ``path`` (the Flask database by default)."""
+        path = str(path or DB_PATH)
+        with self._lock:
+            idle = self._idle.get(path)
+            if idle:
+                self._stats["reused"] += 1
+                return idle.pop()
+            self._stats["opened"] += 1
+        conn = connect(path, check_same_thread=False)
+        with self._lock:
+            self._paths[conn] = path
+        return conn
+
+    def release(self, conn: sqlite3.Connection) -> None:
+        """Return a checked-out connection: drop any uncommitted transaction first."""
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            self._discard(conn)
+            return
+        with self._lock:
+            path = self._paths.get(conn)
+            idle = self._idle.setdefault(path, []) if path is not None else None
+            if idle is not None and len(idle) < self.pool_size:
+                idle.append(conn)
+                return
+        self._discard(conn)
+
+    def close_all(self) -> None:
+        """Close the idle connections (checked-out ones are closed when returned)."""
+        with self._lock:
+            idle = [conn for conns in self._idle.values() for conn in conns]
+            self._idle.clear()
+        for conn in idle:
+            self._discard(conn)
+
+    def stats(self) -> dict:
+        """Get open/reuse counters and the number of idle connections."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["idle"] = sum(len(conns) for conns in self._idle.values())
+        return stats
+
+    def _discard(self, conn: sqlite3.Connection) -> None:
+        with self._lock:
+            self._paths.pop(conn, None)
+            self._stats["closed"] += 1
+        conn.close()
+
+
+# Process-wide pool used by get_db()
+connections = ConnectionManager()
 
 
 def get_db() -> sqlite3.Connection:
-    """Get database connection from Flask g."""
+    """Get the request's database connection (checked out of the pool on first use)."""
     if "db" not in g:
-        conn = sqlite3.connect(DB_PATH)
-        conn.row_factory = sqlite3.Row
-        g.db = conn
+        g.db = connections.connection()
     return g.db
 
 
 def close_db(_: Any) -> None:
-    """Close database connection."""
+    """Return the request's connection to the pool."""
     conn = g.pop("db", None)
     if conn is not None:
-        conn.close()
+        connections.release(conn)
 
 
 def init_user_db() -> None:
-    """Initialize user database tables."""
-    conn = sqlite3.connect(DB_PATH)
+    """Bring the database schema up to date (see utils/migrations.py)."""
+    from utils.migrations import migrate
+    conn = connect()
     try:
-        conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS users (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                username TEXT UNIQUE NOT NULL,
-                password TEXT NOT NULL,
-                role TEXT NOT NULL DEFAULT 'fan'
-            )
-            """
-        )
-        conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS user_votes (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER NOT NULL,
-                match_id INTEGER NOT NULL,
-                player_id INTEGER NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                UNIQUE(user_id, match_id),
-                FOREIGN KEY (user_id) REFERENCES users(id)
-            )
-            """
-        )
-        # Cache table for players (synced from C++ API)
-        conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS cached_players (
-                id INTEGER PRIMARY KEY,
-                name TEXT NOT NULL,
-                position TEXT,
-                team_id INTEGER,
-                votes INTEGER DEFAULT 0,
-                synced_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-            """
-        )
-        # Cache table for matches (synced from C++ API)
-        conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS cached_matches (
-            id INTEGER PRIMARY KEY,
-            team1 TEXT NOT NULL,
-            team2 TEXT NOT NULL,
-            date TEXT,
-            is_active BOOLEAN DEFAULT 1,
-            team1_goals INTEGER DEFAULT 0,
-            team2_goals INTEGER DEFAULT 0,
-            team1_possession INTEGER DEFAULT 50,
-            team2_possession INTEGER DEFAULT 50,
-            team1_shots INTEGER DEFAULT 0,
-            team2_shots INTEGER DEFAULT 0,
-            team1_shots_on_target INTEGER DEFAULT 0,
-            team2_shots_on_target INTEGER DEFAULT 0,
-            team1_corners INTEGER DEFAULT 0,
-            team2_corners INTEGER DEFAULT 0,
-            team1_fouls INTEGER DEFAULT 0,
-            team2_fouls INTEGER DEFAULT 0,
-            team1_yellow_cards INTEGER DEFAULT 0,
-            team2_yellow_cards INTEGER DEFAULT 0,
-            team1_red_cards INTEGER DEFAULT 0,
-            team2_red_cards INTEGER DEFAULT 0,
-            synced_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-        """
-        )
-
-        # Add new columns if they don't exist (for existing databases)
-        try:
-            conn.execute(
-                "ALTER TABLE cached_matches ADD COLUMN team1_goals INTEGER DEFAULT 0")
-        except sqlite3.OperationalError:
-            pass  # Column already exists
-
-        try:
-            conn.execute(
-                "ALTER TABLE cached_matches ADD COLUMN team2_goals INTEGER DEFAULT 0")
-        except sqlite3.OperationalError:
-            pass
-
-        try:
-            conn.execute(
-                "ALTER TABLE cached_matches ADD COLUMN team1_possession INTEGER DEFAULT 50")
-        except sqlite3.OperationalError:
-            pass
-
-        try:
-            conn.execute(
-                "ALTER TABLE cached_matches ADD COLUMN team2_possession INTEGER DEFAULT 50")
-        except sqlite3.OperationalError:
-            pass
-
-        try:
-            conn.execute(
-                "ALTER TABLE cached_matches ADD COLUMN team1_shots INTEGER DEFAULT 0")
-        except sqlite3.OperationalError:
-            pass
-
-        try:
-            conn.execute(
-                "ALTER TABLE cached_matches ADD COLUMN team2_shots INTEGER DEFAULT 0")
-        except sqlite3.OperationalError:
-            pass
-
-        try:
-            conn.execute(
-                "ALTER TABLE cached_matches ADD COLUMN team1_shots_on_target INTEGER DEFAULT 0")
-        except sqlite3.OperationalError:
-            pass
-
-        try:
-            conn.execute(
-                "ALTER TABLE cached_matches ADD COLUMN team2_shots_on_target INTEGER DEFAULT 0")
-        except sqlite3.OperationalError:
-            pass
-
-        try:
-            conn.execute(
-                "ALTER TABLE cached_matches ADD COLUMN team1_corners INTEGER DEFAULT 0")
-        except sqlite3.OperationalError:
-            pass
-
-        try:
-            conn.execute(
-                "ALTER TABLE cached_matches ADD COLUMN team2_corners INTEGER DEFAULT 0")
-        except sqlite3.OperationalError:
-            pass
-
-        try:
-            conn.execute(
-                "ALTER TABLE cached_matches ADD COLUMN team1_fouls INTEGER DEFAULT 0")
-        except sqlite3.OperationalError:
-            pass
-
-        try:
-            conn.execute(
-                "ALTER TABLE cached_matches ADD COLUMN team2_fouls INTEGER DEFAULT 0")
-        except sqlite3.OperationalError:
-            pass
-
-        try:
-            conn.execute(
-                "ALTER TABLE cached_matches ADD COLUMN team1_yellow_cards INTEGER DEFAULT 0")
-        except sqlite3.OperationalError:
-            pass
-
-        try:
-            conn.execute(
-                "ALTER TABLE cached_matches ADD COLUMN team2_yellow_cards INTEGER DEFAULT 0")
-        except sqlite3.OperationalError:
-            pass
-
-        try:
-            conn.execute(
-                "ALTER TABLE cached_matches ADD COLUMN team1_red_cards INTEGER DEFAULT 0")
-        except sqlite3.OperationalError:
-            pass
-
-        try:
-            conn.execute(
-                "ALTER TABLE cached_matches ADD COLUMN team2_red_cards INTEGER DEFAULT 0")
-        except sqlite3.OperationalError:
-            pass
-        # Cache table for teams (synced from C++ API)
-        conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS cached_teams (
-                id INTEGER PRIMARY KEY,
-                name TEXT NOT NULL,
-                synced_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-            """
-        )
-        # Comments table for matches
-        conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS match_comments (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER NOT NULL,
-                match_id INTEGER NOT NULL,
-                comment_text TEXT NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (user_id) REFERENCES users(id)
-            )
-            """
-        )
-        # Posts table for news/announcements
-        conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS posts (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER NOT NULL,
-                title TEXT NOT NULL,
-                content TEXT NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (user_id) REFERENCES users(id)
-            )
-            """
-        )
-        conn.commit()
-
-        cursor = conn.execute("SELECT COUNT(*) FROM users WHERE role='admin'")
-        if cursor.fetchone()[0] == 0:
-            conn.execute(
-                "INSERT OR IGNORE INTO users (username, password, role) VALUES (?, ?, 'admin')",
-                ("admin", generate_password_hash("admin123")),
-            )
-            conn.commit()
+        applied = migrate(conn, lock_timeout=MIGRATION_LOCK_TIMEOUT)
     finally:
         conn.close()
+    if applied:
+        try:
+            from flask import current_app
+            current_app.logger.info("Applied database migrations: %s", applied)
+        except:
+            pass
@@ -0,0 +1,107 @@
+"""Shared keep-alive HTTP session for calls to the C++ backend."""
+import threading
+from typing import Any, Dict
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from config import API_POOL_SIZE, API_POOL_BLOCK, API_ENDPOINT_TIMEOUTS
+
+_session: requests.Session | None = None
+_session_lock = threading.Lock()
+
+# Connection reuse counters (requests sent vs. TCP connections opened)
+_stats_lock = threading.Lock()
+_stats: Dict[str, int] = {"requests": 0, "new_connections": 0, "errors": 0}
+
+
+def _count(key: str) -> None:
+    """Increment a pool counter."""
+    with _stats_lock:
+        _stats[key] += 1
+
+
+class _CountingHTTPConnectionPool(HTTPConnectionPool):
+    """HTTP connection pool that counts newly opened connections."""
+
+    def _new_conn(self):
+        _count("new_connections")
+        return super()._new_conn()
+
+
+class _CountingHTTPSConnectionPool(HTTPSConnectionPool):
+    """HTTPS connection pool that counts newly opened connections."""
+
+    def _new_conn(self):
+        _count("new_connections")
+        return super()._new_conn()
+
+
+class _PooledAdapter(HTTPAdapter):
+    """Adapter whose pools report how often a connection is opened."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _CountingHTTPConnectionPool,
+            "https": _CountingHTTPSConnectionPool,
+        }
+
+
+def get_session() -> requests.Session:
+    """Get the process-wide backend session (created on first use)."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = _PooledAdapter(
+                    pool_connections=1,
+                    pool_maxsize=API_POOL_SIZE,
+                    pool_block=API_POOL_BLOCK,
+                    max_retries=0,
+                )
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                session.headers["Connection"] = "keep-alive"
+                _session = session
+    return _session
+
+
+def timeout_for(endpoint: str, default: float) -> float:
+    """Get the configured timeout for an endpoint (longest prefix wins)."""
+    best = None
+    for prefix in API_ENDPOINT_TIMEOUTS:
+        if endpoint.startswith(prefix) and (best is None or len(prefix) > len(best)):
+            best = prefix
+    return API_ENDPOINT_TIMEOUTS[best] if best is not None else default
+
+
+def request(method: str, url: str, **kwargs: Any) -> requests.Response:
+    """Send a request through the shared session."""
+    _count("requests")
+    try:
+        return get_session().request(method, url, **kwargs)
+    except requests.RequestException:
+        _count("errors")
+        raise
+
+
+def get_pool_stats() -> Dict[str, Any]:
+    """Get connection reuse counters."""
+    with _stats_lock:
+        stats = dict(_stats)
+    reused = max(0, stats["requests"] - stats["errors"] - stats["new_connections"])
+    sent = stats["requests"] - stats["errors"]
+    stats["reused_connections"] = reused
+    stats["reuse_ratio"] = round(reused / sent, 3) if sent > 0 else 0.0
+    stats["pool_size"] = API_POOL_SIZE
+    return stats
+
+
+def reset_pool_stats() -> None:
+    """Reset connection reuse counters."""
+    with _stats_lock:
+        for key in _stats:
+            _stats[key] = 0
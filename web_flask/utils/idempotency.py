@@ -0,0 +1,96 @@
+"""``Idempotency-Key`` support for mutating routes: retries get the stored response."""
+import hashlib
+from functools import wraps
+from typing import Any, Dict, NamedTuple
+
+from flask import Response, jsonify, make_response, request, session
+
+from config import IDEMPOTENCY_MAX_KEYS, IDEMPOTENCY_TTL
+from utils.cache import TTLCache
+
+HEADER = "Idempotency-Key"
+MAX_KEY_LENGTH = 255
+
+
+class _StoredResponse(NamedTuple):
+    """A completed response kept for replay."""
+    fingerprint: str
+    status: int
+    body: bytes
+    mimetype: str
+
+
+class _NotStored(Exception):
+    """The response must not be replayed (server error); retries run the view again."""
+
+    def __init__(self, response: _StoredResponse):
+        super().__init__(response.status)
+        self.response = response
+
+
+# Bounded store of recent keys per process. Concurrent requests with the same
+# key are coalesced: one runs the view, the others wait for its response.
+_store = TTLCache(max_entries=IDEMPOTENCY_MAX_KEYS, default_ttl=IDEMPOTENCY_TTL)
+
+
+def _fingerprint() -> str:
+    """Hash of what the request asks for, to catch a key reused for another request."""
+    digest = hashlib.sha256(request.method.encode())
+    digest.update(request.path.encode())
+    digest.update(request.get_data(cache=True))
+    return digest.hexdigest()
+
+
+def _to_response(stored: _StoredResponse, replayed: bool) -> Response:
+    response = Response(stored.body, status=stored.status, mimetype=stored.mimetype)
+    if replayed:
+        response.headers["Idempotent-Replayed"] = "true"
+    return response
+
+
+def idempotent(view):
+    """Replay the stored response when a request repeats its ``Idempotency-Key``.
+
+    Keys are scoped to the user and route. Responses below 500 are kept for
+    ``IDEMPOTENCY_TTL`` seconds; a key reused with a different body gets 422.
+    Place below the login/admin decorators so rejected requests are not stored.
+    """
+    @wraps(view)
+    def wrapped(*args, **kwargs):
+        key = request.headers.get(HEADER, "").strip()
+        if not key:
+            return view(*args, **kwargs)
+        if len(key) > MAX_KEY_LENGTH:
+            return jsonify({"status": "error", "message": "Задовгий Idempotency-Key"}), 400
+
+        fingerprint = _fingerprint()
+        leader = []
+
+        def run_view() -> _StoredResponse:
+            leader.append(True)
+            response = view(*args, **kwargs)
+            if not isinstance(response, Response):
+                response = make_response(response)
+            stored = _StoredResponse(fingerprint, response.status_code,
+                                     response.get_data(), response.mimetype)
+            if stored.status >= 500:
+                raise _NotStored(stored)
+            return stored
+
+        scope = f"{session.get('user_id')}:{request.method}:{request.path}:{key}"
+        try:
+            stored = _store.get_or_load(scope, run_view)
+        except _NotStored as exc:
+            return _to_response(exc.response, replayed=not leader)
+        if stored.fingerprint != fingerprint:
+            return jsonify({
+                "status": "error",
+                "message": "Idempotency-Key вже використано для іншого запиту"
+            }), 422
+        return _to_response(stored, replayed=not leader)
+    return wrapped
+
+
+def get_idempotency_stats() -> Dict[str, Any]:
+    """Get hit/miss counters of the key store."""
+    return _store.stats()
@@ -0,0 +1,78 @@
+"""In-process invalidation bus: write routes publish the resources they changed."""
+import threading
+from typing import Callable, Iterable, List
+
+# Resource keys published by write routes
+VOTES = "votes"      # votes:<match_id> - a vote was cast in the match
+MATCH = "match"      # match:<match_id> - match state or stats changed (or it was deleted)
+
+
+def resource_key(kind: str, resource_id: object) -> str:
+    """Build a resource key such as ``votes:12``."""
+    return f"{kind}:{resource_id}"
+
+
+def parse_key(key: str) -> tuple[str, str | None]:
+    """Split a resource key into (kind, id)."""
+    kind, _, resource_id = key.partition(":")
+    return kind, resource_id or None
+
+
+class InvalidationBus:
+    """Fan out published resource keys to every subscribed cache layer.
+
+    Subscribers are called synchronously in the publishing thread, so the
+    writer's next read already sees fresh data. A failing subscriber is
+    logged and does not affect the others.
+    """
+
+    def __init__(self):
+        self._subscribers: List[Callable[[frozenset], None]] = []
+        self._lock = threading.Lock()
+        self.published = 0
+
+    def subscribe(self, callback: Callable[[frozenset], None]) -> Callable[[frozenset], None]:
+        """Register a callback taking the set of changed keys (usable as a decorator)."""
+        with self._lock:
+            if callback not in self._subscribers:
+                self._subscribers.append(callback)
+        return callback
+
+    def unsubscribe(self, callback: Callable[[frozenset], None]) -> None:
+        """Remove a callback."""
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def publish(self, keys: Iterable[str]) -> None:
+        """Notify every subscriber that the given resources changed."""
+        keys = frozenset(keys)
+        if not keys:
+            return
+        with self._lock:
+            subscribers = list(self._subscribers)
+            self.published += 1
+        for callback in subscribers:
+            try:
+                callback(keys)
+            except Exception as e:
+                try:
+                    from flask import current_app
+                    current_app.logger.error(
+                        "Invalidation subscriber %s failed: %s", callback.__name__, e)
+                except:
+                    pass
+
+
+# Process-wide bus
+bus = InvalidationBus()
+
+
+def publish(*keys: str) -> None:
+    """Publish changed resource keys on the process-wide bus."""
+    bus.publish(keys)
+
+
+def subscribe(callback: Callable[[frozenset], None]) -> Callable[[frozenset], None]:
+    """Subscribe to the process-wide bus."""
+    return bus.subscribe(callback)
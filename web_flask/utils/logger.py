@@ -1,11 +1,116 @@
 """Logging configuration for Flask application."""
+import atexit
 import logging
 import os
-from logging.handlers import RotatingFileHandler
+import queue
+import random
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+from config import LOG_MODE, LOG_QUEUE_SIZE, LOG_PAYLOAD_SAMPLE_RATE, LOG_PAYLOAD_MAX_CHARS
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process file locking
+    fcntl = None
+
+# Background listener used in "queue" mode (one per process)
+_listener: QueueListener | None = None
+
+
+class _LockedRotatingFileHandler(RotatingFileHandler):
+    """RotatingFileHandler that several worker processes can share.
+
+    Writes and rollovers happen under an exclusive lock on ``<file>.lock``;
+    after another process rotates the file, the stream is reopened.
+    """
+
+    def __init__(self, filename, *args, **kwargs):
+        super().__init__(filename, *args, **kwargs)
+        self._lock_path = self.baseFilename + ".lock"
+
+    def emit(self, record):
+        if fcntl is None:
+            return super().emit(record)
+        try:
+            with open(self._lock_path, "a") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    self._reopen_if_rotated()
+                    super().emit(record)
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+        except Exception:
+            self.handleError(record)
+
+    def _reopen_if_rotated(self):
+        if self.stream is None:
+            return
+        try:
+            on_disk = os.stat(self.baseFilename)
+            current = os.fstat(self.stream.fileno())
+            rotated = (on_disk.st_ino, on_disk.st_dev) != (current.st_ino, current.st_dev)
+        except FileNotFoundError:
+            rotated = True
+        if rotated:
+            self.stream.close()
+            self.stream = self._open()
+
+
+class _DroppingQueueHandler(QueueHandler):
+    """QueueHandler that defers formatting to the listener and never blocks."""
+
+    dropped = 0
+
+    def prepare(self, record):
+        # Formatting (msg % args, payload repr) happens in the listener thread
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            _DroppingQueueHandler.dropped += 1
+
+
+class _Payload:
+    """Lazily rendered, truncated representation of a response payload."""
+
+    __slots__ = ("payload", "max_chars")
+
+    def __init__(self, payload, max_chars):
+        self.payload = payload
+        self.max_chars = max_chars
+
+    def __str__(self):
+        text = repr(self.payload)
+        if len(text) > self.max_chars:
+            return f"{text[:self.max_chars]}... ({len(text)} chars)"
+        return text
+
+
+def log_payload(logger, message: str, endpoint: str, payload) -> None:
+    """Log a response payload at DEBUG, or a sample of them at INFO (truncated, lazy)."""
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("%s %s: %s", message, endpoint, _Payload(payload, LOG_PAYLOAD_MAX_CHARS))
+    elif LOG_PAYLOAD_SAMPLE_RATE > 0 and random.random() < LOG_PAYLOAD_SAMPLE_RATE:
+        logger.info("%s %s (sampled): %s", message, endpoint,
+                    _Payload(payload, LOG_PAYLOAD_MAX_CHARS))
+
+
+def _stop_listener():
+    """Flush and stop the background listener, closing its handlers."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
 
 
 def setup_logger(app):
     """Configure logging for the Flask application."""
+    global _listener
+
     # Create logs directory if it doesn't exist
     logs_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'logs')
     os.makedirs(logs_dir, exist_ok=True)
@@ -20,6 +125,7 @@ def setup_logger(app):
 
     # Remove default handlers
     app.logger.handlers.clear()
+    _stop_listener()
 
     # Console handler
     console_handler = logging.StreamHandler()
@@ -29,10 +135,9 @@ def setup_logger(app):
         datefmt='%Y-%m-%d %H:%M:%S'
     )
     console_handler.setFormatter(console_formatter)
-    app.logger.addHandler(console_handler)
 
     # File handler - rotating log files (max 10MB, keep 10 backups)
-    file_handler = RotatingFileHandler(
+    file_handler = _LockedRotatingFileHandler(
         os.path.join(logs_dir, 'app.log'),
         maxBytes=10 * 1024 * 1024,  # 10MB
         backupCount=10
@@ -43,17 +148,29 @@ def setup_logger(app):
         datefmt='%Y-%m-%d %H:%M:%S'
     )
     file_handler.setFormatter(file_formatter)
-    app.logger.addHandler(file_handler)
 
     # Error file handler - only errors and critical
-    error_handler = RotatingFileHandler(
+    error_handler = _LockedRotatingFileHandler(
         os.path.join(logs_dir, 'error.log'),
         maxBytes=10 * 1024 * 1024,
         backupCount=10
     )
     error_handler.setLevel(logging.ERROR)
     error_handler.setFormatter(file_formatter)
-    app.logger.addHandler(error_handler)
 
-    app.logger.info('Logging configured successfully')
+    handlers = [console_handler, file_handler, error_handler]
+    if LOG_MODE == "queue":
+        # Request threads only enqueue records; a background thread formats and writes
+        log_queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+        app.logger.addHandler(_DroppingQueueHandler(log_queue))
+        _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _listener.start()
+    else:
+        for handler in handlers:
+            app.logger.addHandler(handler)
+
+    app.logger.info('Logging configured successfully (mode: %s)', LOG_MODE)
     return app.logger
+
+
+atexit.register(_stop_listener)
@@ -0,0 +1,125 @@
+"""In-memory match_id -> state index for the vote hot path."""
+import threading
+import time
+from typing import Any, Callable, Dict, List, NamedTuple
+
+from config import MATCH_INDEX_MAX_AGE, MATCH_INDEX_RELOAD_INTERVAL
+
+
+class MatchState(NamedTuple):
+    """What the vote route needs to know about a match."""
+    match_id: int
+    team1: str
+    team2: str
+    is_active: bool
+    team1_formation: str
+    team2_formation: str
+
+
+class MatchIndex:
+    """Dict of match states built from the cached /matches-page document.
+
+    The index is rebuilt only when that document changes or is invalidated
+    (e.g. after an admin action in any worker), when it is older than
+    ``max_age``, or when an unknown match is requested (a new match). Admin
+    close/activate/delete update it directly, so the change is visible even
+    if the backend cannot be reached for a rebuild.
+    """
+
+    def __init__(self, loader: Callable[[], List[Dict[str, Any]]],
+                 source: Callable[[], Any], max_age: float, reload_interval: float):
+        self.loader = loader
+        self.source = source
+        self.max_age = max_age
+        self.reload_interval = reload_interval
+        self._matches: Dict[int, MatchState] | None = None
+        self._source_doc: Any = None
+        self._built_at = 0.0
+        self._attempted_at = 0.0
+        self._lock = threading.Lock()
+        self._stats = {"lookups": 0, "rebuilds": 0, "rebuild_errors": 0}
+
+    def get(self, match_id: int) -> MatchState | None:
+        """Get a match state, or None if the match does not exist."""
+        document = self.source()
+        with self._lock:
+            self._stats["lookups"] += 1
+            matches = self._matches
+            stale = (matches is None
+                     or document is not self._source_doc
+                     or time.time() - self._built_at > self.max_age)
+        if stale:
+            matches = self._rebuild()
+        state = matches.get(match_id)
+        if state is None and time.time() - self._built_at > self.reload_interval:
+            state = self._rebuild().get(match_id)
+        return state
+
+    def set_active(self, match_id: int, is_active: bool) -> None:
+        """Record an admin close/activate."""
+        with self._lock:
+            if self._matches is not None and match_id in self._matches:
+                self._matches = dict(self._matches)
+                self._matches[match_id] = self._matches[match_id]._replace(is_active=is_active)
+
+    def remove(self, match_id: int) -> None:
+        """Record an admin delete."""
+        with self._lock:
+            if self._matches is not None and match_id in self._matches:
+                self._matches = dict(self._matches)
+                del self._matches[match_id]
+
+    def stats(self) -> Dict[str, Any]:
+        """Get lookup/rebuild counters."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["matches"] = len(self._matches) if self._matches is not None else None
+            stats["age"] = round(time.time() - self._built_at, 3) if self._built_at else None
+        return stats
+
+    def _rebuild(self) -> Dict[int, MatchState]:
+        """Reload from the document; on failure keep the old index (raise if none)."""
+        with self._lock:
+            if self._matches is not None and time.time() - self._attempted_at < self.reload_interval:
+                return self._matches
+            self._attempted_at = time.time()
+        try:
+            matches = {}
+            for m in self.loader():
+                matches[int(m["id"])] = MatchState(
+                    match_id=int(m["id"]),
+                    team1=m.get("team1", ""),
+                    team2=m.get("team2", ""),
+                    is_active=bool(m.get("isActive", True)),
+                    team1_formation=m.get("team1_formation", ""),
+                    team2_formation=m.get("team2_formation", ""),
+                )
+            source_doc = self.source()
+        except Exception:
+            with self._lock:
+                self._stats["rebuild_errors"] += 1
+                if self._matches is None:
+                    raise
+                return self._matches
+        with self._lock:
+            self._matches = matches
+            self._source_doc = source_doc
+            self._built_at = time.time()
+            self._stats["rebuilds"] += 1
+        return matches
+
+
+def _load_matches() -> List[Dict[str, Any]]:
+    from utils.api_client import _cached_get
+    return _cached_get("/matches-page").get("matches", [])
+
+
+def _current_document() -> Any:
+    from utils.api_client import _peek_cached
+    return _peek_cached("/matches-page")
+
+
+# Process-wide index used by the vote route
+match_index = MatchIndex(_load_matches, _current_document,
+                         max_age=MATCH_INDEX_MAX_AGE,
+                         reload_interval=MATCH_INDEX_RELOAD_INTERVAL)
@@ -0,0 +1,422 @@
+"""Versioned schema migrations for the Flask database, tracked in ``PRAGMA user_version``."""
+import sqlite3
+from typing import Callable, List, NamedTuple
+
+from werkzeug.security import generate_password_hash
+
+
+class Migration(NamedTuple):
+    """One schema step; ``apply`` runs inside the migration transaction."""
+    version: int
+    name: str
+    apply: Callable[[sqlite3.Connection], None]
+
+
+MIGRATIONS: List[Migration] = []
+
+
+def migration(version: int, name: str):
+    """Register a migration function (versions must be added in increasing order)."""
+    def register(apply: Callable[[sqlite3.Connection], None]):
+        if MIGRATIONS and version <= MIGRATIONS[-1].version:
+            raise ValueError(f"Migration {version} is out of order")
+        MIGRATIONS.append(Migration(version, name, apply))
+        return apply
+    return register
+
+
+def _columns(conn: sqlite3.Connection, table: str) -> set:
+    return {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+
+
+_MATCH_STAT_COLUMNS = [
+    ("team1_goals", 0), ("team2_goals", 0),
+    ("team1_possession", 50), ("team2_possession", 50),
+    ("team1_shots", 0), ("team2_shots", 0),
+    ("team1_shots_on_target", 0), ("team2_shots_on_target", 0),
+    ("team1_corners", 0), ("team2_corners", 0),
+    ("team1_fouls", 0), ("team2_fouls", 0),
+    ("team1_yellow_cards", 0), ("team2_yellow_cards", 0),
+    ("team1_red_cards", 0), ("team2_red_cards", 0),
+]
+
+
+@migration(1, "baseline schema")
+def _baseline(conn: sqlite3.Connection) -> None:
+    # IF NOT EXISTS: databases created before versioning already have these tables
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT UNIQUE NOT NULL,
+            password TEXT NOT NULL,
+            role TEXT NOT NULL DEFAULT 'fan'
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS user_votes (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            match_id INTEGER NOT NULL,
+            player_id INTEGER NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE(user_id, match_id),
+            FOREIGN KEY (user_id) REFERENCES users(id)
+        )
+        """
+    )
+    # Cache table for players (synced from C++ API)
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS cached_players (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            position TEXT,
+            team_id INTEGER,
+            votes INTEGER DEFAULT 0,
+            synced_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """
+    )
+    # Cache table for matches (synced from C++ API)
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS cached_matches (
+            id INTEGER PRIMARY KEY,
+            team1 TEXT NOT NULL,
+            team2 TEXT NOT NULL,
+            date TEXT,
+            is_active BOOLEAN DEFAULT 1,
+            synced_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """
+    )
+    # Match statistics columns (older databases have only some of them)
+    existing = _columns(conn, "cached_matches")
+    for column, default in _MATCH_STAT_COLUMNS:
+        if column not in existing:
+            conn.execute(f"ALTER TABLE cached_matches ADD COLUMN {column} INTEGER DEFAULT {default}")
+    # Cache table for teams (synced from C++ API)
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS cached_teams (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            synced_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """
+    )
+    # Comments table for matches
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS match_comments (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            match_id INTEGER NOT NULL,
+            comment_text TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users(id)
+        )
+        """
+    )
+    # Posts table for news/announcements
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS posts (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            title TEXT NOT NULL,
+            content TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users(id)
+        )
+        """
+    )
+    # Default administrator account
+    if conn.execute("SELECT COUNT(*) FROM users WHERE role='admin'").fetchone()[0] == 0:
+        conn.execute(
+            "INSERT OR IGNORE INTO users (username, password, role) VALUES (?, ?, 'admin')",
+            ("admin", generate_password_hash("admin123")),
+        )
+
+
+@migration(2, "vote outbox")
+def _vote_outbox(conn: sqlite3.Connection) -> None:
+    # Votes the C++ backend could not take yet (replayed in background)
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS vote_outbox (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            match_id INTEGER NOT NULL,
+            player_id INTEGER NOT NULL,
+            vote_key TEXT NOT NULL UNIQUE,
+            status TEXT NOT NULL DEFAULT 'pending',
+            attempts INTEGER NOT NULL DEFAULT 0,
+            next_attempt_at REAL NOT NULL DEFAULT 0,
+            last_error TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """
+    )
+
+
+@migration(3, "vote reconciliation state")
+def _vote_reconcile_state(conn: sqlite3.Connection) -> None:
+    # Last agreed checksum per match, and the user_votes high-water mark
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS vote_reconcile_state (
+            match_id INTEGER PRIMARY KEY,
+            checksum TEXT NOT NULL,
+            total INTEGER NOT NULL,
+            reconciled_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS vote_reconcile_meta (
+            name TEXT PRIMARY KEY,
+            value INTEGER NOT NULL
+        )
+        """
+    )
+
+
+@migration(4, "indexes for hot queries")
+def _hot_query_indexes(conn: sqlite3.Connection) -> None:
+    # Comments of a match, newest first
+    conn.execute("""CREATE INDEX IF NOT EXISTS idx_match_comments_match_created
+                    ON match_comments (match_id, created_at)""")
+    # Per-match tallies (GROUP BY player_id) read from the index alone
+    conn.execute("""CREATE INDEX IF NOT EXISTS idx_user_votes_match_player
+                    ON user_votes (match_id, player_id)""")
+    # A user's votes, newest first, and the players they voted for (covering)
+    conn.execute("""CREATE INDEX IF NOT EXISTS idx_user_votes_user_created
+                    ON user_votes (user_id, created_at, match_id, player_id)""")
+    # News feed order
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_posts_created ON posts (created_at)")
+    # Outbox rows due for replay, and the rejected ones
+    conn.execute("""CREATE INDEX IF NOT EXISTS idx_vote_outbox_status_due
+                    ON vote_outbox (status, next_attempt_at)""")
+
+
+@migration(5, "materialized match vote tallies")
+def _match_vote_tallies(conn: sqlite3.Connection) -> None:
+    # Per-match, per-player vote counts kept in step with user_votes by triggers
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS match_vote_tallies (
+            match_id INTEGER NOT NULL,
+            player_id INTEGER NOT NULL,
+            votes INTEGER NOT NULL,
+            PRIMARY KEY (match_id, player_id)
+        ) WITHOUT ROWID
+        """
+    )
+    conn.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_user_votes_tally_insert
+        AFTER INSERT ON user_votes
+        BEGIN
+            INSERT INTO match_vote_tallies (match_id, player_id, votes)
+            VALUES (NEW.match_id, NEW.player_id, 1)
+            ON CONFLICT (match_id, player_id) DO UPDATE SET votes = votes + 1;
+        END
+        """
+    )
+    conn.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_user_votes_tally_delete
+        AFTER DELETE ON user_votes
+        BEGIN
+            UPDATE match_vote_tallies SET votes = votes - 1
+            WHERE match_id = OLD.match_id AND player_id = OLD.player_id;
+            DELETE FROM match_vote_tallies
+            WHERE match_id = OLD.match_id AND player_id = OLD.player_id AND votes <= 0;
+        END
+        """
+    )
+    conn.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_user_votes_tally_update
+        AFTER UPDATE OF match_id, player_id ON user_votes
+        BEGIN
+            UPDATE match_vote_tallies SET votes = votes - 1
+            WHERE match_id = OLD.match_id AND player_id = OLD.player_id;
+            DELETE FROM match_vote_tallies
+            WHERE match_id = OLD.match_id AND player_id = OLD.player_id AND votes <= 0;
+            INSERT INTO match_vote_tallies (match_id, player_id, votes)
+            VALUES (NEW.match_id, NEW.player_id, 1)
+            ON CONFLICT (match_id, player_id) DO UPDATE SET votes = votes + 1;
+        END
+        """
+    )
+    # Backfill from the votes cast so far
+    conn.execute("DELETE FROM match_vote_tallies")
+    conn.execute(
+        """
+        INSERT INTO match_vote_tallies (match_id, player_id, votes)
+        SELECT match_id, player_id, COUNT(*) FROM user_votes GROUP BY match_id, player_id
+        """
+    )
+
+
+@migration(6, "keyset pagination indexes")
+def _keyset_pagination_indexes(conn: sqlite3.Connection) -> None:
+    # Vote history pages on (created_at, id); still covers the DISTINCT player_id lookup
+    conn.execute("DROP INDEX IF EXISTS idx_user_votes_user_created")
+    conn.execute("""CREATE INDEX IF NOT EXISTS idx_user_votes_user_history
+                    ON user_votes (user_id, created_at, id, match_id, player_id)""")
+
+
+@migration(7, "cache sync state")
+def _cache_sync_state(conn: sqlite3.Connection) -> None:
+    # Last successful bulk sync of each cached_* table (sync lag metric)
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS cache_sync_state (
+            table_name TEXT PRIMARY KEY,
+            synced_at REAL NOT NULL,
+            row_count INTEGER NOT NULL DEFAULT 0,
+            changed INTEGER NOT NULL DEFAULT 0
+        )
+        """
+    )
+
+
+@migration(8, "user votes archive")
+def _user_votes_archive(conn: sqlite3.Connection) -> None:
+    # Votes of closed matches, moved out of user_votes (same ids)
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS user_votes_archive (
+            id INTEGER PRIMARY KEY,
+            user_id INTEGER NOT NULL,
+            match_id INTEGER NOT NULL,
+            player_id INTEGER NOT NULL,
+            created_at TIMESTAMP,
+            archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """
+    )
+    conn.execute("""CREATE INDEX IF NOT EXISTS idx_user_votes_archive_user_history
+                    ON user_votes_archive (user_id, created_at, id, match_id, player_id)""")
+    conn.execute("""CREATE INDEX IF NOT EXISTS idx_user_votes_archive_match_player
+                    ON user_votes_archive (match_id, player_id)""")
+    # Moving a vote between user_votes and the archive keeps its tally
+    conn.execute("DROP TRIGGER IF EXISTS trg_user_votes_tally_insert")
+    conn.execute(
+        """
+        CREATE TRIGGER trg_user_votes_tally_insert
+        AFTER INSERT ON user_votes
+        WHEN NOT EXISTS (SELECT 1 FROM user_votes_archive WHERE id = NEW.id)
+        BEGIN
+            INSERT INTO match_vote_tallies (match_id, player_id, votes)
+            VALUES (NEW.match_id, NEW.player_id, 1)
+            ON CONFLICT (match_id, player_id) DO UPDATE SET votes = votes + 1;
+        END
+        """
+    )
+    conn.execute("DROP TRIGGER IF EXISTS trg_user_votes_tally_delete")
+    conn.execute(
+        """
+        CREATE TRIGGER trg_user_votes_tally_delete
+        AFTER DELETE ON user_votes
+        WHEN NOT EXISTS (SELECT 1 FROM user_votes_archive WHERE id = OLD.id)
+        BEGIN
+            UPDATE match_vote_tallies SET votes = votes - 1
+            WHERE match_id = OLD.match_id AND player_id = OLD.player_id;
+            DELETE FROM match_vote_tallies
+            WHERE match_id = OLD.match_id AND player_id = OLD.player_id AND votes <= 0;
+        END
+        """
+    )
+
+
+@migration(9, "full-text search")
+def _full_text_search(conn: sqlite3.Connection) -> None:
+    # External-content FTS5 indexes over posts and match_comments, kept in sync by triggers
+    tokenize = "unicode61 remove_diacritics 2"
+    conn.execute(f"""CREATE VIRTUAL TABLE IF NOT EXISTS posts_fts USING fts5(
+                         title, content, content='posts', content_rowid='id',
+                         tokenize='{tokenize}', prefix='2 3')""")
+    conn.execute(f"""CREATE VIRTUAL TABLE IF NOT EXISTS match_comments_fts USING fts5(
+                         comment_text, content='match_comments', content_rowid='id',
+                         tokenize='{tokenize}', prefix='2 3')""")
+    for table, fts, columns in (("posts", "posts_fts", ("title", "content")),
+                                ("match_comments", "match_comments_fts", ("comment_text",))):
+        names = ", ".join(columns)
+        new = ", ".join(f"NEW.{column}" for column in columns)
+        old = ", ".join(f"OLD.{column}" for column in columns)
+        conn.execute(f"""CREATE TRIGGER IF NOT EXISTS trg_{table}_fts_insert AFTER INSERT ON {table}
+                         BEGIN
+                             INSERT INTO {fts} (rowid, {names}) VALUES (NEW.id, {new});
+                         END""")
+        conn.execute(f"""CREATE TRIGGER IF NOT EXISTS trg_{table}_fts_delete AFTER DELETE ON {table}
+                         BEGIN
+                             INSERT INTO {fts} ({fts}, rowid, {names}) VALUES ('delete', OLD.id, {old});
+                         END""")
+        conn.execute(f"""CREATE TRIGGER IF NOT EXISTS trg_{table}_fts_update AFTER UPDATE OF {names} ON {table}
+                         BEGIN
+                             INSERT INTO {fts} ({fts}, rowid, {names}) VALUES ('delete', OLD.id, {old});
+                             INSERT INTO {fts} (rowid, {names}) VALUES (NEW.id, {new});
+                         END""")
+        # Index the rows written so far
+        conn.execute(f"INSERT INTO {fts} ({fts}) VALUES ('rebuild')")
+
+
+@migration(10, "user auth version")
+def _user_auth_version(conn: sqlite3.Connection) -> None:
+    # Bumped on password change: sessions that logged in with an older version end
+    if "auth_version" not in _columns(conn, "users"):
+        conn.execute("ALTER TABLE users ADD COLUMN auth_version INTEGER NOT NULL DEFAULT 0")
+
+
+def latest_version() -> int:
+    """Schema version this code expects."""
+    return MIGRATIONS[-1].version if MIGRATIONS else 0
+
+
+def schema_version(conn: sqlite3.Connection) -> int:
+    """Schema version of the database."""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn: sqlite3.Connection, lock_timeout: float = 60.0) -> List[int]:
+    """Apply pending migrations. Returns the versions applied (empty when up to date).
+
+    Up to date costs one pragma read. Otherwise all pending migrations run in
+    one exclusive transaction: another process migrating at the same time
+    waits for the lock, then sees the new version and applies nothing.
+    """
+    target = latest_version()
+    if schema_version(conn) >= target:
+        return []
+
+    isolation_level = conn.isolation_level
+    busy_timeout = conn.execute("PRAGMA busy_timeout").fetchone()[0]
+    conn.isolation_level = None  # explicit transaction control
+    conn.execute(f"PRAGMA busy_timeout={int(lock_timeout * 1000)}")
+    applied = []
+    try:
+        conn.execute("BEGIN EXCLUSIVE")
+        try:
+            current = schema_version(conn)
+            for step in MIGRATIONS:
+                if step.version <= current:
+                    continue
+                step.apply(conn)
+                conn.execute(f"PRAGMA user_version={step.version}")
+                applied.append(step.version)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+    finally:
+        conn.isolation_level = isolation_level
+        conn.execute(f"PRAGMA busy_timeout={busy_timeout}")
+    return applied
@@ -0,0 +1,54 @@
+"""Keyset (cursor) pagination on ``(created_at, id)``, newest first."""
+import base64
+import json
+from typing import Any, List, Mapping, Sequence, Tuple
+
+from config import PAGE_DEFAULT_LIMIT, PAGE_MAX_LIMIT
+
+# Upper bound for the first page: sorts after every created_at timestamp
+FIRST_PAGE = ("\uffff", 0)
+
+
+def encode_cursor(created_at: str, row_id: int) -> str:
+    """Opaque cursor pointing just below the row ``(created_at, id)``."""
+    raw = json.dumps([created_at, row_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, int]:
+    """Inverse of encode_cursor. Raises ValueError for a malformed cursor."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, row_id = json.loads(raw)
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if not isinstance(created_at, str) or not isinstance(row_id, int):
+        raise ValueError("Invalid cursor")
+    return created_at, row_id
+
+
+def page_args(args: Mapping[str, str]) -> Tuple[int, Tuple[str, int]]:
+    """Read ``limit`` and ``cursor`` from the query string.
+
+    Returns ``(limit, (created_at, id))`` to bind as ``(created_at, id) < (?, ?)
+    ... LIMIT limit + 1``. Raises ValueError for bad input.
+    """
+    cursor = args.get("cursor")
+    return limit_arg(args), decode_cursor(cursor) if cursor else FIRST_PAGE
+
+
+def limit_arg(args: Mapping[str, str]) -> int:
+    """Read the page size (``limit``, capped at PAGE_MAX_LIMIT). Raises ValueError for bad input."""
+    limit = args.get("limit", str(PAGE_DEFAULT_LIMIT))
+    if not limit.isdigit() or int(limit) < 1:
+        raise ValueError("limit must be a positive integer")
+    return min(int(limit), PAGE_MAX_LIMIT)
+
+
+def next_page(rows: Sequence[Any], limit: int) -> Tuple[List[Any], str | None]:
+    """Split the ``limit + 1`` fetched rows into the page and the next cursor (None on the last page)."""
+    page = list(rows[:limit])
+    if len(rows) <= limit:
+        return page, None
+    last = page[-1]
+    return page, encode_cursor(last["created_at"], last["id"])
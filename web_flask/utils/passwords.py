@@ -0,0 +1,119 @@
+"""Password hashing in a bounded process pool, so logins don't hold request threads on the CPU."""
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict
+
+from werkzeug.security import check_password_hash, generate_password_hash
+
+from config import (
+    PASSWORD_HASH_METHOD, PASSWORD_SALT_LENGTH, PASSWORD_HASH_WORKERS,
+    PASSWORD_HASH_MAX_PENDING, PASSWORD_HASH_WAIT,
+)
+
+
+class HashPoolBusy(Exception):
+    """Too many passwords are already waiting to be hashed; try again later."""
+
+
+class PasswordHasher:
+    """Hash and check passwords in ``workers`` processes (0 - in the calling thread).
+
+    At most ``max_pending`` hashes per process are queued or running; a
+    caller that gets no slot within ``wait`` seconds gets ``HashPoolBusy``
+    instead of piling up behind a login burst. Workers are spawned (not
+    forked), so the pool is safe to start after the app's background threads.
+    """
+
+    def __init__(self, method: str, salt_length: int, workers: int, max_pending: int, wait: float):
+        self.method = method
+        self.salt_length = salt_length
+        self.workers = workers
+        self.wait = wait
+        self._slots = threading.BoundedSemaphore(max(1, max_pending))
+        self._lock = threading.Lock()
+        self._executor: ProcessPoolExecutor | None = None
+        self._canonical_method: str | None = None
+        self._stats = {"hashed": 0, "verified": 0, "busy": 0}
+
+    def hash(self, password: str) -> str:
+        """Hash a password with the configured method and salt length."""
+        hashed = self._call(generate_password_hash, password, self.method, self.salt_length)
+        self._count("hashed")
+        return hashed
+
+    def verify(self, stored: str, password: str) -> bool:
+        """Check a password against a stored hash (of any method werkzeug knows)."""
+        ok = self._call(check_password_hash, stored, password)
+        self._count("verified")
+        return ok
+
+    def needs_rehash(self, stored: str) -> bool:
+        """Whether a stored hash was made with other parameters than the configured ones."""
+        if self._canonical_method is None:
+            # "scrypt" is stored as "scrypt:32768:8:1": ask werkzeug once for the full form
+            self._canonical_method = self._call(generate_password_hash, "", self.method, 1).split("$", 1)[0]
+        method, _, rest = stored.partition("$")
+        salt = rest.partition("$")[0]
+        return method != self._canonical_method or len(salt) != self.salt_length
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hashing counters of this process."""
+        with self._lock:
+            stats = dict(self._stats)
+        stats["workers"] = self.workers
+        stats["method"] = self.method
+        return stats
+
+    def shutdown(self) -> None:
+        """Stop the worker processes (a new pool starts on the next hash)."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown()
+
+    def _call(self, fn: Callable[..., Any], *args: Any) -> Any:
+        if self.workers <= 0:
+            return fn(*args)
+        if not self._slots.acquire(timeout=self.wait):
+            self._count("busy")
+            raise HashPoolBusy("password hashing queue is full")
+        try:
+            return self._pool().submit(fn, *args).result()
+        finally:
+            self._slots.release()
+
+    def _pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"))
+            return self._executor
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+
+_hasher = PasswordHasher(PASSWORD_HASH_METHOD, PASSWORD_SALT_LENGTH, PASSWORD_HASH_WORKERS,
+                         PASSWORD_HASH_MAX_PENDING, PASSWORD_HASH_WAIT)
+
+
+def hash_password(password: str) -> str:
+    """Hash a password in the hashing pool."""
+    return _hasher.hash(password)
+
+
+def verify_password(stored: str, password: str) -> bool:
+    """Check a password against a stored hash in the hashing pool."""
+    return _hasher.verify(stored, password)
+
+
+def needs_rehash(stored: str) -> bool:
+    """Whether a stored hash should be replaced after a successful login."""
+    return _hasher.needs_rehash(stored)
+
+
+def get_password_stats() -> Dict[str, Any]:
+    """Get hashing counters of this process."""
+    return _hasher.stats()
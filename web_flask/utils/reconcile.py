@@ -0,0 +1,202 @@
+"""Incremental reconciliation of Flask ``user_votes`` against the backend vote tallies."""
+import sqlite3
+import time
+from typing import Any, Dict, Set, Tuple
+
+from utils.vote_outbox import PENDING
+
+Tallies = Dict[int, int]
+
+HIGH_WATER_MARK = "user_votes_hwm"
+
+_FNV_OFFSET = 14695981039346656037
+_FNV_PRIME = 1099511628211
+
+
+def tally_checksum(tallies: Tallies) -> str:
+    """Checksum of a match's tallies, identical to the backend's /votes/checksums.
+
+    FNV-1a (64-bit) over ``"player:count;"`` in player order, zero counts skipped.
+    """
+    value = _FNV_OFFSET
+    for player_id in sorted(tallies):
+        if tallies[player_id] <= 0:
+            continue
+        for byte in f"{player_id}:{tallies[player_id]};".encode():
+            value = ((value ^ byte) * _FNV_PRIME) & 0xFFFFFFFFFFFFFFFF
+    return f"{value:016x}"
+
+
+class BackendTallies:
+    """Backend side of the reconciliation, through the shared API client."""
+
+    def checksums(self) -> Dict[int, Tuple[int, str]]:
+        """Get match_id -> (total, checksum) for every backend match."""
+        from utils.api_client import _request
+        response = _request("GET", "/votes/checksums")
+        response.raise_for_status()
+        return {int(m["match_id"]): (int(m["total"]), m["checksum"])
+                for m in response.json().get("matches", [])}
+
+    def tallies(self, match_id: int) -> Tallies:
+        """Get player_id -> votes of a match."""
+        from utils.api_client import _request
+        response = _request("GET", f"/votes/{match_id}")
+        response.raise_for_status()
+        return {int(v["player_id"]): int(v["votes"]) for v in response.json().get("votes", [])}
+
+    def set_tallies(self, match_id: int, tallies: Tallies) -> Tuple[bool, str]:
+        """Overwrite the given player tallies of a match."""
+        from utils.api_client import _post
+        success, data = _post("/votes/reconcile", {
+            "match_id": match_id,
+            "tallies": [{"player_id": p, "votes": v} for p, v in sorted(tallies.items())],
+        })
+        ok = success and data.get("status") == "success"
+        return ok, "" if ok else data.get("message", "error")
+
+
+class VoteReconciler:
+    """Bring backend tallies in line with ``user_votes`` (the per-user ledger).
+
+    Per-match checksums are compared first; only mismatched matches are
+    diffed per player, and only the differing players are rewritten. A run
+    looks only at matches with ``user_votes`` rows above the stored high-water
+    mark or whose backend checksum changed since they last agreed, so a
+    routine run does not rescan every match. Votes still in the outbox are
+    left out (the replayer delivers them), and a difference must survive a
+    second look ``settle`` seconds later, so votes in flight are not repaired.
+    """
+
+    def __init__(self, conn: sqlite3.Connection, backend: BackendTallies | None = None,
+                 settle: float = 2.0):
+        self.conn = conn
+        self.backend = backend or BackendTallies()
+        self.settle = settle
+
+    def run(self, full: bool = False, dry_run: bool = False) -> Dict[str, Any]:
+        """Reconcile once. Returns a report of what was checked and repaired."""
+        report: Dict[str, Any] = {
+            "checked": 0, "skipped": 0, "mismatched": 0, "repaired": 0,
+            "differences": [], "errors": [],
+        }
+        high_water_mark = 0 if full else self._high_water_mark()
+        last_id = self.conn.execute(
+            """SELECT MAX((SELECT COALESCE(MAX(id), 0) FROM user_votes),
+                          (SELECT COALESCE(MAX(id), 0) FROM user_votes_archive))""").fetchone()[0]
+        if last_id < high_water_mark:
+            high_water_mark = 0  # user_votes was recreated
+
+        backend = self.backend.checksums()
+        agreed = dict(self.conn.execute("SELECT match_id, checksum FROM vote_reconcile_state"))
+        candidates = self._touched_matches(high_water_mark, last_id)
+        candidates |= {m for m, (_, checksum) in backend.items() if agreed.get(m) != checksum}
+        candidates |= set(agreed) - set(backend)  # deleted in the backend
+        if full:
+            candidates |= set(backend)
+        report["skipped"] = len(set(backend) - candidates)
+
+        pending: Dict[int, Dict[int, Tuple[int, int]]] = {}
+        for match_id in sorted(candidates):
+            report["checked"] += 1
+            local = self._local_tallies(match_id)
+            if match_id not in backend:
+                if local:
+                    report["errors"].append({"match_id": match_id, "error": "match not found in backend"})
+                self._forget(match_id, dry_run)
+                continue
+            checksum = tally_checksum(local)
+            if checksum == backend[match_id][1]:
+                self._agree(match_id, checksum, sum(local.values()), dry_run)
+                continue
+            report["mismatched"] += 1
+            pending[match_id] = self._diff(local, self.backend.tallies(match_id))
+
+        if pending and not dry_run and self.settle > 0:
+            time.sleep(self.settle)
+        for match_id, diff in pending.items():
+            local = self._local_tallies(match_id)
+            if not dry_run:
+                # Keep only differences that did not change while we waited
+                again = self._diff(local, self.backend.tallies(match_id))
+                diff = {p: d for p, d in diff.items() if again.get(p) == d}
+            for player_id, (flask_votes, backend_votes) in sorted(diff.items()):
+                report["differences"].append({"match_id": match_id, "player_id": player_id,
+                                              "flask": flask_votes, "backend": backend_votes})
+            if dry_run or not diff:
+                continue
+            ok, error = self.backend.set_tallies(match_id, {p: f for p, (f, _) in diff.items()})
+            if not ok:
+                report["errors"].append({"match_id": match_id, "error": error})
+                continue
+            report["repaired"] += len(diff)
+            self._agree(match_id, tally_checksum(local), sum(local.values()), dry_run)
+
+        if not dry_run:
+            self._set_high_water_mark(last_id)
+            self.conn.commit()
+        report["high_water_mark"] = last_id
+        return report
+
+    def _high_water_mark(self) -> int:
+        row = self.conn.execute("SELECT value FROM vote_reconcile_meta WHERE name = ?",
+                                (HIGH_WATER_MARK,)).fetchone()
+        return row[0] if row else 0
+
+    def _set_high_water_mark(self, value: int) -> None:
+        self.conn.execute(
+            """INSERT INTO vote_reconcile_meta (name, value) VALUES (?, ?)
+               ON CONFLICT(name) DO UPDATE SET value = excluded.value""",
+            (HIGH_WATER_MARK, value))
+
+    def _touched_matches(self, after_id: int, last_id: int) -> Set[int]:
+        """Matches with user_votes (or archived) rows in (after_id, last_id]."""
+        rows = self.conn.execute(
+            """SELECT match_id FROM user_votes WHERE id > ? AND id <= ?
+               UNION SELECT match_id FROM user_votes_archive WHERE id > ? AND id <= ?""",
+            (after_id, last_id, after_id, last_id))
+        return {row[0] for row in rows}
+
+    def _local_tallies(self, match_id: int) -> Tallies:
+        rows = self.conn.execute(
+            """SELECT uv.player_id, COUNT(*) FROM (
+                   SELECT user_id, match_id, player_id FROM user_votes WHERE match_id = ?
+                   UNION ALL
+                   SELECT user_id, match_id, player_id FROM user_votes_archive WHERE match_id = ?) uv
+               WHERE NOT EXISTS (
+                   SELECT 1 FROM vote_outbox o
+                   WHERE o.user_id = uv.user_id AND o.match_id = uv.match_id AND o.status = ?)
+               GROUP BY uv.player_id""",
+            (match_id, match_id, PENDING))
+        return {player_id: count for player_id, count in rows}
+
+    @staticmethod
+    def _diff(local: Tallies, remote: Tallies) -> Dict[int, Tuple[int, int]]:
+        """player_id -> (flask, backend) for players whose counts differ."""
+        return {p: (local.get(p, 0), remote.get(p, 0))
+                for p in set(local) | set(remote) if local.get(p, 0) != remote.get(p, 0)}
+
+    def _agree(self, match_id: int, checksum: str, total: int, dry_run: bool) -> None:
+        if dry_run:
+            return
+        self.conn.execute(
+            """INSERT INTO vote_reconcile_state (match_id, checksum, total, reconciled_at)
+               VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+               ON CONFLICT(match_id) DO UPDATE SET checksum = excluded.checksum,
+                   total = excluded.total, reconciled_at = excluded.reconciled_at""",
+            (match_id, checksum, total))
+
+    def _forget(self, match_id: int, dry_run: bool) -> None:
+        if not dry_run:
+            self.conn.execute("DELETE FROM vote_reconcile_state WHERE match_id = ?", (match_id,))
+
+
+def reconcile_votes(db_path: str, full: bool = False, dry_run: bool = False,
+                    backend: BackendTallies | None = None, settle: float = 2.0) -> Dict[str, Any]:
+    """Run one reconciliation against the database at ``db_path``."""
+    from utils.database import connect
+    conn = connect(db_path)
+    try:
+        return VoteReconciler(conn, backend, settle).run(full=full, dry_run=dry_run)
+    finally:
+        conn.close()
@@ -0,0 +1,121 @@
+"""Stale-while-revalidate refresher that keeps hot backend endpoints warm."""
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Tuple
+
+from utils.cache import TTLCache
+
+
+class BackgroundRefresher:
+    """Refresh registered cache keys in a daemon thread before they expire.
+
+    ``serve`` returns a cached value up to ``max_staleness`` seconds old and,
+    when it is past its TTL, schedules a revalidation instead of blocking.
+    """
+
+    def __init__(self, cache: TTLCache, loader: Callable[[str], Any],
+                 interval: float, max_staleness: float, refresh_ahead: float = 0.8):
+        self.cache = cache
+        self.loader = loader
+        self.interval = interval
+        self.max_staleness = max_staleness
+        self.refresh_ahead = refresh_ahead
+        self._keys: set[str] = set()
+        self._pending: set[str] = set()
+        self._failures: Dict[str, Tuple[int, float]] = {}
+        self._ages: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def register(self, keys: Iterable[str]) -> None:
+        """Add keys to the hot set."""
+        with self._lock:
+            self._keys.update(keys)
+
+    def is_hot(self, key: str) -> bool:
+        """Check whether a key is kept warm."""
+        return key in self._keys
+
+    def start(self) -> None:
+        """Start the refresh thread (once per process)."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(
+                target=self._run, name="api-cache-refresher", daemon=True)
+            self._thread.start()
+
+    def serve(self, key: str) -> Tuple[bool, Any]:
+        """Serve a hot key from cache, possibly stale. Returns (served, value)."""
+        found, age, value = self.cache.peek(key)
+        if not found or age > self.max_staleness:
+            return False, None
+        if age > self.cache.ttl_for(key):
+            self._schedule(key)
+        self._record_age(key, age)
+        return True, value
+
+    def stats(self) -> Dict[str, Any]:
+        """Get served data age per hot key."""
+        with self._lock:
+            ages = {key: dict(values) for key, values in self._ages.items()}
+            failing = {key: count for key, (count, _) in self._failures.items()}
+        for key in self._keys:
+            found, age, _ = self.cache.peek(key)
+            ages.setdefault(key, {})["current_age"] = round(age, 3) if found else None
+        return {
+            "max_staleness": self.max_staleness,
+            "interval": self.interval,
+            "endpoints": ages,
+            "failing": failing,
+            "running": self._thread is not None and self._thread.is_alive(),
+        }
+
+    def _record_age(self, key: str, age: float) -> None:
+        with self._lock:
+            values = self._ages.setdefault(
+                key, {"last_served_age": 0.0, "max_served_age": 0.0, "stale_served": 0})
+            values["last_served_age"] = round(age, 3)
+            values["max_served_age"] = max(values["max_served_age"], round(age, 3))
+            if age > self.cache.ttl_for(key):
+                values["stale_served"] += 1
+
+    def _schedule(self, key: str) -> None:
+        with self._lock:
+            self._pending.add(key)
+        self._wakeup.set()
+
+    def _due(self, key: str, now: float) -> bool:
+        failure = self._failures.get(key)
+        if failure is not None and now < failure[1]:
+            return False
+        if key in self._pending:
+            return True
+        found, age, _ = self.cache.peek(key)
+        return not found or age >= self.cache.ttl_for(key) * self.refresh_ahead
+
+    def _refresh(self, key: str) -> None:
+        try:
+            self.cache.get_or_load(key, lambda: self.loader(key), force=True)
+            with self._lock:
+                self._failures.pop(key, None)
+        except Exception:
+            # Keep serving the stale value; back off exponentially (max 60 s)
+            with self._lock:
+                count = self._failures.get(key, (0, 0.0))[0] + 1
+                delay = min(60.0, self.interval * (2 ** count))
+                self._failures[key] = (count, time.time() + delay)
+        finally:
+            with self._lock:
+                self._pending.discard(key)
+
+    def _run(self) -> None:
+        while True:
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+            now = time.time()
+            with self._lock:
+                due = [key for key in self._keys if self._due(key, now)]
+            for key in due:
+                self._refresh(key)
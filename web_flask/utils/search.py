@@ -0,0 +1,78 @@
+"""Full-text search over posts and match comments (FTS5, ranked by bm25)."""
+import html
+import re
+import sqlite3
+from typing import Any, Dict, List, Tuple
+
+POSTS = "posts"
+COMMENTS = "comments"
+KINDS = (POSTS, COMMENTS)
+
+# Search terms used from a query; the rest is ignored
+MAX_TERMS = 8
+# Snippet length in tokens, and private-use markers replaced by <mark> after escaping
+SNIPPET_TOKENS = 16
+_MARK_OPEN, _MARK_CLOSE = "\ue000", "\ue001"
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+_SELECT = {
+    POSTS: f"""
+        SELECT 'post' AS kind, p.id AS id, p.title, NULL AS match_id, p.created_at, u.username,
+               snippet(posts_fts, -1, '{_MARK_OPEN}', '{_MARK_CLOSE}', '…', {SNIPPET_TOKENS}) AS snippet,
+               bm25(posts_fts, 3.0, 1.0) AS score
+        FROM posts_fts
+        JOIN posts p ON p.id = posts_fts.rowid
+        LEFT JOIN users u ON p.user_id = u.id
+        WHERE posts_fts MATCH ?""",
+    COMMENTS: f"""
+        SELECT 'comment' AS kind, c.id AS id, NULL AS title, c.match_id, c.created_at, u.username,
+               snippet(match_comments_fts, 0, '{_MARK_OPEN}', '{_MARK_CLOSE}', '…', {SNIPPET_TOKENS}) AS snippet,
+               bm25(match_comments_fts) AS score
+        FROM match_comments_fts
+        JOIN match_comments c ON c.id = match_comments_fts.rowid
+        LEFT JOIN users u ON c.user_id = u.id
+        WHERE match_comments_fts MATCH ?""",
+}
+
+
+def fts_query(text: str) -> str | None:
+    """Turn user input into an FTS5 query: all words must match, the last one as a prefix.
+
+    Words are quoted, so FTS5 operators and punctuation in the input are
+    treated as text. Returns None when there is nothing to search for.
+    """
+    words = _WORD.findall(text or "")[:MAX_TERMS]
+    if not words:
+        return None
+    terms = [f'"{word}"' for word in words]
+    terms[-1] += "*"
+    return " ".join(terms)
+
+
+def highlight(snippet: str | None) -> str:
+    """HTML-escape a snippet and mark the matched terms with <mark>."""
+    escaped = html.escape(snippet or "")
+    return escaped.replace(_MARK_OPEN, "<mark>").replace(_MARK_CLOSE, "</mark>")
+
+
+def search(db: sqlite3.Connection, text: str, kinds=KINDS, limit: int = 20,
+           offset: int = 0) -> Tuple[List[Dict[str, Any]], bool]:
+    """Best matches first (lower bm25 score is better). Returns (results, has_more)."""
+    query = fts_query(text)
+    if query is None:
+        return [], False
+    parts = [_SELECT[kind] for kind in KINDS if kind in kinds]
+    sql = " UNION ALL ".join(parts) + " ORDER BY score, id LIMIT ? OFFSET ?"
+    rows = db.execute(sql, (*[query] * len(parts), limit + 1, offset)).fetchall()
+    results = [{
+        "kind": row["kind"],
+        "id": row["id"],
+        "title": row["title"],
+        "match_id": row["match_id"],
+        "created_at": row["created_at"],
+        "username": row["username"],
+        "snippet": highlight(row["snippet"]),
+        "score": round(row["score"], 4),
+    } for row in rows[:limit]]
+    return results, len(rows) > limit
@@ -0,0 +1,174 @@
+"""Node-wide second cache tier shared by all worker processes (SQLite WAL file)."""
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Tuple
+
+
+class SharedCache:
+    """Versioned key/value entries in a SQLite file every worker can read.
+
+    Entries survive restarts, so a new worker starts warm. Failures of the
+    shared tier are treated as misses and never fail a request.
+    """
+
+    def __init__(self, path: str, max_entries: int, busy_timeout: float = 0.2):
+        self.path = str(path)
+        self.max_entries = max_entries
+        self.busy_timeout = busy_timeout
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._stats = {"hits": 0, "misses": 0, "writes": 0, "errors": 0}
+        self._init_schema()
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.busy_timeout)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _init_schema(self) -> None:
+        try:
+            conn = self._connection()
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS api_cache (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    version TEXT,
+                    stored_at REAL NOT NULL
+                )
+                """
+            )
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS api_cache_invalidations (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    key TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                )
+                """
+            )
+            conn.commit()
+        except sqlite3.Error:
+            self._count("errors")
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+    def get(self, key: str) -> Tuple[bool, float, Any, str | None]:
+        """Get an entry regardless of age. Returns (found, age, value, version)."""
+        try:
+            row = self._connection().execute(
+                "SELECT value, version, stored_at FROM api_cache WHERE key = ?",
+                (key,)).fetchone()
+        except (sqlite3.Error, ValueError):
+            self._count("errors")
+            return False, 0.0, None, None
+        if row is None:
+            self._count("misses")
+            return False, 0.0, None, None
+        self._count("hits")
+        return True, max(0.0, time.time() - row[2]), json.loads(row[0]), row[1]
+
+    def set(self, key: str, value: Any, version: str | None = None, age: float = 0.0,
+            loaded_since: float | None = None) -> None:
+        """Store an entry unless another worker already stored a newer one.
+
+        With ``loaded_since`` (when the load of ``value`` started) the entry is
+        not stored if any worker invalidated the key after that moment.
+        """
+        stored_at = time.time() - age
+        try:
+            conn = self._connection()
+            conn.execute(
+                """
+                INSERT INTO api_cache (key, value, version, stored_at)
+                SELECT ?, ?, ?, ?
+                WHERE NOT EXISTS (SELECT 1 FROM api_cache_invalidations
+                                  WHERE key = ? AND created_at >= ?)
+                ON CONFLICT(key) DO UPDATE SET
+                    value = excluded.value,
+                    version = excluded.version,
+                    stored_at = excluded.stored_at
+                WHERE excluded.stored_at >= api_cache.stored_at
+                """,
+                (key, json.dumps(value), version, stored_at,
+                 key, loaded_since if loaded_since is not None else float("inf")))
+            with self._lock:
+                self._stats["writes"] += 1
+                self._writes += 1
+                prune = self._writes % 100 == 0
+            if prune:
+                conn.execute(
+                    """
+                    DELETE FROM api_cache WHERE key NOT IN (
+                        SELECT key FROM api_cache ORDER BY stored_at DESC LIMIT ?
+                    )
+                    """,
+                    (self.max_entries,))
+            conn.commit()
+        except (sqlite3.Error, TypeError, ValueError):
+            self._count("errors")
+
+    def invalidate(self, *keys: str) -> None:
+        """Drop entries and record the invalidation for other workers' local caches."""
+        now = time.time()
+        try:
+            conn = self._connection()
+            conn.executemany("DELETE FROM api_cache WHERE key = ?", [(key,) for key in keys])
+            conn.executemany(
+                "INSERT INTO api_cache_invalidations (key, created_at) VALUES (?, ?)",
+                [(key, now) for key in keys])
+            conn.execute("DELETE FROM api_cache_invalidations WHERE created_at < ?",
+                         (now - 3600,))
+            conn.commit()
+        except sqlite3.Error:
+            self._count("errors")
+
+    def invalidations_since(self, seq: int | None) -> Tuple[int, list]:
+        """Get keys invalidated after ``seq``. Returns (last_seq, keys).
+
+        With ``seq=None`` only the current position is returned.
+        """
+        try:
+            conn = self._connection()
+            if seq is None:
+                row = conn.execute("SELECT MAX(seq) FROM api_cache_invalidations").fetchone()
+                return row[0] or 0, []
+            rows = conn.execute(
+                "SELECT seq, key FROM api_cache_invalidations WHERE seq > ? ORDER BY seq",
+                (seq,)).fetchall()
+        except sqlite3.Error:
+            self._count("errors")
+            return seq or 0, []
+        if not rows:
+            return seq, []
+        return rows[-1][0], [key for _, key in rows]
+
+    def clear(self) -> None:
+        """Drop all entries for every worker."""
+        try:
+            conn = self._connection()
+            conn.execute("DELETE FROM api_cache")
+            conn.commit()
+        except sqlite3.Error:
+            self._count("errors")
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hit/miss/write counters of this process."""
+        with self._lock:
+            stats = dict(self._stats)
+        try:
+            stats["entries"] = self._connection().execute(
+                "SELECT COUNT(*) FROM api_cache").fetchone()[0]
+        except sqlite3.Error:
+            stats["entries"] = None
+        stats["path"] = self.path
+        return stats
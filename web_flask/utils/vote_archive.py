@@ -0,0 +1,38 @@
+"""Archive of the ``user_votes`` rows of closed matches (``user_votes_archive``)."""
+import sqlite3
+from typing import List
+
+
+def archive_match(db: sqlite3.Connection, match_id: int) -> int:
+    """Move a match's votes from user_votes to the archive. Returns rows moved; the caller commits.
+
+    Rows keep their ids, so the tally triggers skip them and
+    ``match_vote_tallies`` still counts them.
+    """
+    db.execute(
+        """INSERT OR IGNORE INTO user_votes_archive (id, user_id, match_id, player_id, created_at)
+           SELECT id, user_id, match_id, player_id, created_at FROM user_votes WHERE match_id = ?""",
+        (match_id,))
+    return db.execute("DELETE FROM user_votes WHERE match_id = ?", (match_id,)).rowcount
+
+
+def restore_match(db: sqlite3.Connection, match_id: int) -> int:
+    """Move a reopened match's votes back to user_votes. Returns rows moved; the caller commits."""
+    db.execute(
+        """INSERT OR IGNORE INTO user_votes (id, user_id, match_id, player_id, created_at)
+           SELECT id, user_id, match_id, player_id, created_at FROM user_votes_archive WHERE match_id = ?""",
+        (match_id,))
+    # A row that could not go back (conflicting vote) stays archived and counted
+    return db.execute(
+        """DELETE FROM user_votes_archive
+           WHERE match_id = ? AND id IN (SELECT id FROM user_votes WHERE match_id = ?)""",
+        (match_id, match_id)).rowcount
+
+
+def closed_matches_to_archive(db: sqlite3.Connection) -> List[int]:
+    """Closed matches (per cached_matches) that still have votes in user_votes."""
+    rows = db.execute(
+        """SELECT id FROM cached_matches
+           WHERE is_active = 0 AND EXISTS (SELECT 1 FROM user_votes WHERE match_id = cached_matches.id)
+           ORDER BY id""").fetchall()
+    return [row[0] for row in rows]
@@ -0,0 +1,151 @@
+"""Write-behind vote batching: coalesce concurrent votes into /votes/batch calls."""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Tuple
+
+from config import (
+    VOTE_BATCH_ENABLED, VOTE_BATCH_WINDOW, VOTE_BATCH_MAX_SIZE, VOTE_BATCH_SENDERS,
+    REQUEST_TIMEOUT_POST,
+)
+
+Result = Tuple[bool, Dict[str, Any]]
+
+
+class _PendingVote:
+    """A vote waiting for its batch to be sent."""
+
+    def __init__(self, match_id: int, player_id: int, vote_key: str | None):
+        self.match_id = match_id
+        self.player_id = player_id
+        self.vote_key = vote_key
+        self.event = threading.Event()
+        self.result: Result = (False, {"status": "error", "message": "Vote was not sent"})
+
+
+class VoteBatcher:
+    """Collect votes for up to ``window`` seconds and send them in one request.
+
+    ``submit`` blocks until the vote's own result is known, so callers keep
+    per-vote acknowledgment. ``send_batch`` receives the list of votes and
+    returns one (success, response) per vote in the same order. Up to
+    ``senders`` batches are in flight at once while the next one collects.
+    """
+
+    def __init__(self, send_batch: Callable[[List[Dict[str, Any]]], List[Result]],
+                 window: float, max_batch: int, senders: int = 1):
+        self.send_batch = send_batch
+        self.window = window
+        self.max_batch = max_batch
+        self._executor = ThreadPoolExecutor(max_workers=senders,
+                                            thread_name_prefix="vote-batch-send")
+        # While every sender is busy, votes keep accumulating into the next batch
+        self._free_senders = threading.BoundedSemaphore(senders)
+        self._pending: List[_PendingVote] = []
+        self._condition = threading.Condition()
+        self._thread: threading.Thread | None = None
+        self._stats = {"votes": 0, "batches": 0, "largest_batch": 0}
+
+    def submit(self, match_id: int, player_id: int, timeout: float,
+               vote_key: str | None = None) -> Result:
+        """Queue a vote and wait for its result."""
+        vote = _PendingVote(match_id, player_id, vote_key)
+        with self._condition:
+            self._ensure_started()
+            self._pending.append(vote)
+            self._stats["votes"] += 1
+            self._condition.notify()
+        if not vote.event.wait(timeout):
+            return False, {"status": "error", "message": "Timeout waiting for vote batch",
+                           "unavailable": True}
+        return vote.result
+
+    def stats(self) -> Dict[str, Any]:
+        """Get batching counters."""
+        with self._condition:
+            stats = dict(self._stats)
+            stats["pending"] = len(self._pending)
+        stats["avg_batch"] = round(stats["votes"] / stats["batches"], 2) if stats["batches"] else 0
+        return stats
+
+    def _ensure_started(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="vote-batcher", daemon=True)
+            self._thread.start()
+
+    def _take_batch(self) -> List[_PendingVote]:
+        with self._condition:
+            while not self._pending:
+                self._condition.wait()
+            # Wait out the window (or until the batch is full) to coalesce votes
+            deadline = time.time() + self.window
+            while len(self._pending) < self.max_batch:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    break
+                self._condition.wait(remaining)
+            batch = self._pending[:self.max_batch]
+            del self._pending[:self.max_batch]
+            self._stats["batches"] += 1
+            self._stats["largest_batch"] = max(self._stats["largest_batch"], len(batch))
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            self._free_senders.acquire()
+            self._executor.submit(self._send, self._take_batch())
+
+    def _send(self, batch: List[_PendingVote]) -> None:
+        try:
+            results = self.send_batch([_vote_payload(v.match_id, v.player_id, v.vote_key)
+                                       for v in batch])
+        except Exception as e:
+            results = [(False, {"status": "error", "message": str(e), "unavailable": True})] * len(batch)
+        finally:
+            self._free_senders.release()
+        for vote, result in zip(batch, results):
+            vote.result = result
+            vote.event.set()
+
+
+def _vote_payload(match_id: int, player_id: int, vote_key: str | None) -> Dict[str, Any]:
+    """Build a vote for the backend; the key makes a resent vote count once."""
+    payload = {"match_id": match_id, "player_id": player_id}
+    if vote_key:
+        payload["vote_key"] = vote_key
+    return payload
+
+
+def send_votes(votes: List[Dict[str, Any]]) -> List[Result]:
+    """Send votes to /votes/batch; fall back to one /vote call each on an older backend."""
+    from utils.api_client import _post
+    success, data = _post("/votes/batch", {"votes": votes})
+    results = data.get("results") if success else None
+    if isinstance(results, list) and len(results) == len(votes):
+        return [(result.get("status") == "success", result) for result in results]
+    if success:
+        # Backend without the batch endpoint ("Route not found")
+        sent = [_post("/vote", vote) for vote in votes]
+        return [(ok and data.get("status") == "success", data) for ok, data in sent]
+    return [(False, data)] * len(votes)
+
+
+_batcher = VoteBatcher(send_votes, VOTE_BATCH_WINDOW, VOTE_BATCH_MAX_SIZE, VOTE_BATCH_SENDERS)
+
+
+def submit_vote(match_id: int, player_id: int, vote_key: str | None = None) -> Result:
+    """Send a vote to the backend, batched with concurrent votes when enabled."""
+    if not VOTE_BATCH_ENABLED:
+        from utils.api_client import _post
+        return _post("/vote", _vote_payload(match_id, player_id, vote_key))
+    # Allow for one busy sender ahead of this batch
+    return _batcher.submit(match_id, player_id,
+                           timeout=2 * REQUEST_TIMEOUT_POST + VOTE_BATCH_WINDOW,
+                           vote_key=vote_key)
+
+
+def get_batcher_stats() -> Dict[str, Any]:
+    """Get vote batching counters."""
+    stats = _batcher.stats()
+    stats["enabled"] = VOTE_BATCH_ENABLED
+    return stats
@@ -0,0 +1,201 @@
+"""Durable outbox for votes the backend could not take, replayed in the background."""
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List
+
+from config import (
+    DB_PATH, VOTE_OUTBOX_INTERVAL, VOTE_OUTBOX_BATCH_SIZE, VOTE_OUTBOX_MAX_BACKOFF,
+    REQUEST_TIMEOUT_POST,
+)
+from utils.database import connections
+from utils.invalidation import VOTES, resource_key, publish
+from utils.vote_batcher import send_votes
+
+PENDING = "pending"
+REJECTED = "rejected"
+# Backend rejections that prove the vote was never counted. "Матч не знайдено або вже
+# завершено" does not: a vote counted before the match closed (its response lost) is
+# rejected on replay too, once its key is pruned, so such rows are kept for review.
+NEVER_APPLIED_ERRORS = ("Гравця не знайдено",)
+
+
+def vote_key(user_id: int, match_id: int) -> str:
+    """Idempotency key of a user's vote in a match (one vote per user per match)."""
+    return f"{int(user_id)}:{int(match_id)}"
+
+
+def enqueue(db: sqlite3.Connection, user_id: int, match_id: int, player_id: int) -> None:
+    """Add a vote to the outbox (caller commits, together with user_votes)."""
+    db.execute(
+        """INSERT OR IGNORE INTO vote_outbox (user_id, match_id, player_id, vote_key)
+           VALUES (?, ?, ?, ?)""",
+        (user_id, match_id, player_id, vote_key(user_id, match_id))
+    )
+
+
+def drop_local_votes(conn: sqlite3.Connection, rows) -> None:
+    """Remove the local copy (live or archived) of votes the backend never counted; caller commits."""
+    keys = [(row["user_id"], row["match_id"]) for row in rows]
+    # The tally trigger updates match_vote_tallies for live rows
+    conn.executemany("DELETE FROM user_votes WHERE user_id = ? AND match_id = ?", keys)
+    for user_id, match_id in keys:
+        for archived in conn.execute(
+                "SELECT id, player_id FROM user_votes_archive WHERE user_id = ? AND match_id = ?",
+                (user_id, match_id)).fetchall():
+            conn.execute(
+                """UPDATE match_vote_tallies SET votes = votes - 1
+                   WHERE match_id = ? AND player_id = ?""", (match_id, archived["player_id"]))
+            conn.execute("DELETE FROM match_vote_tallies WHERE match_id = ? AND player_id = ? AND votes <= 0",
+                         (match_id, archived["player_id"]))
+            conn.execute("DELETE FROM user_votes_archive WHERE id = ?", (archived["id"],))
+
+
+def outbox_stats(db: sqlite3.Connection) -> Dict[str, Any]:
+    """Get queue depth and the oldest pending vote."""
+    counts = {row["status"]: row["count"] for row in db.execute(
+        "SELECT status, COUNT(*) AS count FROM vote_outbox GROUP BY status").fetchall()}
+    oldest = db.execute(
+        """SELECT MIN(created_at) AS oldest, MAX(attempts) AS max_attempts,
+                  MIN(next_attempt_at) AS next_attempt_at
+           FROM vote_outbox WHERE status = ?""", (PENDING,)).fetchone()
+    return {
+        "pending": counts.get(PENDING, 0),
+        "rejected": counts.get(REJECTED, 0),
+        "oldest_pending": oldest["oldest"],
+        "max_attempts": oldest["max_attempts"] or 0,
+        "next_attempt_in": (round(max(0.0, oldest["next_attempt_at"] - time.time()), 3)
+                            if oldest["next_attempt_at"] is not None else None),
+    }
+
+
+class OutboxReplayer:
+    """Send pending outbox votes to the backend in batches.
+
+    Rows are claimed with a lease so several worker processes can replay the
+    same outbox. Votes carry their idempotency key, so a batch resent after a
+    lost response is not counted twice. Transport failures back off
+    exponentially per row; votes the backend rejects are kept as ``rejected``
+    and their local ``user_votes`` rows are dropped (the backend never counted them).
+    """
+
+    def __init__(self, db_path: str, interval: float, batch_size: int, max_backoff: float,
+                 lease: float):
+        self.db_path = db_path
+        self.interval = interval
+        self.batch_size = batch_size
+        self.max_backoff = max_backoff
+        self.lease = lease
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self._app = None
+        self._stats = {"replayed": 0, "duplicates": 0, "rejected": 0, "failed_attempts": 0}
+
+    def start(self, app) -> None:
+        """Start the replay thread (once per process)."""
+        with self._lock:
+            self._app = app
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name="vote-outbox", daemon=True)
+            self._thread.start()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get replay counters of this process."""
+        with self._lock:
+            stats = dict(self._stats)
+        stats["running"] = self._thread is not None and self._thread.is_alive()
+        return stats
+
+    def replay_once(self) -> int:
+        """Replay one batch of due votes. Returns the number of votes sent."""
+        conn = connections.connection(self.db_path)
+        try:
+            rows = self._claim(conn)
+            if not rows:
+                return 0
+            results = send_votes([{"match_id": row["match_id"], "player_id": row["player_id"],
+                                   "vote_key": row["vote_key"]} for row in rows])
+            self._record(conn, rows, results)
+            return len(rows)
+        finally:
+            connections.release(conn)
+
+    def _claim(self, conn: sqlite3.Connection) -> List[sqlite3.Row]:
+        now = time.time()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            rows = conn.execute(
+                """SELECT id, user_id, match_id, player_id, vote_key, attempts FROM vote_outbox
+                   WHERE status = ? AND next_attempt_at <= ?
+                   ORDER BY id LIMIT ?""",
+                (PENDING, now, self.batch_size)).fetchall()
+            conn.executemany("UPDATE vote_outbox SET next_attempt_at = ? WHERE id = ?",
+                             [(now + self.lease, row["id"]) for row in rows])
+        return rows
+
+    def _record(self, conn: sqlite3.Connection, rows: List[sqlite3.Row], results) -> None:
+        now = time.time()
+        replayed, duplicates, rejected, failed = [], 0, [], []
+        for row, (success, data) in zip(rows, results):
+            if success:
+                replayed.append(row)
+                duplicates += 1 if data.get("duplicate") else 0
+            elif data.get("unavailable"):
+                failed.append(row)
+            else:
+                rejected.append((row, data.get("message", "rejected")))
+        with conn:
+            conn.executemany("DELETE FROM vote_outbox WHERE id = ?",
+                             [(row["id"],) for row in replayed])
+            conn.executemany(
+                "UPDATE vote_outbox SET status = ?, last_error = ? WHERE id = ?",
+                [(REJECTED, message, row["id"]) for row, message in rejected])
+            drop_local_votes(conn, [row for row, message in rejected if message in NEVER_APPLIED_ERRORS])
+            conn.executemany(
+                """UPDATE vote_outbox SET attempts = attempts + 1, next_attempt_at = ?,
+                          last_error = ? WHERE id = ?""",
+                [(now + min(self.max_backoff, self.interval * (2 ** row["attempts"])),
+                  "backend unavailable", row["id"]) for row in failed])
+        with self._lock:
+            self._stats["replayed"] += len(replayed)
+            self._stats["duplicates"] += duplicates
+            self._stats["rejected"] += len(rejected)
+            self._stats["failed_attempts"] += len(failed)
+        if replayed:
+            self._publish({row["match_id"] for row in replayed})
+
+    def _publish(self, match_ids) -> None:
+        keys = [resource_key(VOTES, match_id) for match_id in match_ids]
+        if self._app is None:
+            publish(*keys)
+            return
+        with self._app.app_context():
+            publish(*keys)
+
+    def _run(self) -> None:
+        while True:
+            try:
+                # Drain full batches back to back, then wait for the next round
+                while self.replay_once() >= self.batch_size:
+                    pass
+            except sqlite3.Error:
+                pass  # Table not created yet or database busy; retry next round
+            except Exception as e:
+                if self._app is not None:
+                    self._app.logger.error("Vote outbox replay failed: %s", e)
+            time.sleep(self.interval)
+
+
+_replayer = OutboxReplayer(str(DB_PATH), VOTE_OUTBOX_INTERVAL, VOTE_OUTBOX_BATCH_SIZE,
+                           VOTE_OUTBOX_MAX_BACKOFF, lease=2 * REQUEST_TIMEOUT_POST)
+
+
+def start_replayer(app) -> None:
+    """Start replaying the outbox in this process."""
+    _replayer.start(app)
+
+
+def get_replayer_stats() -> Dict[str, Any]:
+    """Get replay counters of this process."""
+    return _replayer.stats()
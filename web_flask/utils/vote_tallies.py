@@ -0,0 +1,28 @@
+"""Materialized per-match vote tallies (``match_vote_tallies``), kept by user_votes triggers."""
+import sqlite3
+
+
+def rebuild_tallies(db: sqlite3.Connection, match_id: int | None = None) -> int:
+    """Recompute tallies from user_votes and its archive (all matches, or one). Returns rows written.
+
+    The caller commits. Used to backfill after bulk changes made with the
+    triggers disabled, or to repair drift.
+    """
+    if match_id is None:
+        db.execute("DELETE FROM match_vote_tallies")
+        cursor = db.execute(
+            """INSERT INTO match_vote_tallies (match_id, player_id, votes)
+               SELECT match_id, player_id, COUNT(*) FROM (
+                   SELECT match_id, player_id FROM user_votes
+                   UNION ALL SELECT match_id, player_id FROM user_votes_archive)
+               GROUP BY match_id, player_id""")
+    else:
+        db.execute("DELETE FROM match_vote_tallies WHERE match_id = ?", (match_id,))
+        cursor = db.execute(
+            """INSERT INTO match_vote_tallies (match_id, player_id, votes)
+               SELECT match_id, player_id, COUNT(*) FROM (
+                   SELECT match_id, player_id FROM user_votes WHERE match_id = ?
+                   UNION ALL SELECT match_id, player_id FROM user_votes_archive WHERE match_id = ?)
+               GROUP BY match_id, player_id""",
+            (match_id, match_id))
+    return cursor.rowcount